@@ -6,16 +6,32 @@ chat sessions, daily briefings, and contextual development assistance for the
 Podplay Sanctuary environment.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from datetime import datetime
+from typing import Optional, Tuple
+import asyncio
+import json
+import os
 import uuid
 
-from services.mama_bear_agent import MamaBearAgent
+from services.chat_stream_buffer import ChatStream, get_chat_stream_buffer
+from services.mama_bear_agent import CHAT_FALLBACK_RESPONSE, MamaBearAgent
+from utils.async_bridge import get_background_loop
+from utils.chunk_coalescer import ChunkCoalescer
 from utils.logging_setup import get_logger
 from utils.validators import validate_chat_input
 
 logger = get_logger(__name__)
 
+# Server-Sent Events streaming of chat responses: frames are coalesced like
+# Socket.IO chunks, idle connections get a heartbeat comment, and completed
+# streams stay resumable with Last-Event-ID for the buffer TTL
+CHAT_STREAM_MIN_FRAME_CHARS = int(os.getenv('CHAT_STREAM_MIN_FRAME_CHARS', '32'))
+CHAT_STREAM_MAX_FRAME_DELAY = float(os.getenv('CHAT_STREAM_MAX_FRAME_DELAY', '0.05'))
+CHAT_SSE_HEARTBEAT_INTERVAL = float(os.getenv('CHAT_SSE_HEARTBEAT_INTERVAL', '15'))
+CHAT_SSE_RETRY_MS = int(os.getenv('CHAT_SSE_RETRY_MS', '2000'))
+CHAT_STREAM_BUFFER_TTL = float(os.getenv('CHAT_STREAM_BUFFER_TTL', '120'))
+
 # Create blueprint for chat and AI interaction operations
 chat_bp = Blueprint('chat', __name__, url_prefix='/api/chat')
 
@@ -38,6 +54,13 @@ def process_chat_message():
     """
     Process chat interaction with Mama Bear AI agent including context management
     
+    Requests accepting ``text/event-stream`` receive the response as Server-Sent
+    Events instead of one JSON body: ``start``, then ``chunk`` events with
+    sequenced text deltas, then ``complete`` with the full response, usage and
+    metadata. Event ids have the form ``<stream_id>:<n>``; repeating the request
+    with a ``Last-Event-ID`` header resumes that stream after the given event
+    without generating a new response.
+    
     Request Body:
         message (str): User message content
         user_id (str): User identifier for personalization
@@ -45,9 +68,16 @@ def process_chat_message():
         context (dict, optional): Additional context information
     
     Returns:
-        JSON response with AI-generated response and interaction metadata
+        JSON response with AI-generated response and interaction metadata, or
+        an event stream
     """
     try:
+        wants_stream = _wants_event_stream()
+        if wants_stream and request.headers.get('Last-Event-ID'):
+            resumed = _resume_chat_stream(request.headers['Last-Event-ID'])
+            if resumed is not None:
+                return resumed
+        
         request_data = request.get_json()
         if not request_data:
             return jsonify({
@@ -77,6 +107,10 @@ def process_chat_message():
                 "response": "AI agent service is currently initializing. Please try again shortly."
             }), 503
         
+        if wants_stream:
+            logger.info(f"Streaming chat response for user: {user_id}")
+            return _event_stream_response(_start_chat_stream(message, user_id, session_id), -1)
+        
         # Process chat message through agent
         chat_result = mama_bear_agent.chat(
             message=message,
@@ -111,6 +145,135 @@ def process_chat_message():
             "response": "An unexpected error occurred while processing your message. Please try again."
         }), 500
 
+@chat_bp.route('/mama-bear/stream/<stream_id>', methods=['GET'])
+def resume_chat_stream(stream_id: str):
+    """
+    Resume a streamed chat response as Server-Sent Events
+    
+    Supports EventSource reconnection: events after the one named by the
+    ``Last-Event-ID`` header (or ``last_event_id`` query parameter) are
+    replayed from the stream buffer, followed by live events if the response
+    is still being generated.
+    
+    Args:
+        stream_id: Stream identifier from the ``X-Chat-Stream-Id`` header or event ids
+    
+    Returns:
+        Event stream, or JSON error when the stream is unknown or expired
+    """
+    stream = get_chat_stream_buffer(ttl_seconds=CHAT_STREAM_BUFFER_TTL).get(stream_id)
+    if stream is None:
+        return jsonify({
+            "success": False,
+            "error": "Chat stream not found or expired"
+        }), 404
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id', '')
+    parsed = _parse_event_id(last_event_id)
+    return _event_stream_response(stream, parsed[1] if parsed else -1)
+
+def _wants_event_stream() -> bool:
+    """Whether the client prefers an event stream over JSON"""
+    return request.accept_mimetypes.best_match(['application/json', 'text/event-stream']) == 'text/event-stream'
+
+def _parse_event_id(value: str) -> Optional[Tuple[str, int]]:
+    """Split a ``<stream_id>:<n>`` event id into its stream id and event number"""
+    stream_id, _, event_id = value.strip().rpartition(':')
+    if not stream_id or not event_id.isdigit():
+        return None
+    return stream_id, int(event_id)
+
+def _resume_chat_stream(last_event_id: str) -> Optional[Response]:
+    """Event stream continuing after ``last_event_id``, or None when its stream is gone"""
+    parsed = _parse_event_id(last_event_id)
+    if parsed is None:
+        return None
+    
+    stream = get_chat_stream_buffer(ttl_seconds=CHAT_STREAM_BUFFER_TTL).get(parsed[0])
+    if stream is None:
+        return None
+    
+    logger.info(f"Resuming chat stream {stream.stream_id} after event {parsed[1]}")
+    return _event_stream_response(stream, parsed[1])
+
+def _start_chat_stream(message: str, user_id: str, session_id: str) -> ChatStream:
+    """Generate a chat response on the background loop into a new stream buffer"""
+    stream = get_chat_stream_buffer(ttl_seconds=CHAT_STREAM_BUFFER_TTL).create(str(uuid.uuid4()))
+    coalescer = ChunkCoalescer(CHAT_STREAM_MIN_FRAME_CHARS, CHAT_STREAM_MAX_FRAME_DELAY)
+    stream.append('start', {
+        "stream_id": stream.stream_id,
+        "session_id": session_id,
+        "user_id": user_id,
+        "timestamp": datetime.now().isoformat()
+    })
+    
+    def append_frame(frame: str):
+        stream.append('chunk', {"seq": coalescer.frames - 1, "delta": frame})
+    
+    def on_chunk(piece: str):
+        frame = coalescer.add(piece)
+        if frame:
+            append_frame(frame)
+    
+    def on_done(future):
+        try:
+            chat_result = future.result()
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            chat_result = {"success": False, "error": str(e), "response": CHAT_FALLBACK_RESPONSE}
+        
+        frame = coalescer.flush()
+        if frame:
+            append_frame(frame)
+        
+        metadata = chat_result.get('metadata', {})
+        stream.append('complete', {
+            "success": chat_result.get('success', False),
+            "response": chat_result.get('response', ''),
+            "session_id": session_id,
+            "user_id": user_id,
+            "chunks": coalescer.frames,
+            "usage": metadata.get('usage', {}),
+            "metadata": metadata,
+            "error": chat_result.get('error'),
+            "timestamp": datetime.now().isoformat()
+        })
+        stream.finish()
+    
+    future = asyncio.run_coroutine_threadsafe(
+        mama_bear_agent.chat_stream_async(message, user_id, session_id, on_chunk),
+        get_background_loop().loop
+    )
+    future.add_done_callback(on_done)
+    return stream
+
+def _event_stream_response(stream: ChatStream, last_event_id: int) -> Response:
+    """Serve a stream's events after ``last_event_id`` as Server-Sent Events"""
+    def generate():
+        yield f"retry: {CHAT_SSE_RETRY_MS}\n\n"
+        sent = last_event_id
+        while True:
+            events, done = stream.wait_for(sent, CHAT_SSE_HEARTBEAT_INTERVAL)
+            if events:
+                # The server pulls the next write only once the previous one is
+                # taken, so everything produced meanwhile goes out as one write
+                # and a slow client never builds a backlog of small writes
+                yield "".join(
+                    f"id: {stream.stream_id}:{event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+                    for event_id, event, data in events
+                )
+                sent = events[-1][0]
+            if done:
+                return
+            if not events:
+                yield ": heartbeat\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+        'X-Chat-Stream-Id': stream.stream_id
+    })
+
 
 
 @chat_bp.route('/execute-code', methods=['POST'])
@@ -289,4 +452,26 @@ def record_learning():
         return jsonify({
             "success": False,
             "error": "Failed to record learning insight"
-        }), 500
\ No newline at end of file
+        }), 500
+
+@chat_bp.route('/metrics', methods=['GET'])
+def get_chat_metrics():
+    """
+    Get chat pipeline latency percentiles per stage
+    
+    Returns:
+        JSON response with p50/p90/p99 latencies for context retrieval,
+        classification, capability checks, generation and the whole chat
+    """
+    if not mama_bear_agent:
+        return jsonify({
+            "success": False,
+            "error": "Mama Bear agent not available"
+        }), 503
+    
+    return jsonify({
+        "success": True,
+        "stages": mama_bear_agent.get_chat_latency_stats(),
+        "streams": get_chat_stream_buffer(ttl_seconds=CHAT_STREAM_BUFFER_TTL).get_stats(),
+        "timestamp": datetime.now().isoformat()
+    })
\ No newline at end of file
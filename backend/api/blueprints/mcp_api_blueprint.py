@@ -6,10 +6,12 @@ including search, discovery, installation, and marketplace operations for the
 Podplay Sanctuary development environment.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from pathlib import Path
 from typing import Dict, Any
 
-from services.marketplace_service import MCPMarketplaceManager
+from data.mcp_data_loader import get_data_file_path
+from services.marketplace_service import MCPMarketplaceManager, SERVER_BATCH_LIMIT
 from utils.logging_setup import get_logger
 from utils.validators import validate_search_params, validate_server_name
 
@@ -42,9 +44,11 @@ def search_servers():
         category (str): Filter by server category
         official_only (bool): Limit results to official servers only
         limit (int): Maximum number of results to return
+        cursor (str): Opaque ``next_cursor`` from the previous page
+        include_total (bool): Count all matches (default true)
     
     Returns:
-        JSON response with matching servers and search metadata
+        JSON response with one page of matching servers and search metadata
     """
     try:
         # Extract and validate search parameters
@@ -52,7 +56,9 @@ def search_servers():
             'query': request.args.get('query', ''),
             'category': request.args.get('category', None),
             'official_only': request.args.get('official_only', 'false').lower() == 'true',
-            'limit': int(request.args.get('limit', 20))
+            'limit': int(request.args.get('limit', 20)),
+            'cursor': request.args.get('cursor') or None,
+            'include_total': request.args.get('include_total', 'true').lower() != 'false'
         }
         
         validation_result = validate_search_params(search_params)
@@ -70,23 +76,25 @@ def search_servers():
                 "servers": []
             }), 503
         
-        # Execute server search
-        servers = marketplace_manager.search_servers(
+        # Execute server search for a single page
+        page = marketplace_manager.search_servers_page(
             query=search_params['query'],
             category=search_params['category'],
-            official_only=search_params['official_only']
+            official_only=search_params['official_only'],
+            limit=search_params['limit'],
+            cursor=search_params['cursor'],
+            include_total=search_params['include_total']
         )
         
-        # Apply result limit
-        limited_servers = servers[:search_params['limit']]
-        
-        logger.info(f"Server search completed: {len(limited_servers)} results for query '{search_params['query']}'")
+        logger.info(f"Server search completed: {len(page['servers'])} results for query '{search_params['query']}'")
         
         return jsonify({
             "success": True,
-            "servers": limited_servers,
-            "total": len(servers),
-            "returned": len(limited_servers),
+            "servers": page['servers'],
+            "total": page['total'],
+            "total_is_estimate": page['total_is_estimate'],
+            "returned": len(page['servers']),
+            "next_cursor": page['next_cursor'],
             "query": search_params['query'],
             "filters": {
                 "category": search_params['category'],
@@ -231,6 +239,144 @@ def install_server(server_name: str):
             "error": "Installation operation failed"
         }), 500
 
+@mcp_bp.route('/install', methods=['POST'])
+def install_servers():
+    """
+    Install several MCP servers in one batch
+    
+    JSON Body:
+        servers (list): Names of the servers to install
+        socket_id (str): Optional Socket.IO session to receive progress events;
+            events are broadcast when omitted
+    
+    Socket.IO Events:
+        mcp_install_progress: One event per status transition of each server
+    
+    Returns:
+        JSON response with the batch summary and per-server results
+    """
+    return _run_server_batch('install')
+
+@mcp_bp.route('/uninstall', methods=['POST'])
+def uninstall_servers():
+    """
+    Uninstall several MCP servers in one batch
+    
+    JSON Body:
+        servers (list): Names of the servers to uninstall
+        socket_id (str): Optional Socket.IO session to receive progress events
+    
+    Socket.IO Events:
+        mcp_install_progress: One event per status transition of each server
+    
+    Returns:
+        JSON response with the batch summary and per-server results
+    """
+    return _run_server_batch('uninstall')
+
+def _run_server_batch(action: str):
+    """Validate a batch request, run it and stream progress over Socket.IO"""
+    try:
+        data = request.get_json(silent=True) or {}
+        server_names = data.get('servers')
+        
+        if not isinstance(server_names, list) or not server_names:
+            return jsonify({
+                "success": False,
+                "error": "A non-empty 'servers' list is required"
+            }), 400
+        
+        if len(server_names) > SERVER_BATCH_LIMIT:
+            return jsonify({
+                "success": False,
+                "error": f"At most {SERVER_BATCH_LIMIT} servers can be processed per request"
+            }), 400
+        
+        invalid = [name for name in server_names if not validate_server_name(name)]
+        if invalid:
+            return jsonify({
+                "success": False,
+                "error": "Invalid server name format",
+                "invalid": invalid
+            }), 400
+        
+        if not marketplace_manager:
+            return jsonify({
+                "success": False,
+                "error": "Marketplace service not available"
+            }), 503
+        
+        socketio = current_app.extensions.get('socketio')
+        socket_id = data.get('socket_id')
+        
+        def emit_progress(event: Dict[str, Any]):
+            if socketio is not None:
+                socketio.emit('mcp_install_progress', event, room=socket_id)
+        
+        batch = marketplace_manager.install_servers if action == 'install' else marketplace_manager.uninstall_servers
+        summary = batch(server_names, progress=emit_progress)
+        
+        logger.info(f"Batch {action}: {summary['succeeded']} succeeded, {summary['failed']} failed")
+        return jsonify(summary), 200
+        
+    except Exception as e:
+        logger.error(f"Batch {action} error: {e}")
+        return jsonify({
+            "success": False,
+            "error": f"Batch {action} operation failed"
+        }), 500
+
+@mcp_bp.route('/catalog/import', methods=['POST'])
+def import_catalog():
+    """
+    Stream a JSON catalog from the data directory into the marketplace
+    
+    JSON Body:
+        file (str): Optional catalog file name inside the data directory;
+            defaults to the marketplace data file
+        prune (bool): Delete servers missing from the file unless installed
+    
+    Returns:
+        JSON response with the import summary
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        file_name = data.get('file')
+        
+        if not marketplace_manager:
+            return jsonify({
+                "success": False,
+                "error": "Marketplace service not available"
+            }), 503
+        
+        source_path = get_data_file_path()
+        if file_name is not None:
+            if not isinstance(file_name, str) or Path(file_name).name != file_name or not file_name.endswith('.json'):
+                return jsonify({
+                    "success": False,
+                    "error": "'file' must be the name of a .json file in the data directory"
+                }), 400
+            source_path = source_path.parent / file_name
+        
+        if not source_path.exists():
+            return jsonify({
+                "success": False,
+                "error": f"Catalog file not found: {source_path.name}"
+            }), 404
+        
+        summary = marketplace_manager.import_catalog(str(source_path), prune=bool(data.get('prune', False)))
+        
+        logger.info(f"Catalog import from {source_path.name}: {summary['imported']} imported, "
+                    f"{summary['changed']} changed, {summary['removed']} removed")
+        return jsonify(summary), 200 if summary["success"] else 400
+        
+    except Exception as e:
+        logger.error(f"Catalog import error: {e}")
+        return jsonify({
+            "success": False,
+            "error": "Catalog import failed"
+        }), 500
+
 @mcp_bp.route('/trending', methods=['GET'])
 def get_trending_servers():
     """
@@ -327,12 +473,16 @@ def get_recommendations():
     
     Query Parameters:
         project_type (str): Type of project for contextualized recommendations
+        capability (str): Recommend servers providing this capability instead
+        similar_to (str): Recommend servers similar to this server instead
     
     Returns:
         JSON response with recommended servers and reasoning
     """
     try:
         project_type = request.args.get('project_type', 'general')
+        capability = request.args.get('capability', '').strip()
+        similar_to = request.args.get('similar_to', '').strip()
         
         if not marketplace_manager:
             return jsonify({
@@ -341,16 +491,26 @@ def get_recommendations():
                 "recommendations": []
             }), 503
         
-        recommendations = marketplace_manager.get_recommendations_for_project(project_type)
+        if similar_to:
+            recommendations = marketplace_manager.get_similar_servers(similar_to)
+        elif capability:
+            recommendations = marketplace_manager.get_recommendations_for_capability(capability)
+        else:
+            recommendations = marketplace_manager.get_recommendations_for_project(project_type)
         
         logger.info(f"Generated {len(recommendations)} recommendations for project type: {project_type}")
         
-        return jsonify({
+        response = {
             "success": True,
             "recommendations": recommendations,
             "count": len(recommendations),
             "project_type": project_type
-        })
+        }
+        if capability:
+            response["capability"] = capability
+        if similar_to:
+            response["similar_to"] = similar_to
+        return jsonify(response)
         
     except Exception as e:
         logger.error(f"Recommendation generation failed: {e}")
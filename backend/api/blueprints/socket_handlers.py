@@ -9,8 +9,14 @@ and Mama Bear chat functionality with proper event isolation.
 from flask import request
 from flask_socketio import emit, join_room, leave_room
 from datetime import datetime
+from typing import Dict, Tuple
 import json
+import os
+import threading
+import uuid
 
+from utils.async_bridge import run_sync
+from utils.chunk_coalescer import ChunkCoalescer
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
@@ -19,6 +25,33 @@ logger = get_logger(__name__)
 mama_bear_agent = None
 marketplace_manager = None
 
+# Framing of streamed chat responses: a chunk event is sent once this many
+# characters are buffered or the oldest buffered piece is this many seconds old
+CHAT_STREAM_MIN_FRAME_CHARS = int(os.getenv('CHAT_STREAM_MIN_FRAME_CHARS', '32'))
+CHAT_STREAM_MAX_FRAME_DELAY = float(os.getenv('CHAT_STREAM_MAX_FRAME_DELAY', '0.05'))
+
+# Cancellation flags of in-flight streamed chats, keyed by (client sid, request id)
+active_chat_streams: Dict[Tuple[str, str], threading.Event] = {}
+active_chat_streams_lock = threading.Lock()
+
+def cancel_chat_streams(client_id: str, request_id: str = None) -> int:
+    """
+    Cancel a client's streamed chat responses
+    
+    Args:
+        client_id: Socket.IO session id of the client
+        request_id: Stream to cancel, or None for all of the client's streams
+        
+    Returns:
+        Number of streams cancelled
+    """
+    with active_chat_streams_lock:
+        events = [event for (sid, stream_id), event in active_chat_streams.items()
+                  if sid == client_id and (request_id is None or stream_id == request_id)]
+    for event in events:
+        event.set()
+    return len(events)
+
 def register_socket_handlers(socketio):
     """
     Register all Socket.IO event handlers with clean separation and error handling
@@ -67,6 +100,7 @@ def register_socket_handlers(socketio):
         try:
             client_id = request.sid
             logger.info(f"Client disconnected: {client_id}")
+            cancel_chat_streams(client_id)
             
         except Exception as e:
             logger.error(f"Disconnection handling error: {e}")
@@ -260,18 +294,91 @@ def register_socket_handlers(socketio):
                 'timestamp': datetime.now().isoformat()
             })
     
+    def stream_chat_response(client_id, request_id, message, user_id, session_id, cancelled):
+        """
+        Stream one Mama Bear response to a client as sequenced chunk events
+        
+        Runs as a background task so the client can cancel while the response
+        is produced. Pieces are coalesced into frames and sent as
+        ``mama_bear_response_chunk`` events numbered from 0, followed by one
+        ``mama_bear_response_complete`` event carrying the full text, usage
+        counts and stage timings.
+        """
+        coalescer = ChunkCoalescer(CHAT_STREAM_MIN_FRAME_CHARS, CHAT_STREAM_MAX_FRAME_DELAY)
+        
+        def send_frame(frame):
+            socketio.emit('mama_bear_response_chunk', {
+                'request_id': request_id,
+                'session_id': session_id,
+                'seq': coalescer.frames - 1,
+                'delta': frame,
+                'timestamp': datetime.now().isoformat()
+            }, room=client_id)
+        
+        def on_chunk(piece):
+            frame = coalescer.add(piece)
+            if frame:
+                send_frame(frame)
+        
+        try:
+            chat_result = run_sync(mama_bear_agent.chat_stream_async(message, user_id, session_id,
+                                                                     on_chunk, cancelled))
+            frame = coalescer.flush()
+            if frame:
+                send_frame(frame)
+            
+            metadata = chat_result.get('metadata', {})
+            socketio.emit('mama_bear_response_complete', {
+                'request_id': request_id,
+                'message': chat_result.get('response', ''),
+                'session_id': session_id,
+                'user_id': user_id,
+                'timestamp': datetime.now().isoformat(),
+                'type': 'mama_bear_response',
+                'success': chat_result.get('success', True),
+                'cancelled': metadata.get('cancelled', False),
+                'chunks': coalescer.frames,
+                'usage': metadata.get('usage', {}),
+                'metadata': metadata,
+                'error': chat_result.get('error')
+            }, room=client_id)
+            
+        except Exception as agent_error:
+            logger.error(f"Mama Bear streaming error: {agent_error}")
+            socketio.emit('mama_bear_response_complete', {
+                'request_id': request_id,
+                'message': 'I encountered a technical difficulty while processing your message. Please try again.',
+                'session_id': session_id,
+                'timestamp': datetime.now().isoformat(),
+                'type': 'mama_bear_response',
+                'success': False,
+                'cancelled': cancelled.is_set(),
+                'chunks': coalescer.frames,
+                'error': str(agent_error)
+            }, room=client_id)
+        finally:
+            with active_chat_streams_lock:
+                active_chat_streams.pop((client_id, request_id), None)
+    
     @socketio.on('mama_bear_chat')
     def handle_real_time_chat(data):
         """
-        Process real-time Mama Bear chat interaction with immediate response
+        Process real-time Mama Bear chat interaction with a streamed response
+        
+        Acknowledges with ``mama_bear_response_started`` (carrying the
+        request_id used for cancellation) and streams the response in the
+        background. Clients sending ``stream: false`` receive a single
+        ``mama_bear_response`` event instead.
         
         Args:
-            data: Dictionary containing message and session context for chat processing
+            data: Dictionary containing message and session context for chat
+                processing, plus optional request_id and stream flag
         """
         try:
             message = data.get('message', '')
             session_id = data.get('session_id', request.sid)
             user_id = data.get('user_id', 'nathan')
+            request_id = str(data.get('request_id') or uuid.uuid4())
             
             if not message.strip():
                 emit('error', {
@@ -282,8 +389,23 @@ def register_socket_handlers(socketio):
             
             logger.info(f"Real-time Mama Bear chat: {message[:50]}...")
             
+            # Stream the response through Mama Bear agent if available
+            if mama_bear_agent and data.get('stream', True):
+                client_id = request.sid
+                cancelled = threading.Event()
+                with active_chat_streams_lock:
+                    active_chat_streams[(client_id, request_id)] = cancelled
+                
+                emit('mama_bear_response_started', {
+                    'request_id': request_id,
+                    'session_id': session_id,
+                    'timestamp': datetime.now().isoformat()
+                })
+                socketio.start_background_task(stream_chat_response, client_id, request_id,
+                                               message, user_id, session_id, cancelled)
+            
             # Process chat through Mama Bear agent if available
-            if mama_bear_agent:
+            elif mama_bear_agent:
                 try:
                     chat_result = mama_bear_agent.chat(message, user_id, session_id)
                     
@@ -326,6 +448,36 @@ def register_socket_handlers(socketio):
                 'timestamp': datetime.now().isoformat()
             })
     
+    @socketio.on('mama_bear_cancel')
+    def handle_chat_cancellation(data=None):
+        """
+        Cancel a streamed Mama Bear response
+        
+        The stream stops at the next piece and still ends with a
+        ``mama_bear_response_complete`` event marked as cancelled.
+        
+        Args:
+            data: Dictionary containing the request_id to cancel; without it,
+                all of the client's streams are cancelled
+        """
+        try:
+            request_id = (data or {}).get('request_id')
+            cancelled = cancel_chat_streams(request.sid, str(request_id) if request_id else None)
+            
+            emit('mama_bear_cancel_ack', {
+                'request_id': request_id,
+                'cancelled': cancelled,
+                'timestamp': datetime.now().isoformat()
+            })
+            
+        except Exception as e:
+            logger.error(f"Chat cancellation error: {e}")
+            emit('error', {
+                'message': 'Chat cancellation failed',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            })
+    
     @socketio.on('system_status_request')
     def handle_system_status_inquiry():
         """
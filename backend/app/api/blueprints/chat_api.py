@@ -4,13 +4,17 @@ Chat API Blueprint - Handles chat and AI-related endpoints
 Integrates with Mama Bear Service and Vertex AI Service
 """
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, current_app, request, jsonify, session
 import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, Any
 import uuid
 from app.services.vertex_ai_service import VertexAIService
 from app.services.mama_bear_service import MamaBearService
+from app.services.model_router import get_model_router
 import asyncio
+import threading
 import time
 
 logger = logging.getLogger(__name__)
@@ -22,6 +26,22 @@ chat_bp = Blueprint('chat', __name__, url_prefix='/api/chat')
 mama_bear_service = None
 vertex_ai_service = None
 
+_service_lock = threading.Lock()
+
+# Model comparison fan-out: models are queried concurrently on a bounded pool,
+# each limited to a timeout measured from the start of the comparison
+COMPARE_MODELS_MAX_WORKERS = int(os.getenv('COMPARE_MODELS_MAX_WORKERS', '8'))
+COMPARE_MODELS_TIMEOUT = float(os.getenv('COMPARE_MODELS_TIMEOUT', '30'))
+COMPARE_MODELS_MAX_TIMEOUT = 120.0
+
+# Overall limit for a unified chat request across its primary and hedged attempts
+UNIFIED_CHAT_TIMEOUT = float(os.getenv('UNIFIED_CHAT_TIMEOUT', '60'))
+UNIFIED_CHAT_MAX_WORKERS = int(os.getenv('UNIFIED_CHAT_MAX_WORKERS', '16'))
+
+# Separate pools, so comparisons cannot starve routed chat of workers or the reverse
+_compare_executor = ThreadPoolExecutor(max_workers=COMPARE_MODELS_MAX_WORKERS, thread_name_prefix="model-fanout")
+_router_executor = ThreadPoolExecutor(max_workers=UNIFIED_CHAT_MAX_WORKERS, thread_name_prefix="model-router")
+
 def init_chat_services(mama_bear_svc, vertex_ai_svc):
     """Initialize chat services"""
     global mama_bear_service, vertex_ai_service
@@ -29,6 +49,69 @@ def init_chat_services(mama_bear_svc, vertex_ai_svc):
     vertex_ai_service = vertex_ai_svc
     logger.info("🐻 Chat API services initialized")
 
+def _get_vertex_service() -> VertexAIService:
+    """Shared Vertex AI service: the injected one, or one created on first use and reused by every request"""
+    global vertex_ai_service
+    if vertex_ai_service is None:
+        with _service_lock:
+            if vertex_ai_service is None:
+                vertex_ai_service = VertexAIService()
+    return vertex_ai_service
+
+def _get_mama_bear_service() -> MamaBearService:
+    """Shared Mama Bear service: the injected one, or one created on first use and reused by every request"""
+    global mama_bear_service
+    if mama_bear_service is None:
+        with _service_lock:
+            if mama_bear_service is None:
+                mama_bear_service = MamaBearService()
+    return mama_bear_service
+
+def _is_vertex_model(model: str) -> bool:
+    """Whether a model is served through Vertex AI rather than ADK"""
+    return model.startswith(('gemini', 'claude', 'llama', 'mistral'))
+
+def _call_model(model: str, message: str, session_id: str = None):
+    """Send a message to a model through the service that hosts it"""
+    if _is_vertex_model(model):
+        if session_id:
+            return _get_vertex_service().chat_with_model(message, model, session_id)
+        return _get_vertex_service().chat_with_model(message, model)
+    if session_id:
+        return _get_mama_bear_service().chat_with_adk(message, model, session_id)
+    return _get_mama_bear_service().chat_with_adk(message, model)
+
+def _token_usage(message: str, response) -> Dict[str, int]:
+    """Token counts reported with a response, or estimated from word counts"""
+    if isinstance(response, dict) and isinstance(response.get('usage'), dict):
+        return response['usage']
+    text = response.get('response', '') if isinstance(response, dict) else str(response or '')
+    input_tokens = int(len(message.split()) * 1.3)
+    output_tokens = int(len(text.split()) * 1.3)
+    return {
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'total_tokens': input_tokens + output_tokens
+    }
+
+def _is_good_response(response) -> bool:
+    """Whether a model response is a usable answer"""
+    if isinstance(response, dict):
+        return response.get('success') is not False and bool(response.get('response', response))
+    return bool(response)
+
+def _timed_model_call(model: str, message: str):
+    """Call a model on a fan-out worker, returning its response and latency"""
+    start_time = time.time()
+    try:
+        response = _call_model(model, message)
+    except Exception:
+        get_model_router().record(model, time.time() - start_time, False)
+        raise
+    response_time = time.time() - start_time
+    get_model_router().record(model, response_time, _is_good_response(response))
+    return response, response_time
+
 @chat_bp.route('/mama-bear', methods=['POST'])
 def mama_bear_chat():
     """Main Mama Bear chat endpoint with Vertex AI integration"""
@@ -421,9 +504,6 @@ def search_memories():
 def get_available_models():
     """Get all available AI models across all providers"""
     try:
-        vertex_service = VertexAIService()
-        mama_bear_service = MamaBearService()
-        
         models = {
             'vertex_ai': {
                 'gemini': [
@@ -515,39 +595,16 @@ def switch_model():
 
 @chat_bp.route('/models/performance', methods=['GET'])
 def get_model_performance():
-    """Get real-time performance metrics for all models"""
+    """
+    Get live performance metrics for all models
+    
+    Latency and success rates are EWMAs over real unified chat and model
+    comparison calls, so only models that have been called are listed.
+    """
     try:
-        # Mock performance data - in production, this would come from monitoring
-        performance_data = {
-            'vertex_ai': {
-                'gemini-2.5-flash-002': {
-                    'avg_response_time': 1.2,
-                    'success_rate': 0.98,
-                    'quota_remaining': 85,
-                    'last_updated': time.time()
-                },
-                'claude-3-5-sonnet-v2@20241022': {
-                    'avg_response_time': 2.1,
-                    'success_rate': 0.96,
-                    'quota_remaining': 73,
-                    'last_updated': time.time()
-                }
-            },
-            'adk_priority': {
-                'gpt-4o': {
-                    'avg_response_time': 1.8,
-                    'success_rate': 0.97,
-                    'quota_remaining': 90,
-                    'last_updated': time.time()
-                },
-                'claude-3-opus-20240229': {
-                    'avg_response_time': 2.3,
-                    'success_rate': 0.95,
-                    'quota_remaining': 68,
-                    'last_updated': time.time()
-                }
-            }
-        }
+        performance_data = {'vertex_ai': {}, 'adk_priority': {}}
+        for model, stats in get_model_router().get_stats().items():
+            performance_data['vertex_ai' if _is_vertex_model(model) else 'adk_priority'][model] = stats
         
         return jsonify({
             'status': 'success',
@@ -561,7 +618,15 @@ def get_model_performance():
 
 @chat_bp.route('/unified', methods=['POST'])
 def unified_chat():
-    """Unified chat endpoint with automatic model selection and fallback"""
+    """
+    Unified chat endpoint with automatic model selection, hedging and fallback
+    
+    The task-based model is tried first while healthy, the fallbacks in order
+    of live expected latency. If the current model runs past its usual
+    latency (a high percentile of its recent calls), a hedged request goes to
+    the next model and the first good answer is returned; failures fail over
+    immediately.
+    """
     try:
         data = request.get_json()
         message = data.get('message', '')
@@ -596,28 +661,17 @@ def unified_chat():
             'gpt-4o'  # External fallback
         ]
         
-        response = None
-        used_model = None
-        
-        for model in models_to_try:
-            try:
-                if model.startswith('gemini') or model.startswith('claude') or model.startswith('llama') or model.startswith('mistral'):
-                    # Use Vertex AI
-                    vertex_service = VertexAIService()
-                    response = vertex_service.chat_with_model(message, model, session_id)
-                    used_model = model
-                    break
-                else:
-                    # Use ADK for OpenAI/Anthropic direct
-                    mama_bear_service = MamaBearService()
-                    response = mama_bear_service.chat_with_adk(message, model, session_id)
-                    used_model = model
-                    break
-            except Exception as model_error:
-                logging.warning(f"Model {model} failed: {model_error}")
-                continue
-        
-        if not response:
+        try:
+            # Vertex AI for hosted models, ADK for OpenAI/Anthropic direct
+            used_model, response, attempted = get_model_router().call(
+                models_to_try,
+                lambda model: _call_model(model, message, session_id),
+                _router_executor,
+                UNIFIED_CHAT_TIMEOUT,
+                is_good=_is_good_response
+            )
+        except Exception as routing_error:
+            logging.warning(f"Unified chat failed: {routing_error}")
             return jsonify({'status': 'error', 'message': 'All models failed'}), 500
         
         # Update session
@@ -634,7 +688,8 @@ def unified_chat():
             'response': response,
             'model_used': used_model,
             'session_id': session_id,
-            'fallback_used': used_model != selected_model
+            'fallback_used': used_model != selected_model,
+            'models_attempted': attempted
         })
         
     except Exception as e:
@@ -643,47 +698,95 @@ def unified_chat():
 
 @chat_bp.route('/compare-models', methods=['POST'])
 def compare_models():
-    """Compare responses from multiple models for the same prompt"""
+    """
+    Compare responses from multiple models for the same prompt
+    
+    Models are queried concurrently, so the comparison takes about as long as
+    the slowest model. A model still running when the timeout (seconds from
+    the start of the comparison) passes is reported as timed out. With
+    ``stream: true`` and a Socket.IO ``socket_id``, each result is also
+    emitted as ``model_comparison_result`` as soon as its model finishes,
+    followed by ``model_comparison_complete``.
+    """
     try:
         data = request.get_json()
         message = data.get('message', '')
-        models = data.get('models', ['gemini-2.5-flash-002', 'claude-3-5-sonnet-v2@20241022', 'gpt-4o'])
+        models = list(dict.fromkeys(data.get('models', ['gemini-2.5-flash-002', 'claude-3-5-sonnet-v2@20241022', 'gpt-4o'])))
+        timeout = min(float(data.get('timeout', COMPARE_MODELS_TIMEOUT)), COMPARE_MODELS_MAX_TIMEOUT)
+        socket_id = data.get('socket_id') if data.get('stream') else None
         
         if not message:
             return jsonify({'status': 'error', 'message': 'Message is required'}), 400
         
+        comparison_id = str(uuid.uuid4())
+        socketio = current_app.config.get('SOCKETIO_INSTANCE') if socket_id else None
+        
+        def publish(event, payload):
+            if socketio is not None:
+                socketio.emit(event, dict(payload, comparison_id=comparison_id), room=socket_id)
+        
+        started = time.time()
+        pending = {_compare_executor.submit(_timed_model_call, model, message): model for model in models}
         results = {}
+        completion_order = []
         
-        for model in models:
-            try:
-                start_time = time.time()
-                
-                if model.startswith('gemini') or model.startswith('claude') or model.startswith('llama') or model.startswith('mistral'):
-                    vertex_service = VertexAIService()
-                    response = vertex_service.chat_with_model(message, model)
-                else:
-                    mama_bear_service = MamaBearService()
-                    response = mama_bear_service.chat_with_adk(message, model)
-                
-                response_time = time.time() - start_time
-                
-                results[model] = {
-                    'response': response,
-                    'response_time': response_time,
-                    'status': 'success'
-                }
+        while pending:
+            done, _ = wait(pending, timeout=max(0.0, started + timeout - time.time()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            
+            for future in done:
+                model = pending.pop(future)
+                try:
+                    response, response_time = future.result()
+                    result = {
+                        'response': response,
+                        'response_time': response_time,
+                        'usage': _token_usage(message, response),
+                        'status': 'success'
+                    }
+                except Exception as model_error:
+                    result = {
+                        'response': None,
+                        'response_time': time.time() - started,
+                        'error': str(model_error),
+                        'status': 'error'
+                    }
                 
-            except Exception as model_error:
-                results[model] = {
-                    'response': None,
-                    'error': str(model_error),
-                    'status': 'error'
-                }
+                results[model] = result
+                completion_order.append(model)
+                publish('model_comparison_result', {'model': model, **result})
+        
+        for future, model in pending.items():
+            # The worker cannot be interrupted; its late result is discarded
+            future.cancel()
+            results[model] = {
+                'response': None,
+                'response_time': timeout,
+                'error': f'Timed out after {timeout:.1f}s',
+                'status': 'timeout'
+            }
+            completion_order.append(model)
+            publish('model_comparison_result', {'model': model, **results[model]})
+        
+        total_time = time.time() - started
+        summary = {
+            'succeeded': sum(1 for result in results.values() if result['status'] == 'success'),
+            'failed': sum(1 for result in results.values() if result['status'] == 'error'),
+            'timed_out': sum(1 for result in results.values() if result['status'] == 'timeout'),
+            'total_tokens': sum(result.get('usage', {}).get('total_tokens', 0) for result in results.values()),
+            'total_time': total_time,
+            'sequential_time': sum(result['response_time'] for result in results.values())
+        }
+        publish('model_comparison_complete', {'completion_order': completion_order, 'summary': summary})
         
         return jsonify({
             'status': 'success',
+            'comparison_id': comparison_id,
             'prompt': message,
             'results': results,
+            'completion_order': completion_order,
+            'summary': summary,
             'comparison_time': time.time()
         })
         
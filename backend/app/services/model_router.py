@@ -0,0 +1,369 @@
+"""
+Model Router
+Latency-aware model selection with hedged requests
+
+Tracks an exponentially weighted moving average (EWMA) of latency and error
+rate per model from live traffic. Requests are routed to the model expected
+to answer successfully soonest. When the chosen model is slower than its own
+usual latency percentile, a hedged duplicate goes to the next-best model.
+The first good answer wins, so one slow but live model cannot hold a request
+hostage. Attempts per model are capped across requests, so losing attempts
+that are still running cannot pile up on a slow model.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALPHA = float(os.getenv('MODEL_ROUTER_EWMA_ALPHA', '0.2'))
+DEFAULT_HEDGE_PERCENTILE = float(os.getenv('MODEL_ROUTER_HEDGE_PERCENTILE', '0.95'))
+DEFAULT_MIN_HEDGE_DELAY = float(os.getenv('MODEL_ROUTER_MIN_HEDGE_DELAY', '0.25'))
+DEFAULT_MAX_HEDGE_DELAY = float(os.getenv('MODEL_ROUTER_MAX_HEDGE_DELAY', '5.0'))
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv('MODEL_ROUTER_MAX_IN_FLIGHT', '2'))
+DEFAULT_MAX_PER_MODEL = int(os.getenv('MODEL_ROUTER_MAX_PER_MODEL', '8'))
+
+# Latency assumed for models without samples, used for ranking and as their hedge delay
+DEFAULT_PRIOR_LATENCY = 2.0
+
+# Samples needed before a model's percentile or health is trusted
+MIN_SAMPLES = 5
+
+# Error-rate EWMA at which a preferred model loses its first place in the route
+UNHEALTHY_ERROR_RATE = 0.5
+
+LATENCY_WINDOW = 256
+
+# Seconds between checks for a queued attempt to start running
+START_POLL_INTERVAL = 0.05
+
+class ModelStats:
+    """Live latency and error statistics of one model"""
+    
+    def __init__(self):
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error = 0.0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0
+        self.wins = 0
+        self.skipped = 0
+        self.in_flight = 0
+        self.last_updated: Optional[float] = None
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile of successful calls, or None before MIN_SAMPLES"""
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class _Attempt:
+    """One model attempt of a routed request"""
+    
+    __slots__ = ('model', 'started')
+    
+    def __init__(self, model: str):
+        self.model = model
+        self.started: Optional[float] = None
+
+class ModelRouter:
+    """
+    Thread-safe per-model statistics with route ranking and hedged execution
+    """
+    
+    def __init__(self, alpha: float = DEFAULT_ALPHA, hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+                 min_hedge_delay: float = DEFAULT_MIN_HEDGE_DELAY, max_hedge_delay: float = DEFAULT_MAX_HEDGE_DELAY,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, max_per_model: int = DEFAULT_MAX_PER_MODEL):
+        """
+        Initialize routing policy
+        
+        Args:
+            alpha: EWMA weight of the newest sample
+            hedge_percentile: Latency percentile of a model after which a hedge is sent
+            min_hedge_delay: Lower bound of the hedge delay in seconds
+            max_hedge_delay: Upper bound of the hedge delay in seconds
+            max_in_flight: Most attempts of one request running at once
+            max_per_model: Most attempts queued or running on one model across all requests
+        """
+        self.alpha = alpha
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_per_model = max(1, max_per_model)
+        self._models: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, model: str, latency: float, success: bool):
+        """
+        Record the outcome of one model call
+        
+        Args:
+            model: Model identifier
+            latency: Call duration in seconds
+            success: Whether the call produced a usable answer
+        """
+        with self._lock:
+            stats = self._models.setdefault(model, ModelStats())
+            stats.requests += 1
+            stats.ewma_error += self.alpha * ((0.0 if success else 1.0) - stats.ewma_error)
+            if success:
+                stats.latencies.append(latency)
+                if stats.ewma_latency is None:
+                    stats.ewma_latency = latency
+                else:
+                    stats.ewma_latency += self.alpha * (latency - stats.ewma_latency)
+            else:
+                stats.errors += 1
+            stats.last_updated = time.time()
+    
+    def _score(self, model: str) -> float:
+        """Expected seconds until a successful answer, retrying on errors (caller holds the lock)"""
+        stats = self._models.get(model)
+        if stats is None or stats.ewma_latency is None:
+            return DEFAULT_PRIOR_LATENCY
+        return stats.ewma_latency / max(0.05, 1.0 - stats.ewma_error)
+    
+    def _is_unhealthy(self, model: str) -> bool:
+        """Whether a model fails often enough to be tried last (caller holds the lock)"""
+        stats = self._models.get(model)
+        return stats is not None and stats.requests >= MIN_SAMPLES and stats.ewma_error >= UNHEALTHY_ERROR_RATE
+    
+    def route(self, candidates: Sequence[str]) -> List[str]:
+        """
+        Order candidate models for a request
+        
+        The first candidate is the caller's preference and keeps first place
+        while healthy; the others are ranked by expected time to a successful
+        answer. Unhealthy models go last.
+        
+        Args:
+            candidates: Models in preference order
+        
+        Returns:
+            Deduplicated models in the order they should be tried
+        """
+        models = list(dict.fromkeys(candidates))
+        if not models:
+            return []
+        
+        with self._lock:
+            preferred = [] if self._is_unhealthy(models[0]) else models[:1]
+            rest = [model for model in models if model not in preferred]
+            rest.sort(key=lambda model: (self._is_unhealthy(model), self._score(model)))
+        return preferred + rest
+    
+    def hedge_delay(self, model: str) -> float:
+        """
+        Seconds to wait on a model before hedging to the next one
+        
+        Args:
+            model: Model the request is waiting on
+        
+        Returns:
+            The model's latency percentile, clamped to the configured bounds
+        """
+        with self._lock:
+            stats = self._models.get(model)
+            delay = stats.percentile(self.hedge_percentile) if stats is not None else None
+        if delay is None:
+            delay = DEFAULT_PRIOR_LATENCY
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, delay))
+    
+    def call(self, candidates: Sequence[str], call: Callable[[str], Any], executor: Executor, timeout: float,
+             is_good: Callable[[Any], bool] = bool) -> Tuple[str, Any, List[str]]:
+        """
+        Run a request against the best model, hedging and failing over to the next ones
+        
+        A further model is started when the newest attempt has been running
+        past its hedge delay (at most ``max_in_flight`` at once), or straight
+        away when an attempt fails. Models already at ``max_per_model``
+        attempts are skipped. Time spent queued on the executor counts
+        towards the timeout but neither towards the hedge delay nor towards
+        the model's latency. The first good answer wins. Losing attempts
+        that have not started are cancelled; running ones finish in the
+        background and are discarded, but still feed the statistics.
+        
+        Args:
+            candidates: Models in preference order
+            call: Callable sending the request to one model
+            executor: Pool running the attempts
+            timeout: Maximum seconds for the whole request
+            is_good: Predicate accepting a model's answer
+        
+        Returns:
+            Tuple of the winning model, its answer and every model attempted
+        
+        Raises:
+            RuntimeError: When every model failed or was at its limit
+            TimeoutError: When no model answered within the timeout
+        """
+        route = self.route(candidates)
+        deadline = time.monotonic() + timeout
+        running: Dict[Future, _Attempt] = {}
+        attempted: List[str] = []
+        newest: Optional[_Attempt] = None
+        hedge_blocked_until = 0.0
+        errors = []
+        
+        def launch(hedge: bool = False) -> bool:
+            nonlocal newest
+            model = self._acquire(route, attempted)
+            if model is None:
+                return False
+            if hedge:
+                with self._lock:
+                    self._models[model].hedges += 1
+            attempted.append(model)
+            newest = _Attempt(model)
+            try:
+                future = executor.submit(self._timed_call, newest, call, is_good)
+            except Exception:
+                self._release(model)
+                raise
+            future.add_done_callback(lambda _, model=model: self._release(model))
+            running[future] = newest
+            return True
+        
+        if not launch():
+            raise RuntimeError(f"All models are at their in-flight limit ({', '.join(route)})")
+        try:
+            while running:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutError(f"No model answered within {timeout:.1f}s (tried {', '.join(attempted)})")
+                
+                can_hedge = len(attempted) < len(route) and len(running) < self.max_in_flight
+                wait_for = deadline - now
+                if can_hedge:
+                    if newest.started is None:
+                        # Still queued on the executor: the hedge clock starts when it runs
+                        wait_for = min(wait_for, START_POLL_INTERVAL)
+                    else:
+                        hedge_at = max(newest.started + self.hedge_delay(newest.model), hedge_blocked_until)
+                        wait_for = min(wait_for, max(0.0, hedge_at - now))
+                
+                done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+                if not done:
+                    now = time.monotonic()
+                    if can_hedge and newest.started is not None and now >= hedge_blocked_until and \
+                            now >= newest.started + self.hedge_delay(newest.model):
+                        hedged_from = newest.model
+                        if launch(hedge=True):
+                            logger.info(f"Hedging {hedged_from} with {newest.model}")
+                        else:
+                            # Every remaining model is at its limit; look again later
+                            hedge_blocked_until = now + self.min_hedge_delay
+                    continue
+                
+                for future in done:
+                    model = running.pop(future).model
+                    try:
+                        answer = future.result()
+                    except Exception as e:
+                        logger.warning(f"Model {model} failed: {e}")
+                        errors.append(f"{model}: {e}")
+                        continue
+                    
+                    with self._lock:
+                        self._models[model].wins += 1
+                    return model, answer, attempted
+                
+                # Replace each failed attempt right away instead of waiting for a hedge delay
+                for _ in done:
+                    if len(attempted) < len(route) and len(running) < self.max_in_flight:
+                        launch()
+        finally:
+            for future in running:
+                future.cancel()
+        
+        raise RuntimeError(f"All models failed: {'; '.join(errors) or 'no model below its in-flight limit'}")
+    
+    def _acquire(self, route: List[str], attempted: List[str]) -> Optional[str]:
+        """Reserve a slot on the next untried model below its in-flight limit, or return None"""
+        with self._lock:
+            for model in route:
+                if model in attempted:
+                    continue
+                stats = self._models.setdefault(model, ModelStats())
+                if stats.in_flight < self.max_per_model:
+                    stats.in_flight += 1
+                    return model
+                stats.skipped += 1
+        return None
+    
+    def _release(self, model: str):
+        """Free a model slot once its attempt finished or was cancelled"""
+        with self._lock:
+            self._models[model].in_flight -= 1
+    
+    def _timed_call(self, attempt: _Attempt, call: Callable[[str], Any], is_good: Callable[[Any], bool]) -> Any:
+        """Run one attempt, recording its latency (from when it started running) and outcome"""
+        started = attempt.started = time.monotonic()
+        try:
+            answer = call(attempt.model)
+        except Exception:
+            self.record(attempt.model, time.monotonic() - started, False)
+            raise
+        
+        good = is_good(answer)
+        self.record(attempt.model, time.monotonic() - started, good)
+        if not good:
+            raise RuntimeError("unusable answer")
+        return answer
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get live performance figures per model
+        
+        Returns:
+            Dictionary mapping model names to EWMA latency, success rate,
+            latency percentiles, request/error counts and hedging counters
+        """
+        with self._lock:
+            snapshot = {model: (stats, stats.percentile(0.5), stats.percentile(0.95), self._score(model))
+                        for model, stats in self._models.items()}
+            return {
+                model: {
+                    'avg_response_time': round(stats.ewma_latency, 4) if stats.ewma_latency is not None else None,
+                    'success_rate': round(1.0 - stats.ewma_error, 4),
+                    'p50_response_time': round(p50, 4) if p50 is not None else None,
+                    'p95_response_time': round(p95, 4) if p95 is not None else None,
+                    'expected_time': round(score, 4),
+                    'requests': stats.requests,
+                    'errors': stats.errors,
+                    'hedged_requests': stats.hedges,
+                    'wins': stats.wins,
+                    'skipped_at_limit': stats.skipped,
+                    'in_flight': stats.in_flight,
+                    'healthy': not self._is_unhealthy(model),
+                    'last_updated': stats.last_updated
+                }
+                for model, (stats, p50, p95, score) in snapshot.items()
+            }
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+def get_model_router(**settings: Any) -> ModelRouter:
+    """
+    Get the process-wide model router, creating it on first use
+    
+    Args:
+        **settings: ModelRouter arguments used when the router is created
+    
+    Returns:
+        Shared ModelRouter instance
+    """
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(**settings)
+        return _router
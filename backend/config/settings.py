@@ -16,9 +16,17 @@ class Config:
     
     # Database configuration
     DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///sanctuary.db'
+    DATABASE_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', '8'))
+    DATABASE_WRITE_BATCH_SIZE = int(os.environ.get('DATABASE_WRITE_BATCH_SIZE', '100'))
+    DATABASE_WRITE_FLUSH_MS = int(os.environ.get('DATABASE_WRITE_FLUSH_MS', '50'))
     
     # MCP Configuration
     MCP_DISCOVERY_ENABLED = os.environ.get('MCP_DISCOVERY_ENABLED', 'True').lower() == 'true'
+    MCP_RESULT_CACHE_SIZE = int(os.environ.get('MCP_RESULT_CACHE_SIZE', '256'))
+    MCP_RESULT_CACHE_TTL = float(os.environ.get('MCP_RESULT_CACHE_TTL', '300'))
+    MCP_CATALOG_WATCH_ENABLED = os.environ.get('MCP_CATALOG_WATCH_ENABLED', 'True').lower() == 'true'
+    MCP_CATALOG_POLL_INTERVAL = float(os.environ.get('MCP_CATALOG_POLL_INTERVAL', '2'))
+    MCP_INSTALL_WORKERS = int(os.environ.get('MCP_INSTALL_WORKERS', '4'))
     
     # External API Keys
     MEM0_API_KEY = os.environ.get('MEM0_API_KEY')
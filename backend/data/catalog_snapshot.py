@@ -0,0 +1,382 @@
+"""
+MCP Catalog Snapshot
+
+Compiled binary form of ``mcp_servers.json`` that is loaded through ``mmap``
+instead of being parsed. JSON stays the editable source of truth; the
+snapshot is regenerated from it and records which JSON file (size and
+modification time) it was built from, so a stale snapshot is never used.
+
+File layout (all integers little-endian):
+
+- header: magic, format version, counts, source stamp and section offsets
+- rows: one fixed-width row per server holding string ids, list spans,
+  popularity score, flags and the SHA-256 content hash of its catalog
+  fields, so record ``i`` is found by arithmetic
+- list items: string ids referenced by the tag/dependency/capability spans
+- string table: offsets followed by deduplicated UTF-8 string data
+
+Rows are decoded into MCPServer objects only when accessed; names, content
+hashes and single fields can be read without decoding the record, so a
+database sync only decodes the records that changed and the marketplace
+index can serve catalog fields straight from the mapping. The mapping is
+read-only and file-backed, so worker processes share the same pages.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from models.mcp_server import MCPServer
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC = b"MCPSNAP\x00"
+SNAPSHOT_FORMAT_VERSION = 2
+
+# magic, format version, record count, string count, list item count,
+# source mtime (ns), source size, rows offset, list items offset,
+# string offsets offset, string data offset
+_HEADER = struct.Struct("<8sIIIIqqQQQQ")
+
+# Scalar string fields stored as string ids, in row order
+_STRING_FIELDS = (
+    "name", "description", "repository_url", "author", "category", "version",
+    "installation_method", "configuration_schema", "last_updated", "installation_status"
+)
+
+# List fields stored as (start, count) spans into the list item section
+_LIST_FIELDS = ("tags", "dependencies", "capabilities")
+
+# String ids, list spans, popularity score, flags, content hash digest
+_ROW = struct.Struct(f"<{len(_STRING_FIELDS)}I{len(_LIST_FIELDS) * 2}IiI32s")
+
+# Byte offset of the content hash digest within a row
+_HASH_OFFSET = _ROW.size - 32
+
+# Popularity score and flags, and their byte offset within a row
+_SCALARS = struct.Struct("<iI")
+_SCALAR_OFFSET = 4 * (len(_STRING_FIELDS) + 2 * len(_LIST_FIELDS))
+
+_STRING_POSITIONS = {field: position for position, field in enumerate(_STRING_FIELDS)}
+_LIST_POSITIONS = {field: position for position, field in enumerate(_LIST_FIELDS)}
+
+_FLAG_OFFICIAL = 1
+_FLAG_INSTALLED = 2
+
+_U32_PAIR = struct.Struct("<II")
+
+def source_stamp(source_path: Union[str, Path]) -> Tuple[int, int]:
+    """
+    Identify a JSON source file version by modification time and size
+    
+    Args:
+        source_path: Path to the JSON catalog
+    
+    Returns:
+        Tuple of (mtime in nanoseconds, size in bytes)
+    """
+    stat = os.stat(source_path)
+    return stat.st_mtime_ns, stat.st_size
+
+class _StringTable:
+    """Deduplicating string table used while writing a snapshot"""
+    
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[bytes] = []
+    
+    def add(self, value: Any) -> int:
+        text = "" if value is None else str(value)
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[text] = string_id
+            self.strings.append(text.encode("utf-8"))
+        return string_id
+
+def write_snapshot(servers: Sequence[MCPServer], snapshot_path: Union[str, Path],
+                   source_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Compile servers into a binary snapshot file
+    
+    The file is written to a temporary name and renamed into place, so
+    readers never observe a partially written snapshot.
+    
+    Args:
+        servers: Servers to store
+        snapshot_path: Destination path
+        source_path: JSON file the servers were loaded from, recorded so
+            stale snapshots can be detected
+    
+    Returns:
+        Path of the written snapshot
+    """
+    snapshot_path = Path(snapshot_path)
+    strings = _StringTable()
+    list_items: List[int] = []
+    rows = bytearray()
+    
+    for server in servers:
+        string_ids = [
+            strings.add(server.category.value) if field == "category"
+            else strings.add(json.dumps(server.configuration_schema, sort_keys=True)) if field == "configuration_schema"
+            else strings.add(getattr(server, field))
+            for field in _STRING_FIELDS
+        ]
+        
+        spans: List[int] = []
+        for field in _LIST_FIELDS:
+            values = getattr(server, field) or ()
+            spans.extend((len(list_items), len(values)))
+            list_items.extend(strings.add(value) for value in values)
+        
+        flags = (_FLAG_OFFICIAL if server.is_official else 0) | (_FLAG_INSTALLED if server.is_installed else 0)
+        rows += _ROW.pack(*string_ids, *spans, int(server.popularity_score or 0), flags,
+                          bytes.fromhex(server.content_hash()))
+    
+    string_offsets = [0]
+    for data in strings.strings:
+        string_offsets.append(string_offsets[-1] + len(data))
+    
+    mtime_ns, size = source_stamp(source_path) if source_path else (0, 0)
+    rows_offset = _HEADER.size
+    list_items_offset = rows_offset + len(rows)
+    string_offsets_offset = list_items_offset + 4 * len(list_items)
+    string_data_offset = string_offsets_offset + 4 * len(string_offsets)
+    
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(rows) // _ROW.size, len(strings.strings),
+        len(list_items), mtime_ns, size, rows_offset, list_items_offset,
+        string_offsets_offset, string_data_offset
+    )
+    
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as file:
+        file.write(header)
+        file.write(rows)
+        file.write(struct.pack(f"<{len(list_items)}I", *list_items))
+        file.write(struct.pack(f"<{len(string_offsets)}I", *string_offsets))
+        for data in strings.strings:
+            file.write(data)
+    os.replace(temp_path, snapshot_path)
+    
+    logger.info(f"Wrote catalog snapshot with {len(servers)} servers to {snapshot_path}")
+    return snapshot_path
+
+class CatalogSnapshot(Sequence[MCPServer]):
+    """
+    Read-only, memory-mapped view of a compiled catalog snapshot
+    
+    Behaves as a sequence of MCPServer objects; each access decodes one
+    row from the mapping.
+    """
+    
+    def __init__(self, snapshot_path: Union[str, Path]):
+        """
+        Map a snapshot file into memory
+        
+        Args:
+            snapshot_path: Path to the snapshot file
+        
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        self.path = Path(snapshot_path)
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            (magic, format_version, self._count, self._string_count, self._list_item_count,
+             self.source_mtime_ns, self.source_size, self._rows_offset, self._list_items_offset,
+             self._string_offsets_offset, self._string_data_offset) = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error as e:
+            self._mmap.close()
+            raise ValueError(f"Truncated catalog snapshot: {self.path}") from e
+        
+        if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported catalog snapshot: {self.path}")
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("catalog snapshot index out of range")
+        return self._decode_row(index)
+    
+    def __iter__(self) -> Iterator[MCPServer]:
+        for index in range(self._count):
+            yield self._decode_row(index)
+    
+    def is_fresh_for(self, source_path: Union[str, Path]) -> bool:
+        """
+        Check whether this snapshot was compiled from the given JSON file
+        
+        Args:
+            source_path: Path to the JSON catalog
+        
+        Returns:
+            True if the source file is unchanged since compilation
+        """
+        try:
+            return source_stamp(source_path) == (self.source_mtime_ns, self.source_size)
+        except OSError:
+            return False
+    
+    def name(self, index: int) -> str:
+        """
+        Read the name of row ``index`` without decoding the record
+        
+        Args:
+            index: Row position
+        
+        Returns:
+            Server name
+        """
+        string_id, = struct.unpack_from("<I", self._mmap, self._rows_offset + index * _ROW.size)
+        return self._string(string_id)
+    
+    def content_hash(self, index: int) -> str:
+        """
+        Read the content hash stored for row ``index`` at compile time
+        
+        Args:
+            index: Row position
+        
+        Returns:
+            Hex digest matching ``MCPServer.content_hash()`` of the record
+        """
+        start = self._rows_offset + index * _ROW.size + _HASH_OFFSET
+        return self._mmap[start:start + 32].hex()
+    
+    def field(self, index: int, field: str) -> Any:
+        """
+        Decode one field of row ``index`` without decoding the record
+        
+        Args:
+            index: Row position
+            field: Name of an MCPServer field stored in the snapshot
+        
+        Returns:
+            Field value as MCPServer holds it: tuples for list fields and a
+            dictionary for configuration_schema
+        
+        Raises:
+            KeyError: If the snapshot does not store the field
+        """
+        row_offset = self._rows_offset + index * _ROW.size
+        if field in _STRING_POSITIONS:
+            string_id, = struct.unpack_from("<I", self._mmap, row_offset + 4 * _STRING_POSITIONS[field])
+            value = self._string(string_id)
+            return json.loads(value or "{}") if field == "configuration_schema" else value
+        
+        if field in _LIST_POSITIONS:
+            span_offset = row_offset + 4 * (len(_STRING_FIELDS) + 2 * _LIST_POSITIONS[field])
+            return self._strings(*_U32_PAIR.unpack_from(self._mmap, span_offset))
+        
+        popularity_score, flags = _SCALARS.unpack_from(self._mmap, row_offset + _SCALAR_OFFSET)
+        if field == "popularity_score":
+            return popularity_score
+        if field == "is_official":
+            return bool(flags & _FLAG_OFFICIAL)
+        if field == "is_installed":
+            return bool(flags & _FLAG_INSTALLED)
+        raise KeyError(field)
+    
+    def iter_hashes(self) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over (name, content hash) pairs without decoding records
+        
+        Yields:
+            Name and hex content hash of each row in order
+        """
+        for index in range(self._count):
+            yield self.name(index), self.content_hash(index)
+    
+    def close(self):
+        """Unmap the snapshot file"""
+        if not self._mmap.closed:
+            self._mmap.close()
+    
+    def _string(self, string_id: int) -> str:
+        """Decode one string from the string table"""
+        start, end = _U32_PAIR.unpack_from(self._mmap, self._string_offsets_offset + 4 * string_id)
+        position = self._string_data_offset
+        return self._mmap[position + start:position + end].decode("utf-8")
+    
+    def _strings(self, start: int, count: int) -> Tuple[str, ...]:
+        """Decode a list span into strings"""
+        if not count:
+            return ()
+        string_ids = struct.unpack_from(f"<{count}I", self._mmap, self._list_items_offset + 4 * start)
+        return tuple(sys.intern(self._string(string_id)) for string_id in string_ids)
+    
+    def _decode_row(self, index: int) -> MCPServer:
+        """Build the MCPServer stored in row ``index``"""
+        row = _ROW.unpack_from(self._mmap, self._rows_offset + index * _ROW.size)
+        field_count = len(_STRING_FIELDS)
+        values: Dict[str, Any] = {
+            field: self._string(string_id) for field, string_id in zip(_STRING_FIELDS, row[:field_count])
+        }
+        values["configuration_schema"] = json.loads(values["configuration_schema"] or "{}")
+        
+        spans = row[field_count:field_count + 2 * len(_LIST_FIELDS)]
+        for position, field in enumerate(_LIST_FIELDS):
+            values[field] = self._strings(spans[2 * position], spans[2 * position + 1])
+        
+        popularity_score, flags = row[-3:-1]
+        return MCPServer(
+            popularity_score=popularity_score,
+            is_official=bool(flags & _FLAG_OFFICIAL),
+            is_installed=bool(flags & _FLAG_INSTALLED),
+            **values
+        )
+
+def open_snapshot(snapshot_path: Union[str, Path],
+                  source_path: Optional[Union[str, Path]] = None) -> Optional[CatalogSnapshot]:
+    """
+    Open a snapshot if it exists and is current
+    
+    Args:
+        snapshot_path: Path to the snapshot file
+        source_path: JSON catalog the snapshot must match, if it exists
+    
+    Returns:
+        CatalogSnapshot, or None if the snapshot is missing, unreadable or stale
+    """
+    if not os.path.exists(snapshot_path):
+        return None
+    
+    try:
+        snapshot = CatalogSnapshot(snapshot_path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable catalog snapshot {snapshot_path}: {e}")
+        return None
+    
+    if source_path is not None and os.path.exists(source_path) and not snapshot.is_fresh_for(source_path):
+        logger.info(f"Catalog snapshot {snapshot_path} is stale; using {source_path}")
+        snapshot.close()
+        return None
+    
+    return snapshot
+
+if __name__ == "__main__":
+    # Compile mcp_servers.json into a snapshot: python -m data.catalog_snapshot [json] [snapshot]
+    from data.mcp_data_loader import compile_snapshot
+    
+    arguments = sys.argv[1:]
+    result = compile_snapshot(*arguments[:2])
+    if result is None:
+        sys.exit(1)
+    print(f"Catalog snapshot written to {result}")
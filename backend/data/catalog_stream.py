@@ -0,0 +1,182 @@
+"""
+Streaming Catalog Reader
+
+Incremental reader for large ``mcp_servers.json`` documents. Instead of
+loading the whole document, the file is read in chunks and each element of
+the top-level ``servers`` array is decoded and handed out as soon as it is
+complete, together with its byte offset in the file. Memory use is bounded
+by the largest single record rather than the size of the catalog.
+"""
+
+import codecs
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+class CatalogStreamError(ValueError):
+    """Raised when the catalog document is not well-formed JSON"""
+    
+    def __init__(self, message: str, byte_offset: int):
+        super().__init__(f"{message} at byte {byte_offset}")
+        self.byte_offset = byte_offset
+
+class _ChunkedText:
+    """Text buffer over a UTF-8 file that tracks byte offsets of positions"""
+    
+    def __init__(self, file, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.text = ""
+        self.position = 0
+        self.eof = False
+        self._counted_position = 0
+        self._counted_bytes = 0
+    
+    def fill(self) -> bool:
+        """Read another chunk; returns False once the file is exhausted"""
+        if self.eof:
+            return False
+        data = self._file.read(self._chunk_size)
+        if not data:
+            self.eof = True
+            self.text += self._decoder.decode(b"", final=True)
+            return False
+        self.text += self._decoder.decode(data)
+        return True
+    
+    def byte_offset(self) -> int:
+        """Byte offset in the file of the current position"""
+        if self.position > self._counted_position:
+            self._counted_bytes += len(self.text[self._counted_position:self.position].encode("utf-8"))
+            self._counted_position = self.position
+        return self._counted_bytes
+    
+    def compact(self):
+        """Drop consumed text once it outgrows a chunk"""
+        if self.position >= self._chunk_size:
+            self.byte_offset()
+            self.text = self.text[self.position:]
+            self._counted_position = 0
+            self.position = 0
+    
+    def skip_whitespace(self):
+        while True:
+            while self.position < len(self.text) and self.text[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.text) or not self.fill():
+                return
+    
+    def peek(self) -> str:
+        """Next non-whitespace character, or an empty string at end of file"""
+        self.skip_whitespace()
+        return self.text[self.position] if self.position < len(self.text) else ""
+    
+    def expect(self, character: str):
+        if self.peek() != character:
+            raise CatalogStreamError(f"Expected '{character}'", self.byte_offset())
+        self.position += 1
+    
+    def decode_value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode one complete JSON value, reading more data as needed"""
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.position)
+            except json.JSONDecodeError as e:
+                # A value cut off by the chunk boundary decodes once more data arrives
+                if self.fill():
+                    continue
+                raise CatalogStreamError(f"Malformed JSON ({e.msg})", self.byte_offset()) from e
+            
+            # Numbers and literals may also be cut off by the chunk boundary
+            if end == len(self.text) and not self.eof and not isinstance(value, (dict, list, str)):
+                self.fill()
+                continue
+            
+            self.position = end
+            return value
+
+def iter_catalog_records(source_path: Union[str, Path], header: Optional[Dict[str, Any]] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Stream the elements of a catalog document's ``servers`` array
+    
+    Top-level keys other than ``servers`` are decoded whole (they are small
+    metadata) and stored in ``header`` if one is supplied.
+    
+    Args:
+        source_path: Path to the JSON catalog
+        header: Optional dictionary that receives the other top-level values
+        chunk_size: Number of bytes read per chunk
+    
+    Yields:
+        Tuples of (record index, byte offset of the record, decoded record)
+    
+    Raises:
+        CatalogStreamError: If the document is not well-formed
+    """
+    decoder = json.JSONDecoder()
+    found_servers = False
+    
+    with open(source_path, "rb") as file:
+        stream = _ChunkedText(file, chunk_size)
+        stream.expect("{")
+        
+        if stream.peek() == "}":
+            stream.position += 1
+        else:
+            while True:
+                if stream.peek() != '"':
+                    raise CatalogStreamError("Expected object key", stream.byte_offset())
+                key = stream.decode_value(decoder)
+                stream.expect(":")
+                
+                if key == "servers":
+                    found_servers = True
+                    yield from _iter_array(stream, decoder)
+                else:
+                    value = stream.decode_value(decoder)
+                    if header is not None:
+                        header[key] = value
+                
+                stream.compact()
+                separator = stream.peek()
+                stream.position += 1
+                if separator == "}":
+                    break
+                if separator != ",":
+                    raise CatalogStreamError("Expected ',' or '}'", stream.byte_offset() - 1)
+    
+    if not found_servers:
+        raise CatalogStreamError("Missing 'servers' array", 0)
+
+def _iter_array(stream: _ChunkedText, decoder: json.JSONDecoder) -> Iterator[Tuple[int, int, Any]]:
+    """Yield (index, byte offset, value) for each element of a JSON array"""
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.position += 1
+        return
+    
+    index = 0
+    while True:
+        stream.skip_whitespace()
+        stream.compact()
+        offset = stream.byte_offset()
+        yield index, offset, stream.decode_value(decoder)
+        index += 1
+        
+        separator = stream.peek()
+        stream.position += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise CatalogStreamError("Expected ',' or ']'", stream.byte_offset() - 1)
@@ -0,0 +1,212 @@
+"""
+MCP Catalog File Watcher
+
+Watches the MCP catalog JSON file and calls back when its contents change,
+so the marketplace can reload without a backend restart. On Linux the
+containing directory is watched with inotify (through ctypes, no extra
+dependency), which also catches editors that save by renaming a temporary
+file over the original. Elsewhere, or if inotify is unavailable, the file is
+polled for size and modification time changes.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# inotify constants from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+_EVENT_HEADER = struct.Struct("iIII")
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """Modification time and size of a file, or None if it does not exist"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class CatalogFileWatcher:
+    """
+    Background watcher that reports content changes to a single file
+    
+    Bursts of events (an editor writing in several steps) are coalesced:
+    the callback fires once the file has been quiet for ``debounce_seconds``
+    and its size or modification time differs from the last reported state.
+    """
+    
+    def __init__(self, path_provider: Callable[[], Path], on_change: Callable[[Path], None],
+                 poll_interval: float = 2.0, debounce_seconds: float = 0.5):
+        """
+        Initialize watcher configuration
+        
+        Args:
+            path_provider: Returns the path to watch; re-evaluated on every
+                check so a file created after startup is picked up
+            on_change: Called from the watcher thread with the changed path
+            poll_interval: Seconds between checks when polling
+            debounce_seconds: Quiet period required before reporting a change
+        """
+        self.path_provider = path_provider
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        
+        self.mode: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_stamp: Optional[Tuple[int, int]] = None
+        self._stats = {"events": 0, "changes": 0, "errors": 0, "last_change": None}
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the watcher thread is active"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start watching in a daemon thread"""
+        if self.is_running:
+            return
+        
+        self._stop.clear()
+        self._last_stamp = _file_stamp(self.path_provider())
+        self._thread = threading.Thread(target=self._run, name="mcp-catalog-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop the watcher thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+    
+    def _run(self):
+        """Watcher thread main loop: inotify when possible, polling otherwise"""
+        inotify = self._open_inotify()
+        if inotify is not None:
+            self.mode = "inotify"
+            logger.info(f"Watching MCP catalog with inotify: {self.path_provider()}")
+            try:
+                self._watch_inotify(inotify)
+            finally:
+                os.close(inotify)
+        else:
+            self.mode = "polling"
+            logger.info(f"Watching MCP catalog by polling every {self.poll_interval}s: {self.path_provider()}")
+            self._watch_polling()
+    
+    def _open_inotify(self) -> Optional[int]:
+        """Create an inotify descriptor watching the catalog's directory"""
+        if not sys.platform.startswith("linux"):
+            return None
+        
+        directory = self.path_provider().parent
+        if not directory.is_dir():
+            return None
+        
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            if libc.inotify_add_watch(fd, os.fsencode(str(directory)), _WATCH_MASK) < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, "inotify_add_watch failed")
+            return fd
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable, falling back to polling: {e}")
+            return None
+    
+    def _watch_inotify(self, fd: int):
+        """Wait for directory events that touch the catalog file"""
+        pending_since: Optional[float] = None
+        
+        while not self._stop.is_set():
+            timeout = self.debounce_seconds if pending_since is not None else 1.0
+            readable, _, _ = select.select([fd], [], [], timeout)
+            
+            if readable:
+                file_name = self.path_provider().name
+                if self._read_events(fd, file_name):
+                    pending_since = time.monotonic()
+                continue
+            
+            if pending_since is not None and time.monotonic() - pending_since >= self.debounce_seconds:
+                pending_since = None
+                self._check_for_change()
+    
+    def _read_events(self, fd: int, file_name: str) -> bool:
+        """Drain pending inotify events; True if any concerned the file"""
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        
+        relevant = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            start = offset + _EVENT_HEADER.size
+            name = data[start:start + name_length].rstrip(b"\0").decode("utf-8", "replace")
+            offset = start + name_length
+            if name == file_name:
+                relevant = True
+                self._stats["events"] += 1
+        return relevant
+    
+    def _watch_polling(self):
+        """Check the file's size and modification time at a fixed interval"""
+        while not self._stop.wait(self.poll_interval):
+            self._check_for_change()
+    
+    def _check_for_change(self):
+        """Report the file if its stamp differs from the last reported one"""
+        path = self.path_provider()
+        stamp = _file_stamp(path)
+        if stamp is None or stamp == self._last_stamp:
+            return
+        
+        self._last_stamp = stamp
+        self._stats["changes"] += 1
+        self._stats["last_change"] = time.time()
+        logger.info(f"MCP catalog changed on disk: {path}")
+        
+        try:
+            self.on_change(path)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"MCP catalog reload failed: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get watcher status for monitoring
+        
+        Returns:
+            Dictionary containing mode, running state and change counters
+        """
+        return {
+            "running": self.is_running,
+            "mode": self.mode,
+            "path": str(self.path_provider()),
+            **self._stats
+        }
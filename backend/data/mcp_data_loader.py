@@ -8,63 +8,147 @@ for the Podplay Sanctuary marketplace system.
 
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Iterator, Optional, Sequence, Union
 from pathlib import Path
 
 from models.mcp_server import MCPServer, MCPCategory
+from data.catalog_snapshot import CatalogSnapshot, open_snapshot, write_snapshot
+from data.catalog_stream import iter_catalog_records
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
-def load_mcp_servers() -> List[MCPServer]:
+def load_mcp_servers() -> Sequence[MCPServer]:
     """
     Load MCP servers from external JSON configuration with error handling
     
+    A compiled snapshot next to the JSON file is preferred when it is up to
+    date; it is memory-mapped and servers are decoded as they are accessed.
+    
     Returns:
-        List of MCPServer instances loaded from configuration
+        Sequence of MCPServer instances loaded from configuration
     """
     try:
         # Get path to data file
         data_file_path = _get_data_file_path()
         
+        snapshot = load_catalog_snapshot(data_file_path)
+        if snapshot is not None:
+            return snapshot
+        
         if not data_file_path.exists():
             logger.warning(f"MCP servers data file not found: {data_file_path}")
             return _get_fallback_servers()
         
-        # Load and parse JSON data
-        with open(data_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        servers = _load_servers_from_file(data_file_path)
+        return servers if servers is not None else _get_fallback_servers()
         
-        # Validate data structure
-        validation_result = _validate_data_structure(data)
-        if not validation_result['valid']:
-            logger.error(f"Invalid data structure: {validation_result['error']}")
-            return _get_fallback_servers()
+    except Exception as e:
+        logger.error(f"Failed to load MCP servers: {e}")
+        return _get_fallback_servers()
+
+def load_catalog_snapshot(data_file_path: Optional[Union[str, Path]] = None) -> Optional[CatalogSnapshot]:
+    """
+    Open the compiled snapshot of a JSON catalog if it is up to date
+    
+    Args:
+        data_file_path: JSON catalog the snapshot belongs to (defaults to
+            the data file)
         
-        # Convert server data to MCPServer objects
-        servers = []
-        for server_data in data.get('servers', []):
-            try:
-                server = _create_server_from_data(server_data)
-                servers.append(server)
-            except Exception as e:
-                logger.warning(f"Failed to create server from data: {e}")
-                logger.warning(f"Problematic server data: {server_data.get('name', 'unknown')}")
-                continue
+    Returns:
+        CatalogSnapshot, or None if there is no current snapshot
+    """
+    data_file_path = Path(data_file_path) if data_file_path else _get_data_file_path()
+    snapshot = open_snapshot(_get_snapshot_path(data_file_path), data_file_path)
+    if snapshot is not None:
+        logger.info(f"Loaded {len(snapshot)} MCP servers from snapshot {snapshot.path}")
+    return snapshot
+
+def _load_servers_from_file(data_file_path: Path) -> Optional[List[MCPServer]]:
+    """
+    Parse and validate a JSON catalog file
+    
+    Invalid server records are skipped and reported individually.
+    
+    Args:
+        data_file_path: Path to the JSON catalog
         
-        logger.info(f"Successfully loaded {len(servers)} MCP servers from configuration")
+    Returns:
+        List of MCPServer instances, or None if the file holds no valid servers
+    """
+    header: Dict[str, Any] = {}
+    servers = list(iter_mcp_servers(data_file_path, header=header))
+    
+    if 'version' not in header:
+        logger.warning(f"Catalog {data_file_path} does not declare a version")
+    
+    if not servers:
+        logger.error(f"No valid servers defined in {data_file_path}")
+        return None
+    
+    logger.info(f"Successfully loaded {len(servers)} MCP servers from configuration")
+    
+    # Log metadata information
+    metadata = header.get('metadata', {})
+    if metadata:
+        logger.debug(f"Data version: {metadata.get('schema_version', 'unknown')}")
+        logger.debug(f"Last updated: {header.get('last_updated', 'unknown')}")
+    
+    return servers
+
+def iter_mcp_servers(source_path: Optional[Union[str, Path]] = None,
+                     on_error: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     header: Optional[Dict[str, Any]] = None) -> Iterator[MCPServer]:
+    """
+    Stream servers from a JSON catalog one record at a time
+    
+    The document is parsed incrementally, so memory use does not grow with
+    the catalog. Each record is validated on its own; invalid records are
+    skipped and reported with their position in the file.
+    
+    Args:
+        source_path: JSON catalog to read (defaults to the data file)
+        on_error: Called with a report dictionary (index, byte_offset, name,
+            errors) for every rejected record
+        header: Optional dictionary that receives the document's other
+            top-level values (version, metadata, ...)
         
-        # Log metadata information
-        metadata = data.get('metadata', {})
-        if metadata:
-            logger.debug(f"Data version: {metadata.get('schema_version', 'unknown')}")
-            logger.debug(f"Last updated: {data.get('last_updated', 'unknown')}")
+    Yields:
+        Validated MCPServer instances in file order
         
-        return servers
+    Raises:
+        CatalogStreamError: If the document itself is not well-formed JSON
+    """
+    source_path = Path(source_path) if source_path else _get_data_file_path()
+    
+    for index, byte_offset, server_data in iter_catalog_records(source_path, header=header):
+        errors = _validate_server_record(server_data)
+        if not errors:
+            try:
+                yield _create_server_from_data(server_data)
+                continue
+            except Exception as e:
+                errors = [f"Failed to create server: {e}"]
         
-    except Exception as e:
-        logger.error(f"Failed to load MCP servers: {e}")
-        return _get_fallback_servers()
+        report = {
+            "index": index,
+            "byte_offset": byte_offset,
+            "name": server_data.get('name') if isinstance(server_data, dict) else None,
+            "errors": errors
+        }
+        logger.warning(f"Skipping invalid server record {index} at byte {byte_offset} "
+                       f"({report['name'] or 'unnamed'}): {'; '.join(errors)}")
+        if on_error:
+            on_error(report)
+
+def get_data_file_path() -> Path:
+    """
+    Get the path of the MCP servers JSON file
+    
+    Returns:
+        Path to the data file (which may not exist yet)
+    """
+    return _get_data_file_path()
 
 def _get_data_file_path() -> Path:
     """Get the path to the MCP servers data file"""
@@ -84,56 +168,58 @@ def _get_data_file_path() -> Path:
     # Return the first path as default (will be created if needed)
     return possible_paths[0]
 
-def _validate_data_structure(data: Dict[str, Any]) -> Dict[str, Any]:
+def _get_snapshot_path(data_file_path: Path) -> Path:
+    """Get the compiled snapshot path that accompanies a JSON data file"""
+    return data_file_path.with_suffix('.snapshot')
+
+def compile_snapshot(source_path: Optional[Union[str, Path]] = None,
+                     snapshot_path: Optional[Union[str, Path]] = None) -> Optional[Path]:
     """
-    Validate the structure of loaded MCP server data
+    Compile the JSON catalog into a memory-mappable snapshot
     
     Args:
-        data: Loaded JSON data dictionary
+        source_path: JSON catalog to compile (defaults to the data file)
+        snapshot_path: Output path (defaults to the JSON path with a
+            ``.snapshot`` suffix)
         
     Returns:
-        Validation result with success status and error details
+        Path of the written snapshot, or None if compilation failed
     """
-    required_fields = ['servers', 'version']
-    missing_fields = [field for field in required_fields if field not in data]
-    
-    if missing_fields:
-        return {
-            'valid': False,
-            'error': f"Missing required fields: {', '.join(missing_fields)}"
-        }
+    try:
+        source_path = Path(source_path) if source_path else _get_data_file_path()
+        snapshot_path = Path(snapshot_path) if snapshot_path else _get_snapshot_path(source_path)
+        
+        servers = _load_servers_from_file(source_path)
+        if servers is None:
+            return None
+        
+        return write_snapshot(servers, snapshot_path, source_path)
+        
+    except Exception as e:
+        logger.error(f"Failed to compile catalog snapshot: {e}")
+        return None
+
+def _validate_server_record(server_data: Any) -> List[str]:
+    """
+    Check that a catalog record can be turned into an MCPServer
     
-    servers = data.get('servers', [])
-    if not isinstance(servers, list):
-        return {
-            'valid': False,
-            'error': "Servers field must be a list"
-        }
+    Args:
+        server_data: Decoded server record
+        
+    Returns:
+        List of error messages; empty if the record is usable
+    """
+    if not isinstance(server_data, dict):
+        return ["Server record is not an object"]
     
-    if len(servers) == 0:
-        return {
-            'valid': False,
-            'error': "No servers defined in configuration"
-        }
+    required_server_fields = ['name', 'description', 'category', 'author']
+    errors = [f"Missing required field: {field}" for field in required_server_fields if field not in server_data]
     
-    # Validate server data structure
-    for i, server in enumerate(servers):
-        if not isinstance(server, dict):
-            return {
-                'valid': False,
-                'error': f"Server {i} is not a dictionary"
-            }
-        
-        required_server_fields = ['name', 'description', 'category', 'author']
-        missing_server_fields = [field for field in required_server_fields if field not in server]
-        
-        if missing_server_fields:
-            return {
-                'valid': False,
-                'error': f"Server {i} missing fields: {', '.join(missing_server_fields)}"
-            }
+    for field in ('tags', 'dependencies', 'capabilities'):
+        if field in server_data and not isinstance(server_data[field], list):
+            errors.append(f"{field.capitalize()} must be a list")
     
-    return {'valid': True}
+    return errors
 
 def _create_server_from_data(server_data: Dict[str, Any]) -> MCPServer:
     """
@@ -295,6 +381,13 @@ def save_mcp_servers(servers: List[MCPServer], backup_existing: bool = True) ->
             json.dump(data, file, indent=2, ensure_ascii=False)
         
         logger.info(f"Saved {len(servers)} MCP servers to {data_file_path}")
+        
+        # Refresh the compiled snapshot; the JSON file remains authoritative
+        try:
+            write_snapshot(servers, _get_snapshot_path(data_file_path), data_file_path)
+        except Exception as e:
+            logger.warning(f"Failed to write catalog snapshot: {e}")
+        
         return True
         
     except Exception as e:
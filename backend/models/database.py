@@ -5,18 +5,227 @@ Provides clean database connection management and schema initialization
 with proper error handling and connection pooling.
 """
 
+import atexit
 import sqlite3
 import threading
+import time
 import os
+from concurrent.futures import Future
 from contextlib import contextmanager
-from typing import Optional
+from typing import Optional, Dict, Any, List, Tuple
 
+from models.db_writer import DatabaseWriter
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
-# Thread-local storage for database connections
-_local = threading.local()
+# Per-connection tuning applied once when a pooled connection is created
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",     # ~16MB page cache per connection
+    "PRAGMA mmap_size = 268435456",   # 256MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA recursive_triggers = ON",  # fire delete triggers on REPLACE so FTS stays in sync
+)
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of pre-configured SQLite connections
+    
+    Connections are opened lazily up to ``max_size``, configured once with
+    WAL journaling and tuned pragmas, and reused across requests. Idle
+    connections are health-checked before being handed out again.
+    """
+    
+    def __init__(self, database_url: str, max_size: int = 8, timeout: float = 30.0,
+                 statement_cache_size: int = 256, health_check_interval: float = 30.0):
+        """
+        Initialize connection pool configuration
+        
+        Args:
+            database_url: SQLite database file path (or ':memory:')
+            max_size: Maximum number of simultaneously open connections
+            timeout: Seconds to wait for a free connection or a database lock
+            statement_cache_size: Prepared statements cached per connection
+            health_check_interval: Idle seconds after which a connection is re-validated
+        """
+        self.database_url = database_url
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.statement_cache_size = statement_cache_size
+        self.health_check_interval = health_check_interval
+        
+        self._idle: List[Tuple[sqlite3.Connection, float]] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._in_use = 0
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "discarded": 0,
+            "health_checks": 0,
+            "wait_timeouts": 0
+        }
+        
+        # In-memory databases are per-connection, so pooled connections share a
+        # named in-memory database kept alive by an anchor connection. Shared-cache
+        # table locks ignore busy_timeout, so checkouts are serialised.
+        self._uri = False
+        self._connect_target = database_url
+        self._anchor = None
+        self.in_memory = database_url in (':memory:', '')
+        if self.in_memory:
+            self.max_size = 1
+            self._uri = True
+            self._connect_target = f"file:sanctuary_memdb_{id(self)}?mode=memory&cache=shared"
+            self._anchor = self.create_connection()
+        
+        self._slots = threading.BoundedSemaphore(self.max_size)
+    
+    def create_connection(self) -> sqlite3.Connection:
+        """
+        Open a new, fully configured connection outside of the pool
+        
+        Returns:
+            SQLite connection with row factory and pragmas applied
+        """
+        conn = sqlite3.connect(
+            self._connect_target,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+            uri=self._uri
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        if not self._uri:
+            conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        
+        with self._lock:
+            self._stats["created"] += 1
+        return conn
+    
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Borrow a connection from the pool, opening one if capacity allows
+        
+        Returns:
+            Healthy SQLite connection
+        
+        Raises:
+            sqlite3.OperationalError: If no connection frees up within the timeout
+        """
+        if self._closed:
+            raise sqlite3.OperationalError("Connection pool is closed")
+        
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["wait_timeouts"] += 1
+            raise sqlite3.OperationalError(
+                f"Timed out waiting for a database connection (pool size {self.max_size})"
+            )
+        
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    conn, last_used = self._idle.pop()
+                
+                if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(conn):
+                    with self._lock:
+                        self._stats["reused"] += 1
+                        self._in_use += 1
+                    return conn
+                
+                self._discard(conn)
+            
+            conn = self.create_connection()
+            with self._lock:
+                self._in_use += 1
+            return conn
+        
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, conn: sqlite3.Connection, discard: bool = False):
+        """
+        Return a borrowed connection to the pool
+        
+        Args:
+            conn: Connection previously obtained from acquire()
+            discard: Close the connection instead of reusing it
+        """
+        with self._lock:
+            self._in_use -= 1
+        
+        try:
+            if not discard and not self._closed:
+                try:
+                    if conn.in_transaction:
+                        conn.rollback()
+                except sqlite3.Error:
+                    discard = True
+            
+            if discard or self._closed:
+                self._discard(conn)
+            else:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+    
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Validate an idle connection with a trivial query"""
+        with self._lock:
+            self._stats["health_checks"] += 1
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding unhealthy database connection: {e}")
+            return False
+    
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection and record it as discarded"""
+        with self._lock:
+            self._stats["discarded"] += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    def close_all(self):
+        """Close every idle connection and reject further checkouts"""
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        if self._anchor:
+            self._anchor.close()
+            self._anchor = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool utilisation counters for monitoring
+        
+        Returns:
+            Dictionary containing pool size and lifecycle counters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._in_use
+        stats["max_size"] = self.max_size
+        return stats
 
 class DatabaseManager:
     """
@@ -26,16 +235,19 @@ class DatabaseManager:
     and schema initialization for the Podplay Sanctuary application.
     """
     
-    def __init__(self, database_url: str = "sanctuary.db"):
+    def __init__(self, database_url: str = "sanctuary.db", pool_size: int = 8):
         """
         Initialize database manager with connection configuration
         
         Args:
             database_url: Database connection string or file path
+            pool_size: Maximum number of pooled connections
         """
         self.database_url = database_url
         self._initialized = False
         self._lock = threading.Lock()
+        self.fts_enabled = False
+        self.pool = ConnectionPool(database_url, max_size=pool_size)
     
     def initialize_schema(self):
         """Initialize database schema with all required tables"""
@@ -81,10 +293,12 @@ class DatabaseManager:
                 is_installed BOOLEAN DEFAULT 0,
                 installation_status TEXT DEFAULT 'not_installed',
                 tags TEXT,
+                content_hash TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        self._ensure_column(conn, 'mcp_servers', 'content_hash', 'TEXT')
         
         # Project priorities table
         conn.execute('''
@@ -146,33 +360,160 @@ class DatabaseManager:
             )
         ''')
         
+        # Local vector memory store (used when Mem0.ai is not configured)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS memories (
+                memory_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                content TEXT NOT NULL,
+                metadata TEXT,
+                importance REAL DEFAULT 0.5,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL,
+                access_count INTEGER DEFAULT 0,
+                embedding BLOB,
+                generation INTEGER DEFAULT 0,
+                compacted_into TEXT,
+                compacted_at REAL
+            )
+        ''')
+        self._ensure_column(conn, 'memories', 'generation', 'INTEGER DEFAULT 0')
+        self._ensure_column(conn, 'memories', 'compacted_into', 'TEXT')
+        self._ensure_column(conn, 'memories', 'compacted_at', 'REAL')
+        
+        # Case-insensitive server name lookups (exact matches use the UNIQUE index)
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_mcp_servers_name_nocase
+            ON mcp_servers (name COLLATE NOCASE)
+        ''')
+        
+        # Keyset pagination order for marketplace listings
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_mcp_servers_popularity
+            ON mcp_servers (popularity_score DESC, name)
+        ''')
+        
+        self.fts_enabled = self._create_search_index(conn)
+        
         logger.info("Database tables created successfully")
     
+    def _ensure_column(self, conn, table: str, column: str, definition: str):
+        """
+        Add a column to an existing table created by an older schema
+        
+        Args:
+            conn: Database connection
+            table: Table name
+            column: Column name
+            definition: Column type and constraints
+        """
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logger.info(f"Added column {table}.{column}")
+    
+    def _create_search_index(self, conn) -> bool:
+        """
+        Create the FTS5 full-text index mirroring mcp_servers
+        
+        The index is an external-content table kept in sync by triggers, so
+        marketplace search never scans the base table with LIKE.
+        
+        Returns:
+            True if the full-text index is available
+        """
+        try:
+            index_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'mcp_servers_fts'"
+            ).fetchone() is not None
+            
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS mcp_servers_fts USING fts5(
+                    name, description, tags, capabilities,
+                    content='mcp_servers',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS mcp_servers_fts_insert AFTER INSERT ON mcp_servers BEGIN
+                    INSERT INTO mcp_servers_fts (rowid, name, description, tags, capabilities)
+                    VALUES (new.id, new.name, new.description, new.tags, new.capabilities);
+                END
+            ''')
+            
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS mcp_servers_fts_delete AFTER DELETE ON mcp_servers BEGIN
+                    INSERT INTO mcp_servers_fts (mcp_servers_fts, rowid, name, description, tags, capabilities)
+                    VALUES ('delete', old.id, old.name, old.description, old.tags, old.capabilities);
+                END
+            ''')
+            
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS mcp_servers_fts_update
+                AFTER UPDATE OF name, description, tags, capabilities ON mcp_servers BEGIN
+                    INSERT INTO mcp_servers_fts (mcp_servers_fts, rowid, name, description, tags, capabilities)
+                    VALUES ('delete', old.id, old.name, old.description, old.tags, old.capabilities);
+                    INSERT INTO mcp_servers_fts (rowid, name, description, tags, capabilities)
+                    VALUES (new.id, new.name, new.description, new.tags, new.capabilities);
+                END
+            ''')
+            
+            # Index rows that predate the full-text table
+            if not index_exists:
+                conn.execute("INSERT INTO mcp_servers_fts (mcp_servers_fts) VALUES ('rebuild')")
+            
+            return True
+            
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, marketplace search will use LIKE matching: {e}")
+            return False
+    
     @contextmanager
     def get_connection(self):
         """
         Get database connection with proper resource management
         
+        Connections are borrowed from the pool and returned on exit; any
+        uncommitted transaction is rolled back before reuse.
+        
         Yields:
             SQLite connection with row factory configured
         """
-        conn = None
+        conn = self.pool.acquire()
+        discard = False
         try:
-            conn = sqlite3.connect(self.database_url, timeout=30.0)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA foreign_keys = ON")
             yield conn
+        except sqlite3.DatabaseError as e:
+            # Connection-level failures must not be handed to the next caller
+            discard = not isinstance(e, (sqlite3.OperationalError, sqlite3.IntegrityError,
+                                         sqlite3.ProgrammingError))
+            self._rollback_quietly(conn)
+            logger.error(f"Database connection error: {e}")
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
+            self._rollback_quietly(conn)
             logger.error(f"Database connection error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            self.pool.release(conn, discard=discard)
+    
+    @staticmethod
+    def _rollback_quietly(conn):
+        """Roll back an open transaction, ignoring errors from a broken connection"""
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            pass
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.pool.close_all()
 
-# Global database manager instance
+# Global database manager and background writer instances
 _db_manager: Optional[DatabaseManager] = None
+_db_writer: Optional[DatabaseWriter] = None
 
 def init_database(app):
     """
@@ -181,7 +522,7 @@ def init_database(app):
     Args:
         app: Flask application instance
     """
-    global _db_manager
+    global _db_manager, _db_writer
     
     database_url = app.config.get('DATABASE_URL', 'sanctuary.db')
     
@@ -191,9 +532,19 @@ def init_database(app):
     elif database_url.startswith('sqlite://'):
         database_url = database_url[9:]
     
-    _db_manager = DatabaseManager(database_url)
+    pool_size = int(app.config.get('DATABASE_POOL_SIZE', 8))
+    
+    _db_manager = DatabaseManager(database_url, pool_size=pool_size)
     _db_manager.initialize_schema()
     
+    _db_writer = DatabaseWriter(
+        _db_manager,
+        batch_size=int(app.config.get('DATABASE_WRITE_BATCH_SIZE', 100)),
+        flush_interval_ms=int(app.config.get('DATABASE_WRITE_FLUSH_MS', 50))
+    )
+    _db_writer.start()
+    atexit.register(close_database)
+    
     logger.info(f"Database system initialized with URL: {database_url}")
 
 @contextmanager
@@ -210,6 +561,37 @@ def get_db_connection():
     with _db_manager.get_connection() as conn:
         yield conn
 
+def is_fts_enabled() -> bool:
+    """
+    Check whether the FTS5 marketplace search index is available
+    
+    Returns:
+        True if full-text search can be used
+    """
+    return bool(_db_manager and _db_manager.fts_enabled)
+
+def get_db_writer() -> Optional[DatabaseWriter]:
+    """
+    Get the background database writer
+    
+    Returns:
+        Running DatabaseWriter instance, or None before initialization
+    """
+    return _db_writer
+
+def close_database():
+    """Flush queued writes and close pooled database connections during shutdown"""
+    global _db_manager, _db_writer
+    
+    if _db_writer:
+        _db_writer.shutdown()
+        _db_writer = None
+    
+    if _db_manager:
+        _db_manager.close()
+        _db_manager = None
+        logger.info("Database connections closed")
+
 def execute_query(query: str, params: tuple = (), fetch_one: bool = False, fetch_all: bool = True):
     """
     Execute database query with error handling
@@ -239,6 +621,37 @@ def execute_query(query: str, params: tuple = (), fetch_one: bool = False, fetch
         logger.error(f"Query execution failed: {e}")
         raise
 
+def execute_write(query: str, params: tuple = (), fetch_one: bool = False) -> Future:
+    """
+    Queue a write statement for the background writer's next group commit
+    
+    Callers that do not need the outcome can ignore the returned future;
+    callers that need the new row id can wait on it. Falls back to a
+    synchronous write when the background writer is not running.
+    
+    Args:
+        query: SQL statement to execute
+        params: Query parameters
+        fetch_one: Resolve with the first returned row (for RETURNING clauses)
+        
+    Returns:
+        Future resolved with the inserted row id or fetched row
+    """
+    if _db_writer and _db_writer.is_running:
+        return _db_writer.submit(query, params, fetch_one=fetch_one)
+    
+    future: Future = Future()
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.execute(query, params)
+            result = cursor.fetchone() if fetch_one else cursor.lastrowid
+            conn.commit()
+        future.set_result(result)
+    except Exception as e:
+        logger.error(f"Write execution failed: {e}")
+        future.set_exception(e)
+    return future
+
 def get_database_stats() -> dict:
     """
     Get database statistics for monitoring and diagnostics
@@ -263,6 +676,8 @@ def get_database_stats() -> dict:
                 stats['database_size_bytes'] = os.path.getsize(_db_manager.database_url)
             
             stats['initialized'] = _db_manager._initialized if _db_manager else False
+            stats['connection_pool'] = _db_manager.pool.get_stats()
+            stats['write_queue'] = _db_writer.get_stats() if _db_writer else {'running': False}
         
         return stats
         
@@ -0,0 +1,318 @@
+"""
+Background database writer for Podplay Sanctuary
+
+Funnels write statements from request threads into a single writer thread
+that owns its own SQLite connection and commits queued writes in groups,
+so concurrent writers no longer contend for the database lock.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Sentinel placed on the queue to wake the writer thread for shutdown
+_STOP = object()
+
+class _WriteRequest:
+    """Single queued write with the future that reports its outcome"""
+    
+    __slots__ = ('query', 'params', 'many', 'fetch_one', 'future')
+    
+    def __init__(self, query: str, params: Any, many: bool, fetch_one: bool):
+        self.query = query
+        self.params = params
+        self.many = many
+        self.fetch_one = fetch_one
+        self.future: Future = Future()
+
+class DatabaseWriter:
+    """
+    Single-writer thread with batched group commit
+    
+    Writes are queued by callers and applied by one background thread. The
+    thread gathers up to ``batch_size`` writes, or whatever arrives within
+    ``flush_interval_ms`` of the first one, and commits them in a single
+    transaction. Each write runs inside its own savepoint so a failing
+    statement only fails its own future.
+    """
+    
+    def __init__(self, database_manager, batch_size: int = 100, flush_interval_ms: int = 50,
+                 max_queue_size: int = 10000):
+        """
+        Initialize writer configuration
+        
+        Args:
+            database_manager: DatabaseManager providing connections
+            batch_size: Maximum number of writes committed per transaction
+            flush_interval_ms: Maximum time a write waits for its batch to fill
+            max_queue_size: Bound on pending writes before submit() blocks
+        """
+        self.database_manager = database_manager
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_interval_ms) / 1000.0
+        
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._running = False
+        # Held across the running check and the enqueue so no write lands after the final drain
+        self._enqueue_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "committed": 0,
+            "failed": 0,
+            "batches": 0,
+            "largest_batch": 0
+        }
+    
+    def start(self):
+        """Start the background writer thread"""
+        if self._running:
+            return
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="sanctuary-db-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"Database writer started (batch_size={self.batch_size}, "
+                    f"flush_interval={int(self.flush_interval * 1000)}ms)")
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the writer thread is accepting writes"""
+        return self._running
+    
+    def submit(self, query: str, params: Iterable = (), fetch_one: bool = False) -> Future:
+        """
+        Queue a single write statement
+        
+        Args:
+            query: SQL statement to execute
+            params: Statement parameters
+            fetch_one: Resolve the future with the first returned row
+                (for ``RETURNING`` clauses) instead of ``lastrowid``
+        
+        Returns:
+            Future resolved with the inserted row id (or fetched row) once committed
+        """
+        return self._enqueue(_WriteRequest(query, tuple(params), False, fetch_one))
+    
+    def submit_many(self, query: str, seq_of_params: Iterable[Iterable]) -> Future:
+        """
+        Queue a statement executed once per parameter set
+        
+        Args:
+            query: SQL statement to execute
+            seq_of_params: Iterable of parameter tuples
+        
+        Returns:
+            Future resolved with the affected row count once committed
+        """
+        return self._enqueue(_WriteRequest(query, [tuple(p) for p in seq_of_params], True, False))
+    
+    def _enqueue(self, request: _WriteRequest) -> Future:
+        """Place a write on the queue, failing fast if the writer is stopped"""
+        with self._enqueue_lock:
+            if not self._running:
+                request.future.set_exception(RuntimeError("Database writer is not running"))
+                return request.future
+            self._queue.put(request)
+        
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+        return request.future
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every write queued before this call has been committed
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if the queue drained within the timeout
+        """
+        marker = self.submit("SELECT 1")
+        try:
+            marker.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+    
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Commit outstanding writes and stop the writer thread
+        
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain
+        """
+        with self._enqueue_lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(_STOP)
+        
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                # The thread keeps its connection and closes it when it exits;
+                # writes it has not picked up yet are failed instead of left pending
+                abandoned = self._fail_queued(RuntimeError("Database writer stopped before the write was applied"))
+                logger.warning(f"Database writer did not stop within {timeout}s; "
+                               f"failed {abandoned} queued writes")
+                return
+        
+        logger.info("Database writer stopped")
+    
+    def _fail_queued(self, error: Exception) -> int:
+        """Resolve every write still on the queue with an error, keeping the stop request queued"""
+        failed = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and not item.future.done():
+                item.future.set_exception(error)
+                failed += 1
+        self._queue.put(_STOP)
+        return failed
+    
+    def _run(self):
+        """Writer thread main loop"""
+        # The connection is opened, used and closed on this thread only. Shared
+        # in-memory databases cannot tolerate a second long-lived connection,
+        # so there the writer borrows from the pool per batch instead
+        if not self.database_manager.pool.in_memory:
+            try:
+                self._conn = self.database_manager.pool.create_connection()
+            except Exception as e:
+                logger.error(f"Database writer could not open its connection, borrowing from the pool: {e}")
+        
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._commit_batch(batch)
+        
+        # Drain anything queued after the stop request so no future is left pending
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftovers.append(item)
+        if leftovers:
+            self._commit_batch(leftovers)
+        
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    @contextmanager
+    def _connection(self):
+        """Yield the writer's connection, borrowing from the pool when it has none"""
+        if self._conn is not None:
+            yield self._conn
+        else:
+            with self.database_manager.get_connection() as conn:
+                yield conn
+    
+    def _commit_batch(self, batch: List[_WriteRequest]):
+        """Apply a batch of writes in one transaction and resolve their futures"""
+        outcomes: List[Tuple[_WriteRequest, bool, Any]] = []
+        
+        try:
+            with self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for request in batch:
+                    outcomes.append(self._apply(conn, request))
+                conn.commit()
+        
+        except Exception as e:
+            logger.error(f"Database write batch of {len(batch)} failed: {e}")
+            if self._conn is not None:
+                try:
+                    self._conn.rollback()
+                except sqlite3.Error:
+                    pass
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            with self._stats_lock:
+                self._stats["failed"] += len(batch)
+            return
+        
+        failed = 0
+        for request, ok, value in outcomes:
+            if ok:
+                request.future.set_result(value)
+            else:
+                failed += 1
+                request.future.set_exception(value)
+        
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["committed"] += len(batch) - failed
+            self._stats["failed"] += failed
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+    
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, request: _WriteRequest) -> Tuple[_WriteRequest, bool, Any]:
+        """Execute one write inside a savepoint so failures stay isolated"""
+        conn.execute("SAVEPOINT sanctuary_write")
+        try:
+            if request.many:
+                cursor = conn.executemany(request.query, request.params)
+                value = cursor.rowcount
+            else:
+                cursor = conn.execute(request.query, request.params)
+                value = cursor.fetchone() if request.fetch_one else cursor.lastrowid
+            conn.execute("RELEASE sanctuary_write")
+            return request, True, value
+        
+        except Exception as e:
+            conn.execute("ROLLBACK TO sanctuary_write")
+            conn.execute("RELEASE sanctuary_write")
+            logger.warning(f"Queued database write failed: {e}")
+            return request, False, e
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer throughput counters for monitoring
+        
+        Returns:
+            Dictionary containing queue depth and commit counters
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["running"] = self._running
+        stats["queue_depth"] = self._queue.qsize()
+        stats["batch_size"] = self.batch_size
+        stats["flush_interval_ms"] = int(self.flush_interval * 1000)
+        return stats
@@ -6,11 +6,38 @@ categories, server specifications, and validation logic for the Podplay
 Sanctuary marketplace system.
 """
 
-from dataclasses import dataclass, field
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from datetime import datetime
 
+def intern_strings(values: Sequence[Any]) -> List[Any]:
+    """Intern string items so servers sharing tags share one string object"""
+    return [sys.intern(value) if isinstance(value, str) else value for value in values]
+
+def slotted(cls: type) -> type:
+    """
+    Rebuild a dataclass with ``__slots__`` for its fields
+    
+    Equivalent to ``dataclass(slots=True)``, which needs Python 3.10; the
+    generated ``__init__`` keeps its defaults, so the class attributes that
+    would clash with the slots are dropped.
+    
+    Args:
+        cls: Class already processed by ``dataclass``
+        
+    Returns:
+        Slotted copy of the class
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
 class MCPCategory(Enum):
     """Comprehensive categorization system for MCP servers based on functionality"""
     
@@ -149,7 +176,8 @@ class MCPServerConfiguration:
             "validated_config": config if len(errors) == 0 else None
         }
 
-@dataclass
+@slotted
+@dataclass(frozen=True)
 class MCPServer:
     """
     Comprehensive MCP Server data model with full metadata and functionality tracking
@@ -157,6 +185,13 @@ class MCPServer:
     This model represents a complete MCP server specification including installation,
     configuration, popularity metrics, and integration capabilities for the Podplay
     Sanctuary development environment.
+    
+    Instances are slotted and immutable so large catalogs stay compact and
+    records can be shared freely. Repeated strings (category, author, tags
+    and similar) are interned, list fields are stored as tuples, and the
+    installation command and serialized
+    dictionary are computed on first use and cached. Use ``with_changes()``
+    to derive a modified record.
     """
     
     # Core Identity
@@ -168,12 +203,12 @@ class MCPServer:
     # Classification and Versioning
     category: MCPCategory
     version: str
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
     
     # Installation and Dependencies
     installation_method: str = "npm"  # npm, pip, docker, binary, manual
-    dependencies: List[str] = field(default_factory=list)
-    capabilities: List[str] = field(default_factory=list)
+    dependencies: Tuple[str, ...] = ()
+    capabilities: Tuple[str, ...] = ()
     
     # Configuration
     configuration_schema: Dict[str, Any] = field(default_factory=dict)
@@ -185,25 +220,85 @@ class MCPServer:
     # Official and Installation Status
     is_official: bool = False
     is_installed: bool = False
-    installation_status: str = "not_installed"  # not_installed, installing, installed, error
+    installation_status: str = "not_installed"  # not_installed, installing, installed, uninstalling, error
     
     # Timestamps
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
+    # Lazily computed derived values (not part of equality or repr)
+    _installation_command: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _serialized: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Post-initialization validation and defaults"""
-        if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
-        if self.updated_at is None:
-            self.updated_at = datetime.now().isoformat()
+        set_field = object.__setattr__
+        
+        # Slots have no class-level default to fall back on
+        set_field(self, '_installation_command', None)
+        set_field(self, '_serialized', None)
+        
+        if self.created_at is None or self.updated_at is None:
+            timestamp = datetime.now().isoformat()
+            if self.created_at is None:
+                set_field(self, 'created_at', timestamp)
+            if self.updated_at is None:
+                set_field(self, 'updated_at', timestamp)
         
         # Ensure category is MCPCategory enum
         if isinstance(self.category, str):
             try:
-                self.category = MCPCategory(self.category)
+                set_field(self, 'category', MCPCategory(self.category))
             except ValueError:
-                self.category = MCPCategory.DEVELOPMENT_TOOLS
+                set_field(self, 'category', MCPCategory.DEVELOPMENT_TOOLS)
+        
+        # Share repeated strings between servers
+        for name in ('author', 'version', 'installation_method', 'installation_status'):
+            value = getattr(self, name)
+            if isinstance(value, str):
+                set_field(self, name, sys.intern(value))
+        for name in ('tags', 'dependencies', 'capabilities'):
+            set_field(self, name, tuple(intern_strings(getattr(self, name))))
+    
+    def with_changes(self, **changes: Any) -> 'MCPServer':
+        """
+        Create a copy of this server with some fields replaced
+        
+        Args:
+            **changes: Field values to replace
+            
+        Returns:
+            New MCPServer instance; cached derived values are recomputed
+        """
+        return replace(self, **changes)
+    
+    def catalog_values(self) -> Tuple[Any, ...]:
+        """
+        Catalog-owned column values in ``mcp_servers`` order
+        
+        List and schema fields are JSON-encoded; installation state is
+        excluded because it belongs to the user.
+        
+        Returns:
+            Tuple of column values
+        """
+        return (
+            self.name, self.description, self.repository_url,
+            self.category.value, self.author, self.version,
+            self.installation_method, json.dumps(self.capabilities),
+            json.dumps(self.dependencies), json.dumps(self.configuration_schema),
+            self.popularity_score, self.last_updated, int(bool(self.is_official)),
+            json.dumps(self.tags)
+        )
+    
+    def content_hash(self) -> str:
+        """
+        Hash of the catalog-owned fields, used to detect changed records
+        
+        Returns:
+            Hex SHA-256 digest of ``catalog_values()``
+        """
+        return hashlib.sha256(json.dumps(self.catalog_values(), sort_keys=True).encode('utf-8')).hexdigest()
     
     def get_configuration_schema(self) -> MCPServerConfiguration:
         """
@@ -251,14 +346,18 @@ class MCPServer:
         Returns:
             Installation command string
         """
-        if self.installation_method == "npm":
-            return f"npm install {self.name}"
-        elif self.installation_method == "pip":
-            return f"pip install {self.name}"
-        elif self.installation_method == "docker":
-            return f"docker pull {self.name}"
-        else:
-            return f"# Manual installation required - see {self.repository_url}"
+        command = self._installation_command
+        if command is None:
+            if self.installation_method == "npm":
+                command = f"npm install {self.name}"
+            elif self.installation_method == "pip":
+                command = f"pip install {self.name}"
+            elif self.installation_method == "docker":
+                command = f"docker pull {self.name}"
+            else:
+                command = f"# Manual installation required - see {self.repository_url}"
+            object.__setattr__(self, '_installation_command', command)
+        return command
     
     def update_popularity_score(self, github_data: Optional[Dict] = None) -> int:
         """
@@ -291,7 +390,8 @@ class MCPServer:
             except:
                 pass
             
-            self.popularity_score = min(int(score), 100)  # Cap at 100
+            object.__setattr__(self, 'popularity_score', min(int(score), 100))  # Cap at 100
+            object.__setattr__(self, '_serialized', None)
         
         return self.popularity_score
     
@@ -299,9 +399,20 @@ class MCPServer:
         """
         Convert server to dictionary representation for API serialization
         
+        The dictionary is built once per record and a shallow copy is
+        returned on each call.
+        
         Returns:
             Dictionary representation of the MCP server
         """
+        serialized = self._serialized
+        if serialized is None:
+            serialized = self._build_dict()
+            object.__setattr__(self, '_serialized', serialized)
+        return dict(serialized)
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the serialized dictionary cached by to_dict()"""
         return {
             "name": self.name,
             "description": self.description,
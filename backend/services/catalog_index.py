@@ -0,0 +1,545 @@
+"""
+MCP Catalog Index
+
+Immutable in-memory index over the MCP marketplace catalog. Read-heavy
+marketplace endpoints are answered from prebuilt structures instead of
+querying SQLite and decoding JSON on every call:
+
+- documents are numbered in popularity order, so any filter result is
+  already sorted by popularity
+- token postings, category and official filters are integer bitsets that
+  combine with a single ``&``
+- facet counts are computed once at build time
+- exact name lookups go through a case-folded dictionary
+- query tokens that match nothing fall back to typo-tolerant matching
+  against name and tag terms (see ``services.fuzzy_index``), ranked below
+  exact matches
+
+Result pages are addressed by keyset: every result has a sort key of
+``(rank, -popularity_score, name)`` and the next page starts strictly
+after the last key returned, which stays meaningful across index rebuilds.
+
+An index is never mutated after construction. Updates build a new index
+and the owner swaps its reference, so readers never take a lock. Updates
+that keep every record at its popularity position (installs, status and
+text edits) copy the old index and patch only the postings and bits that
+changed; additions, removals and popularity changes rebuild it.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.fuzzy_index import TrigramIndex
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Searchable fields and their relevance weights (mirrors the FTS5 column weights)
+SEARCH_FIELD_WEIGHTS = {
+    "name": 10.0,
+    "description": 2.0,
+    "tags": 5.0,
+    "capabilities": 3.0
+}
+
+# Relevance bonus per popularity point (popularity_score ranges 0-100)
+POPULARITY_BLEND = 0.02
+
+# Relevance multiplier per edit of a fuzzy term match
+FUZZY_MATCH_WEIGHT = 0.5
+
+# Fields whose terms are candidates for fuzzy matching
+FUZZY_FIELDS = ("name", "tags")
+
+# Sort key of a search result: (rank, -popularity_score, name)
+SortKey = Tuple[float, int, str]
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search tokens
+    
+    Args:
+        text: Free text to tokenize
+    
+    Returns:
+        List of alphanumeric tokens
+    """
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """
+    Yield the positions of set bits in ascending order
+    
+    Args:
+        bits: Integer bitset
+    
+    Yields:
+        Indices of set bits, lowest first
+    """
+    if not bits:
+        return
+    reversed_bits = bin(bits)[:1:-1]
+    position = reversed_bits.find('1')
+    while position != -1:
+        yield position
+        position = reversed_bits.find('1', position + 1)
+
+def _popularity_key(record: Dict[str, Any]) -> Tuple[int, str]:
+    """Sort key placing the most popular servers first, ties broken by name"""
+    return (-int(record.get('popularity_score') or 0), record.get('name', ''))
+
+def _field_text(record: Dict[str, Any], field: str) -> str:
+    """Flatten a record field (string or list) into searchable text"""
+    value = record.get(field) or ''
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(item) for item in value)
+    return str(value)
+
+class CatalogIndex:
+    """
+    Immutable search and facet index over marketplace server records
+    
+    Records are API-shaped server dictionaries (JSON columns already
+    decoded). Lookups return shallow copies so callers cannot mutate the
+    shared index.
+    """
+    
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        """
+        Build the index from server records
+        
+        Args:
+            records: Server dictionaries to index
+        """
+        self._records: Tuple[Dict[str, Any], ...] = tuple(sorted(records, key=_popularity_key))
+        self._popularity_keys = [_popularity_key(record) for record in self._records]
+        self._all_bits = (1 << len(self._records)) - 1
+        
+        postings: Dict[str, Dict[str, int]] = {field: {} for field in SEARCH_FIELD_WEIGHTS}
+        category_bits: Dict[str, int] = {}
+        official_bits = 0
+        installed_bits = 0
+        
+        for doc_id, record in enumerate(self._records):
+            bit = 1 << doc_id
+            
+            for field, field_postings in postings.items():
+                for token in set(tokenize(_field_text(record, field))):
+                    field_postings[token] = field_postings.get(token, 0) | bit
+            
+            category = record.get('category') or 'unknown'
+            category_bits[category] = category_bits.get(category, 0) | bit
+            
+            if record.get('is_official'):
+                official_bits |= bit
+            if record.get('is_installed'):
+                installed_bits |= bit
+        
+        self._name_ids = {str(record.get('name', '')).casefold(): doc_id
+                          for doc_id, record in reversed(list(enumerate(self._records)))}
+        self._postings = postings
+        self._vocabulary = {field: sorted(field_postings) for field, field_postings in postings.items()}
+        self._category_bits = category_bits
+        self._official_bits = official_bits
+        self._installed_bits = installed_bits
+        self._fuzzy: Optional[TrigramIndex] = None
+        self._facets = self._count_facets()
+    
+    def _count_facets(self) -> Dict[str, Any]:
+        """Facet counts derived from the category, official and installed bitsets"""
+        official = bin(self._official_bits).count('1')
+        return {
+            "total": len(self._records),
+            "categories": {category: bin(bits).count('1') for category, bits in self._category_bits.items()},
+            "official": official,
+            "community": len(self._records) - official,
+            "installed": bin(self._installed_bits).count('1')
+        }
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    @property
+    def facets(self) -> Dict[str, Any]:
+        """Precomputed facet counts for categories, official and installed servers"""
+        return {
+            **self._facets,
+            "categories": dict(self._facets["categories"])
+        }
+    
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a server by name, ignoring case
+        
+        Args:
+            name: Server name
+        
+        Returns:
+            Server dictionary if found, None otherwise
+        """
+        doc_id = self._name_ids.get(name.casefold())
+        return dict(self._records[doc_id]) if doc_id is not None else None
+    
+    def search(self, query: str = "", category: Optional[str] = None,
+               official_only: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search the catalog with prefix matching and filters
+        
+        Every query token must prefix-match a token in at least one field.
+        Text matches are ranked by field-weighted relevance blended with
+        popularity; filter-only queries keep popularity order.
+        
+        Args:
+            query: Free-text search terms
+            category: Restrict to a category
+            official_only: Restrict to official servers
+            limit: Maximum number of results
+        
+        Returns:
+            List of server dictionaries
+        """
+        bits = self._filter_bits(category, official_only)
+        tokens = tokenize(query)
+        
+        if not tokens:
+            return self._materialise(iter_bits(bits), limit)
+        
+        scored, matched_terms = self._score(tokens, bits)
+        results = self._materialise((doc_id for _, doc_id in scored), limit)
+        for result in results:
+            result['snippet'] = highlight(result.get('description', ''), matched_terms)
+        return results
+    
+    def search_page(self, query: str = "", category: Optional[str] = None,
+                    official_only: bool = False, limit: int = 20,
+                    after: Optional[SortKey] = None) -> Tuple[List[Dict[str, Any]], int, Optional[SortKey]]:
+        """
+        Fetch one page of search results using keyset pagination
+        
+        Args:
+            query: Free-text search terms
+            category: Restrict to a category
+            official_only: Restrict to official servers
+            limit: Page size
+            after: Sort key of the last result on the previous page
+        
+        Returns:
+            Tuple of (page results, total matches, sort key to resume after
+            or None when this is the last page)
+        """
+        bits = self._filter_bits(category, official_only)
+        tokens = tokenize(query)
+        matched_terms = tokens
+        
+        if not tokens:
+            total = bin(bits).count('1')
+            if after is not None:
+                start = bisect_right(self._popularity_keys, (after[1], after[2]))
+                bits = bits >> start << start
+            ranked = [(0.0, doc_id) for doc_id in islice(iter_bits(bits), limit + 1)]
+        else:
+            scored, matched_terms = self._score(tokens, bits)
+            total = len(scored)
+            if after is not None:
+                scored = [item for item in scored if self._sort_key(*item) > after]
+            ranked = scored[:limit + 1]
+        
+        has_more = len(ranked) > limit
+        ranked = ranked[:limit]
+        
+        results = self._materialise((doc_id for _, doc_id in ranked), None)
+        if tokens:
+            for result in results:
+                result['snippet'] = highlight(result.get('description', ''), matched_terms)
+        
+        next_key = self._sort_key(*ranked[-1]) if has_more else None
+        return results, total, next_key
+    
+    def _score(self, tokens: List[str], bits: int) -> Tuple[List[Tuple[float, int]], List[str]]:
+        """
+        Rank documents matching every token
+        
+        A token without prefix matches among the filtered documents is
+        replaced by the name and tag terms within a small edit distance,
+        each weighted down by FUZZY_MATCH_WEIGHT per edit.
+        
+        Returns:
+            Tuple of (list of (rank, doc_id) pairs in result order, lower rank
+            being better; query tokens plus the fuzzy terms they matched)
+        """
+        matched_terms = list(tokens)
+        token_alternatives: List[List[Tuple[float, Dict[str, int]]]] = []
+        for token in tokens:
+            field_bits = {field: self._prefix_bits(field, token) for field in SEARCH_FIELD_WEIGHTS}
+            alternatives = [(1.0, field_bits)]
+            any_field = self._union(field_bits.values()) & bits
+            
+            if not any_field:
+                alternatives = []
+                for distance, term in self._fuzzy_index().lookup(token):
+                    term_bits = {field: self._postings[field].get(term, 0) for field in SEARCH_FIELD_WEIGHTS}
+                    term_any = self._union(term_bits.values()) & bits
+                    if term_any:
+                        alternatives.append((FUZZY_MATCH_WEIGHT ** distance, term_bits))
+                        matched_terms.append(term)
+                        any_field |= term_any
+            
+            bits &= any_field
+            if not bits:
+                return [], matched_terms
+            token_alternatives.append(alternatives)
+        
+        scores: Dict[int, float] = {}
+        for alternatives in token_alternatives:
+            # A document scores through its best alternative only
+            scored_bits = 0
+            for multiplier, field_bits in alternatives:
+                alternative_bits = self._union(field_bits.values()) & bits & ~scored_bits
+                for field, weight in SEARCH_FIELD_WEIGHTS.items():
+                    for doc_id in iter_bits(field_bits[field] & alternative_bits):
+                        scores[doc_id] = scores.get(doc_id, 0.0) + weight * multiplier
+                scored_bits |= alternative_bits
+        
+        scored = [
+            (-(score + POPULARITY_BLEND * (self._records[doc_id].get('popularity_score') or 0)), doc_id)
+            for doc_id, score in scores.items()
+        ]
+        scored.sort()
+        return scored, matched_terms
+    
+    @staticmethod
+    def _union(bitsets: Iterable[int]) -> int:
+        """Union of integer bitsets"""
+        combined = 0
+        for value in bitsets:
+            combined |= value
+        return combined
+    
+    def _fuzzy_terms(self) -> Tuple[str, ...]:
+        """Sorted distinct terms of the fuzzy-matchable fields"""
+        terms = set()
+        for field in FUZZY_FIELDS:
+            terms.update(self._vocabulary[field])
+        return tuple(sorted(terms))
+    
+    def _fuzzy_index(self) -> TrigramIndex:
+        """Trigram index over name and tag terms, built on first use"""
+        if self._fuzzy is None:
+            self._fuzzy = TrigramIndex(self._fuzzy_terms())
+        return self._fuzzy
+    
+    def _sort_key(self, rank: float, doc_id: int) -> SortKey:
+        """Build the rebuild-stable sort key for a ranked document"""
+        negative_popularity, name = self._popularity_keys[doc_id]
+        return (rank, negative_popularity, name)
+    
+    def top(self, limit: int, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most popular servers, optionally within a category
+        
+        Args:
+            limit: Maximum number of servers
+            category: Optional category filter
+        
+        Returns:
+            List of server dictionaries in popularity order
+        """
+        return self._materialise(iter_bits(self._filter_bits(category, False)), limit)
+    
+    def installed(self) -> List[Dict[str, Any]]:
+        """Get all servers marked as installed, in popularity order"""
+        return self._materialise(iter_bits(self._installed_bits), None)
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """Get every indexed record in popularity order"""
+        return [dict(record) for record in self._records]
+    
+    def with_record(self, record: Dict[str, Any]) -> 'CatalogIndex':
+        """
+        Build a new index with one record added or replaced
+        
+        Args:
+            record: Server dictionary keyed by ``name``
+        
+        Returns:
+            New CatalogIndex; this index is left unchanged
+        """
+        return self.with_changes([record])
+    
+    def with_changes(self, records: Iterable[Dict[str, Any]],
+                     removed_names: Iterable[str] = ()) -> 'CatalogIndex':
+        """
+        Build a new index with records added or replaced and others removed
+        
+        Args:
+            records: Server dictionaries keyed by ``name`` to add or replace
+            removed_names: Names of servers to drop
+        
+        Returns:
+            New CatalogIndex; this index is left unchanged
+        """
+        updates = {record.get('name'): record for record in records}
+        removed_names = set(removed_names)
+        positions = {name: self._position(name, record) for name, record in updates.items()}
+        if not removed_names and None not in positions.values():
+            return self._with_replaced(updates, positions)
+        
+        dropped = removed_names | set(updates)
+        kept = [existing for existing in self._records if existing.get('name') not in dropped]
+        index = CatalogIndex(kept + list(updates.values()))
+        
+        # Most updates (installs, description edits) leave the fuzzy vocabulary unchanged
+        if self._fuzzy is not None and index._fuzzy_terms() == self._fuzzy.terms:
+            index._fuzzy = self._fuzzy
+        return index
+    
+    def _position(self, name: Any, record: Dict[str, Any]) -> Optional[int]:
+        """Document id of an existing record the update leaves in place, or None if it would move"""
+        doc_id = self._name_ids.get(str(name or '').casefold())
+        if doc_id is None or self._records[doc_id].get('name') != name:
+            return None
+        return doc_id if _popularity_key(record) == self._popularity_keys[doc_id] else None
+    
+    def _with_replaced(self, updates: Dict[Any, Dict[str, Any]], positions: Dict[Any, int]) -> 'CatalogIndex':
+        """
+        Copy this index with records replaced at their current document ids
+        
+        Only fields whose text changed are re-tokenized, and only their
+        postings are copied; everything else is shared with this index.
+        """
+        index = object.__new__(CatalogIndex)
+        index.__dict__.update(self.__dict__)
+        records = list(self._records)
+        postings = dict(self._postings)
+        copied_fields = set()
+        vocabulary_changed = set()
+        category_bits = dict(self._category_bits)
+        official_bits = self._official_bits
+        installed_bits = self._installed_bits
+        
+        for name, record in updates.items():
+            doc_id = positions[name]
+            old = records[doc_id]
+            records[doc_id] = record
+            bit = 1 << doc_id
+            
+            for field in SEARCH_FIELD_WEIGHTS:
+                old_text, new_text = _field_text(old, field), _field_text(record, field)
+                if old_text == new_text:
+                    continue
+                old_tokens, new_tokens = set(tokenize(old_text)), set(tokenize(new_text))
+                if old_tokens == new_tokens:
+                    continue
+                
+                if field not in copied_fields:
+                    postings[field] = dict(postings[field])
+                    copied_fields.add(field)
+                field_postings = postings[field]
+                for token in old_tokens - new_tokens:
+                    remaining = field_postings[token] & ~bit
+                    if remaining:
+                        field_postings[token] = remaining
+                    else:
+                        del field_postings[token]
+                        vocabulary_changed.add(field)
+                for token in new_tokens - old_tokens:
+                    if token not in field_postings:
+                        vocabulary_changed.add(field)
+                    field_postings[token] = field_postings.get(token, 0) | bit
+            
+            old_category = old.get('category') or 'unknown'
+            new_category = record.get('category') or 'unknown'
+            if old_category != new_category:
+                remaining = category_bits[old_category] & ~bit
+                if remaining:
+                    category_bits[old_category] = remaining
+                else:
+                    del category_bits[old_category]
+                category_bits[new_category] = category_bits.get(new_category, 0) | bit
+            
+            official_bits = official_bits | bit if record.get('is_official') else official_bits & ~bit
+            installed_bits = installed_bits | bit if record.get('is_installed') else installed_bits & ~bit
+        
+        index._records = tuple(records)
+        index._postings = postings
+        index._vocabulary = {
+            field: sorted(postings[field]) if field in vocabulary_changed else tokens
+            for field, tokens in self._vocabulary.items()
+        }
+        index._category_bits = category_bits
+        index._official_bits = official_bits
+        index._installed_bits = installed_bits
+        index._facets = index._count_facets()
+        if vocabulary_changed.intersection(FUZZY_FIELDS):
+            index._fuzzy = self._fuzzy if self._fuzzy is not None and index._fuzzy_terms() == self._fuzzy.terms else None
+        return index
+    
+    def _filter_bits(self, category: Optional[str], official_only: bool) -> int:
+        """Combine category and official filters into a document bitset"""
+        bits = self._all_bits
+        if category:
+            bits &= self._category_bits.get(category, 0)
+        if official_only:
+            bits &= self._official_bits
+        return bits
+    
+    def _prefix_bits(self, field: str, prefix: str) -> int:
+        """Union of postings for every token in a field starting with prefix"""
+        vocabulary = self._vocabulary[field]
+        postings = self._postings[field]
+        bits = 0
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            bits |= postings[vocabulary[position]]
+            position += 1
+        return bits
+    
+    def _materialise(self, doc_ids: Iterable[int], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Copy records for document ids, stopping at limit"""
+        results = []
+        for doc_id in doc_ids:
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(dict(self._records[doc_id]))
+        return results
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index size statistics for monitoring
+        
+        Returns:
+            Dictionary containing record and vocabulary counts
+        """
+        return {
+            "records": len(self._records),
+            "vocabulary": {field: len(tokens) for field, tokens in self._vocabulary.items()},
+            "categories": len(self._category_bits),
+            "fuzzy": self._fuzzy.get_stats() if self._fuzzy is not None else None
+        }
+
+def highlight(text: str, tokens: List[str], marker: Tuple[str, str] = ('<mark>', '</mark>')) -> str:
+    """
+    Wrap words in text that start with any query token in highlight markers
+    
+    Args:
+        text: Text to highlight
+        tokens: Lowercase query tokens
+        marker: Opening and closing highlight markers
+    
+    Returns:
+        Highlighted text
+    """
+    if not text or not tokens:
+        return text or ''
+    
+    def _mark(match):
+        word = match.group(0)
+        if any(word.lower().startswith(token) for token in tokens):
+            return f"{marker[0]}{word}{marker[1]}"
+        return word
+    
+    return _TOKEN_PATTERN.sub(_mark, text)
@@ -0,0 +1,180 @@
+"""
+Chat Stream Buffer
+
+Short-lived buffers of the events of streamed HTTP chat responses. A
+response is produced into its buffer independently of the connection that
+requested it, so an HTTP client that drops mid-response can reconnect with
+``Last-Event-ID`` and receive only the events it missed. Buffers expire a
+fixed time after their response completes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 120.0
+DEFAULT_MAX_STREAMS = 256
+
+class ChatStream:
+    """
+    Ordered, append-only events of one streamed response
+    
+    Event ids are consecutive integers starting at 0. Readers block in
+    ``wait_for`` until events newer than the last one they saw arrive.
+    """
+    
+    def __init__(self, stream_id: str):
+        """
+        Initialize an empty stream
+        
+        Args:
+            stream_id: Identifier clients use to resume the stream
+        """
+        self.stream_id = stream_id
+        self.created = time.monotonic()
+        self.completed_at: Optional[float] = None
+        self._events: List[Tuple[int, str, Dict[str, Any]]] = []
+        self._condition = threading.Condition()
+    
+    @property
+    def done(self) -> bool:
+        """Whether the response has finished producing events"""
+        return self.completed_at is not None
+    
+    def append(self, event: str, data: Dict[str, Any]) -> int:
+        """
+        Add an event and wake waiting readers
+        
+        Args:
+            event: Event name
+            data: JSON-serialisable event payload
+        
+        Returns:
+            Id of the new event
+        """
+        with self._condition:
+            event_id = len(self._events)
+            self._events.append((event_id, event, data))
+            self._condition.notify_all()
+        return event_id
+    
+    def finish(self):
+        """Mark the response complete and wake waiting readers"""
+        with self._condition:
+            self.completed_at = time.monotonic()
+            self._condition.notify_all()
+    
+    def wait_for(self, after_id: int, timeout: float) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], bool]:
+        """
+        Wait for events newer than ``after_id``
+        
+        Args:
+            after_id: Id of the last event the reader has, or -1 for none
+            timeout: Maximum seconds to wait when no newer event exists
+        
+        Returns:
+            Tuple of every event newer than ``after_id`` (possibly empty on
+            timeout) and whether the stream is complete
+        """
+        with self._condition:
+            if len(self._events) <= after_id + 1 and not self.done:
+                self._condition.wait(timeout)
+            return self._events[after_id + 1:], self.done
+
+class ChatStreamBuffer:
+    """
+    Registry of recent chat streams with expiry after completion
+    """
+    
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_streams: int = DEFAULT_MAX_STREAMS):
+        """
+        Initialize retention limits
+        
+        Args:
+            ttl_seconds: Seconds a completed stream stays resumable
+            max_streams: Streams kept before the oldest are dropped
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_streams = max(1, max_streams)
+        self._streams: "OrderedDict[str, ChatStream]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def create(self, stream_id: str) -> ChatStream:
+        """
+        Register a new stream
+        
+        Args:
+            stream_id: Identifier of the stream
+        
+        Returns:
+            The new ChatStream
+        """
+        stream = ChatStream(stream_id)
+        with self._lock:
+            self._prune()
+            self._streams[stream_id] = stream
+            while len(self._streams) > self.max_streams:
+                dropped_id, _ = self._streams.popitem(last=False)
+                logger.debug(f"Dropped chat stream {dropped_id} over the buffer limit")
+        return stream
+    
+    def get(self, stream_id: str) -> Optional[ChatStream]:
+        """
+        Look up a stream that is still resumable
+        
+        Args:
+            stream_id: Identifier of the stream
+        
+        Returns:
+            The ChatStream, or None when it is unknown or expired
+        """
+        with self._lock:
+            self._prune()
+            return self._streams.get(stream_id)
+    
+    def _prune(self):
+        """Drop completed streams past their retention (caller holds the lock)"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        for stream_id, stream in list(self._streams.items()):
+            if stream.completed_at is not None and stream.completed_at < cutoff:
+                del self._streams[stream_id]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get buffer occupancy for monitoring
+        
+        Returns:
+            Dictionary containing active and completed stream counts
+        """
+        with self._lock:
+            streams = list(self._streams.values())
+        active = sum(1 for stream in streams if not stream.done)
+        return {
+            "active": active,
+            "completed": len(streams) - active,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+_buffer: Optional[ChatStreamBuffer] = None
+_buffer_lock = threading.Lock()
+
+def get_chat_stream_buffer(**settings: Any) -> ChatStreamBuffer:
+    """
+    Get the process-wide chat stream buffer, creating it on first use
+    
+    Args:
+        **settings: ChatStreamBuffer arguments used when the buffer is created
+    
+    Returns:
+        Shared ChatStreamBuffer instance
+    """
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = ChatStreamBuffer(**settings)
+        return _buffer
@@ -11,6 +11,10 @@ import json
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+from services.local_memory_store import LocalMemoryStore, get_local_memory_store
+from services.memory_compactor import MemoryCompactor, get_memory_compactor
+from services.memory_search_cache import MemorySearchCache, get_memory_search_cache
+from services.memory_write_buffer import MemoryWriteBuffer, get_memory_write_buffer
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
@@ -50,10 +54,18 @@ class EnhancedMamaBear:
         self.memory = None
         self.together_client = None
         self.user_id = 'nathan_sanctuary'
-        self.local_memory_fallback = []
+        self.local_memory: Optional[LocalMemoryStore] = None
+        self.memory_compactor: Optional[MemoryCompactor] = None
+        self.memory_writer: Optional[MemoryWriteBuffer] = None
+        self.search_cache: Optional[MemorySearchCache] = None
         
         self._initialize_mem0_service()
         self._initialize_together_service()
+        if self.memory:
+            self._initialize_memory_writer()
+            self._initialize_search_cache()
+        else:
+            self._initialize_local_memory()
         
         logger.info("Enhanced Mama Bear service initialized")
     
@@ -67,7 +79,8 @@ class EnhancedMamaBear:
             mem0_api_key = os.getenv('MEM0_API_KEY')
             if mem0_api_key:
                 os.environ["MEM0_API_KEY"] = mem0_api_key
-                self.memory = MemoryClient()
+                mem0_host = os.getenv('MEM0_HOST')
+                self.memory = MemoryClient(host=mem0_host) if mem0_host else MemoryClient()
                 self.user_id = os.getenv('MEM0_USER_ID', 'nathan_sanctuary')
                 logger.info("Mem0.ai persistent memory service initialized successfully")
             else:
@@ -77,6 +90,76 @@ class EnhancedMamaBear:
             logger.error(f"Mem0.ai initialization failed: {e}")
             self.memory = None
     
+    def _initialize_memory_writer(self):
+        """Start the write-behind buffer that delivers memories to Mem0.ai in the background"""
+        try:
+            self.memory_writer = get_memory_write_buffer(
+                self._send_memory_batch,
+                journal_path=os.getenv('MEM0_JOURNAL_PATH', 'mem0_journal.jsonl'),
+                batch_size=int(os.getenv('MEM0_WRITE_BATCH_SIZE', '20')),
+                flush_interval=int(os.getenv('MEM0_WRITE_FLUSH_MS', '500')) / 1000.0,
+                max_pending=int(os.getenv('MEM0_WRITE_MAX_PENDING', '1000')),
+                max_attempts=int(os.getenv('MEM0_WRITE_MAX_ATTEMPTS', '5')),
+                dead_letter_path=os.getenv('MEM0_DEAD_LETTER_PATH')
+            )
+            
+        except Exception as e:
+            logger.error(f"Mem0.ai write buffer initialization failed, writing synchronously: {e}")
+            self.memory_writer = None
+    
+    def _send_memory_batch(self, messages: List[Dict[str, str]], user_id: str, metadata: Dict[str, Any]):
+        """Deliver one coalesced batch of memories to Mem0.ai (called from the write buffer thread)"""
+        self.memory.add(
+            messages=messages,
+            user_id=user_id,
+            metadata=metadata,
+            categories=["mama_bear_memory"]
+        )
+        if self.search_cache:
+            self.search_cache.invalidate(user_id, [message["content"] for message in messages])
+    
+    def _initialize_search_cache(self):
+        """Create the per-user cache in front of Mem0.ai searches"""
+        self.search_cache = get_memory_search_cache(
+            max_entries_per_user=int(os.getenv('MEMORY_SEARCH_CACHE_SIZE', '128')),
+            ttl_seconds=float(os.getenv('MEMORY_SEARCH_CACHE_TTL', '300')),
+            reuse_similarity=float(os.getenv('MEMORY_SEARCH_REUSE_SIMILARITY', '0.9')),
+            invalidation_similarity=float(os.getenv('MEMORY_SEARCH_INVALIDATION_SIMILARITY', '0.2'))
+        )
+    
+    def _search_mem0(self, query: str, limit: int) -> List[Dict]:
+        """Run a Mem0.ai search for the configured user"""
+        results = self.memory.search(
+            query=query,
+            user_id=self.user_id,
+            threshold=0.5
+        )
+        return results[:limit]
+    
+    def _initialize_local_memory(self):
+        """Open the persistent local vector memory store used without Mem0.ai"""
+        try:
+            self.local_memory = get_local_memory_store(
+                max_entries=int(os.getenv('LOCAL_MEMORY_MAX_ENTRIES', '100000')),
+                dimensions=int(os.getenv('LOCAL_MEMORY_DIMENSIONS', '262144')),
+                half_life_days=float(os.getenv('LOCAL_MEMORY_HALF_LIFE_DAYS', '30')),
+                evict_fraction=float(os.getenv('LOCAL_MEMORY_EVICT_FRACTION', '0.1'))
+            )
+            logger.info(f"Local memory store active with {len(self.local_memory)} memories")
+            
+        except Exception as e:
+            # Keep memory working for this process rather than silently dropping it
+            logger.error(f"Local memory store initialization failed, using an in-process store: {e}")
+            self.local_memory = get_local_memory_store(persist=False)
+        
+        if os.getenv('LOCAL_MEMORY_COMPACTION_ENABLED', 'True').lower() == 'true':
+            self.memory_compactor = get_memory_compactor(
+                self.local_memory,
+                min_age_days=float(os.getenv('LOCAL_MEMORY_COMPACTION_MIN_AGE_DAYS', '1')),
+                similarity=float(os.getenv('LOCAL_MEMORY_COMPACTION_SIMILARITY', '0.3')),
+                interval_seconds=float(os.getenv('LOCAL_MEMORY_COMPACTION_INTERVAL', '3600'))
+            )
+    
     def _initialize_together_service(self):
         """Initialize Together.ai sandbox service with error handling"""
         if not TOGETHER_AVAILABLE:
@@ -108,31 +191,21 @@ class EnhancedMamaBear:
             Success status of memory storage operation
         """
         try:
-            if self.memory:
+            if self.memory_writer:
+                # Queued for Mem0.ai; delivered in batches by the write buffer thread
+                queued = self.memory_writer.submit(content, metadata, user_id=self.user_id)
+                logger.debug(f"Memory queued for Mem0.ai: {content[:50]}...")
+                return queued
+            
+            elif self.memory:
                 # Use Mem0.ai cloud service for persistent storage
-                result = self.memory.add(
-                    messages=[{"role": "user", "content": content}],
-                    user_id=self.user_id,
-                    metadata=metadata or {},
-                    categories=["mama_bear_memory"]
-                )
+                self._send_memory_batch([{"role": "user", "content": content}], self.user_id, metadata or {})
                 logger.debug(f"Memory stored in Mem0.ai: {content[:50]}...")
                 return True
                 
             else:
-                # Local fallback memory storage
-                memory_entry = {
-                    "content": content,
-                    "metadata": metadata or {},
-                    "timestamp": datetime.now().isoformat(),
-                    "user_id": self.user_id
-                }
-                self.local_memory_fallback.append(memory_entry)
-                
-                # Limit local memory to prevent memory leaks
-                if len(self.local_memory_fallback) > 100:
-                    self.local_memory_fallback = self.local_memory_fallback[-50:]
-                
+                # Persistent local vector store
+                self.local_memory.add(content, metadata, user_id=self.user_id)
                 logger.debug(f"Memory stored locally: {content[:50]}...")
                 return True
                 
@@ -153,31 +226,21 @@ class EnhancedMamaBear:
         """
         try:
             if self.memory:
-                # Use Mem0.ai cloud service for intelligent search
-                results = self.memory.search(
-                    query=query,
-                    user_id=self.user_id,
-                    threshold=0.5
-                )
+                # Use Mem0.ai cloud service for intelligent search, answering repeats from the cache
+                if self.search_cache:
+                    results = self.search_cache.get_or_search(
+                        self.user_id, query, limit, lambda: self._search_mem0(query, limit)
+                    )
+                else:
+                    results = self._search_mem0(query, limit)
                 logger.debug(f"Found {len(results)} memories via Mem0.ai for query: {query}")
-                return results[:limit]
+                return results
                 
             else:
-                # Local fallback search with simple string matching
-                matching_memories = []
-                query_lower = query.lower()
-                
-                for memory in self.local_memory_fallback:
-                    content = memory.get("content", "").lower()
-                    if query_lower in content:
-                        matching_memories.append({
-                            "text": memory["content"],
-                            "metadata": memory["metadata"],
-                            "timestamp": memory["timestamp"]
-                        })
-                
+                # Local vector search ranked by similarity, recency and importance
+                matching_memories = self.local_memory.search(query, limit=limit, user_id=self.user_id)
                 logger.debug(f"Found {len(matching_memories)} memories locally for query: {query}")
-                return matching_memories[:limit]
+                return matching_memories
                 
         except Exception as e:
             logger.error(f"Memory search failed: {e}")
@@ -334,7 +397,9 @@ Please provide:
                 "available": self.memory is not None,
                 "configured": bool(os.getenv('MEM0_API_KEY')),
                 "user_id": self.user_id,
-                "storage_type": "cloud" if self.memory else "local_fallback"
+                "storage_type": "cloud" if self.memory else "local_fallback",
+                "write_buffer": self.memory_writer.get_stats() if self.memory_writer else {"running": False},
+                "search_cache": self.search_cache.get_stats() if self.search_cache else {"size": 0}
             },
             "together_service": {
                 "available": self.together_client is not None,
@@ -343,8 +408,9 @@ Please provide:
                 "sandbox_enabled": self.together_client is not None
             },
             "local_memory": {
-                "entries": len(self.local_memory_fallback),
-                "active": not bool(self.memory)
+                **(self.local_memory.get_stats() if self.local_memory else {"entries": 0}),
+                "active": not bool(self.memory),
+                "compaction": self.memory_compactor.get_stats() if self.memory_compactor else {"running": False}
             },
             "overall_status": "enhanced" if (self.memory and self.together_client) else "basic"
         }
\ No newline at end of file
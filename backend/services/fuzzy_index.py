@@ -0,0 +1,194 @@
+"""
+Fuzzy Term Index
+
+Typo-tolerant lookup of search terms ("postgress" -> "postgres",
+"githb" -> "github") over the catalog vocabulary. Candidate terms are
+found through a trigram index and then verified with a bounded
+Levenshtein distance:
+
+- each term is padded (``$term$``) and split into trigrams; a term within
+  edit distance ``d`` of the query shares at least ``len(query) - 3d`` of
+  the query's trigrams, so candidates below that count are discarded
+  without computing a distance
+- candidates are verified in descending trigram overlap order, and the
+  lookup stops at a time budget or candidate limit so worst-case queries
+  stay within a few milliseconds on large catalogs
+"""
+
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Default per-lookup time budget in seconds
+FUZZY_TIME_BUDGET = 0.003
+
+# Maximum number of candidates verified with an edit distance per lookup
+FUZZY_MAX_CANDIDATES = 200
+
+def max_edit_distance(term: str) -> int:
+    """
+    Edit distance tolerated for a query term of this length
+    
+    Args:
+        term: Query term
+    
+    Returns:
+        0 for terms of up to 3 characters, 1 up to 5, otherwise 2
+    """
+    if len(term) <= 3:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+def trigrams(term: str) -> List[str]:
+    """
+    Split a term into padded trigrams
+    
+    Args:
+        term: Lowercase term
+    
+    Returns:
+        List of trigrams, one per character of the term
+    """
+    padded = f"${term}$"
+    return [padded[position:position + 3] for position in range(len(padded) - 2)]
+
+def bounded_levenshtein(first: str, second: str, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance between two strings, if it is within a bound
+    
+    Only a diagonal band of width ``2 * max_distance + 1`` is computed and
+    the computation stops as soon as every cell in a row exceeds the bound.
+    
+    Args:
+        first: First string
+        second: Second string
+        max_distance: Largest distance of interest
+    
+    Returns:
+        The distance, or None if it exceeds max_distance
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return None
+    if first == second:
+        return 0
+    
+    over = max_distance + 1
+    previous = [column if column <= max_distance else over for column in range(len(second) + 1)]
+    
+    for row, first_char in enumerate(first, start=1):
+        low = max(1, row - max_distance)
+        high = min(len(second), row + max_distance)
+        current = [over] * (len(second) + 1)
+        current[0] = row if row <= max_distance else over
+        row_minimum = current[0]
+        
+        for column in range(low, high + 1):
+            cost = 0 if first_char == second[column - 1] else 1
+            value = min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + cost)
+            current[column] = value if value <= max_distance else over
+            if value < row_minimum:
+                row_minimum = value
+        
+        if row_minimum > max_distance:
+            return None
+        previous = current
+    
+    distance = previous[len(second)]
+    return distance if distance <= max_distance else None
+
+class TrigramIndex:
+    """
+    Immutable trigram index over a vocabulary of lowercase terms
+    """
+    
+    def __init__(self, terms: Iterable[str]):
+        """
+        Build trigram postings for a vocabulary
+        
+        Args:
+            terms: Distinct lowercase terms
+        """
+        self._terms: Tuple[str, ...] = tuple(sorted(set(terms)))
+        postings: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(self._terms):
+            for gram in set(trigrams(term)):
+                postings.setdefault(gram, []).append(term_id)
+        self._postings = postings
+        self._lengths = [len(term) for term in self._terms]
+        self._stats = {"lookups": 0, "budget_exhausted": 0}
+    
+    def __len__(self) -> int:
+        return len(self._terms)
+    
+    @property
+    def terms(self) -> Tuple[str, ...]:
+        """Indexed terms in sorted order"""
+        return self._terms
+    
+    def lookup(self, term: str, max_distance: Optional[int] = None,
+               time_budget: float = FUZZY_TIME_BUDGET,
+               max_candidates: int = FUZZY_MAX_CANDIDATES) -> List[Tuple[int, str]]:
+        """
+        Find indexed terms within a bounded edit distance of a query term
+        
+        Args:
+            term: Lowercase query term
+            max_distance: Edit distance bound (defaults to max_edit_distance)
+            time_budget: Seconds after which the lookup returns what it has
+            max_candidates: Maximum number of distance computations
+        
+        Returns:
+            List of (distance, term) pairs, closest first
+        """
+        if max_distance is None:
+            max_distance = max_edit_distance(term)
+        if max_distance <= 0 or not term:
+            return []
+        
+        deadline = time.perf_counter() + time_budget
+        self._stats["lookups"] += 1
+        
+        query_grams = set(trigrams(term))
+        overlap: Counter = Counter()
+        for gram in query_grams:
+            term_ids = self._postings.get(gram)
+            if term_ids:
+                overlap.update(term_ids)
+        
+        # Trigram-count and length filters, then most overlapping candidates first
+        required = max(1, len(query_grams) - 3 * max_distance)
+        length = len(term)
+        lengths = self._lengths
+        candidates = [
+            (-shared, term_id) for term_id, shared in overlap.items()
+            if shared >= required and abs(lengths[term_id] - length) <= max_distance
+        ]
+        candidates.sort()
+        
+        matches: List[Tuple[int, str]] = []
+        for checked, (_, term_id) in enumerate(candidates):
+            if checked >= max_candidates or time.perf_counter() > deadline:
+                self._stats["budget_exhausted"] += 1
+                logger.debug(f"Fuzzy lookup for '{term}' stopped after {checked} candidates")
+                break
+            
+            candidate = self._terms[term_id]
+            distance = bounded_levenshtein(term, candidate, max_distance)
+            if distance is not None:
+                matches.append((distance, candidate))
+        
+        matches.sort()
+        return matches
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get index size and lookup counters for monitoring
+        
+        Returns:
+            Dictionary containing term, trigram and lookup counts
+        """
+        return {"terms": len(self._terms), "trigrams": len(self._postings), **self._stats}
@@ -0,0 +1,634 @@
+"""
+Local Vector Memory Store
+
+Persistent memory engine used by Enhanced Mama Bear when Mem0.ai is not
+configured. Memories live in the ``memories`` SQLite table and are mirrored
+in memory for search:
+
+- embeddings come from a hashing vectoriser over word unigrams and bigrams
+  (no model download, no network) and are sparse, L2-normalised vectors in
+  a large hashed feature space, so unrelated words rarely collide
+- the embedding matrix is kept dimension-major as posting arrays (memory
+  positions and weights per feature); a query only reads the columns of
+  its own features, weighted by inverse document frequency, and with NumPy
+  the scores for every memory are accumulated in one ``bincount``
+- results blend this cosine similarity with recency and importance
+- when the store outgrows its capacity, the memories with the lowest
+  retention score (importance and recency of last access) are evicted
+- old memories can be replaced by summaries (see services.memory_compactor);
+  the originals stay in the table as tombstones pointing at their summary
+"""
+
+import hashlib
+import json
+import math
+import re
+import struct
+import threading
+import time
+import uuid
+from array import array
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from models.database import get_db_connection, execute_write
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Optional vectorised search
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+    logger.info("NumPy not available - local memory search uses pure Python scoring")
+
+DEFAULT_DIMENSIONS = 1 << 18
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_HALF_LIFE_DAYS = 30.0
+
+# Share of capacity freed by one eviction pass, so eviction is not run on every write
+DEFAULT_EVICT_FRACTION = 0.1
+
+# Query features kept (by IDF-weighted magnitude) to bound search cost for long queries
+MAX_QUERY_FEATURES = 32
+
+# Query features present in more than this share of memories carry no signal
+MAX_FEATURE_DOCUMENT_SHARE = 0.5
+
+# Result ranking: cosine similarity plus recency and importance bonuses
+SIMILARITY_WEIGHT = 1.0
+RECENCY_WEIGHT = 0.15
+IMPORTANCE_WEIGHT = 0.15
+MIN_SIMILARITY = 0.1
+
+# Importance by memory type when metadata does not provide one (0-1)
+TYPE_IMPORTANCE = {
+    "learning": 0.8,
+    "code_execution": 0.6,
+    "discovery_session": 0.5,
+    "chat_message": 0.4,
+    "chat_response": 0.3
+}
+DEFAULT_IMPORTANCE = 0.5
+
+# Metadata type of memories written by compaction
+SUMMARY_TYPE = "memory_summary"
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Embedding blob header: dimensions and feature count, followed by feature ids and weights
+_EMBEDDING_HEADER = struct.Struct("<II")
+
+# Sparse vector as parallel feature id and weight arrays
+SparseVector = Tuple[array, array]
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature string"""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+class HashingVectorizer:
+    """
+    Stateless text embedder using the hashing trick
+    
+    Word unigrams and bigrams are hashed into a fixed number of signed
+    buckets with sublinear term frequency, then L2-normalised.
+    """
+    
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        """
+        Initialize vectoriser size
+        
+        Args:
+            dimensions: Number of hash buckets
+        """
+        self.dimensions = dimensions
+    
+    def transform(self, text: str) -> SparseVector:
+        """
+        Embed text as a sparse unit vector
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            Tuple of (feature ids, weights); empty for text without words
+        """
+        tokens = _TOKEN_PATTERN.findall(text.lower()) if text else []
+        features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        
+        counts: Dict[int, float] = {}
+        for feature in features:
+            value = _feature_hash(feature)
+            bucket = value % self.dimensions
+            counts[bucket] = counts.get(bucket, 0.0) + (1.0 if value >> 63 else -1.0)
+        
+        weights = {bucket: math.copysign(1.0 + math.log(abs(count)), count)
+                   for bucket, count in counts.items() if count}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if not norm:
+            return array("i"), array("f")
+        return array("i", weights.keys()), array("f", (weight / norm for weight in weights.values()))
+    
+    def to_bytes(self, vector: SparseVector) -> bytes:
+        """Serialise a sparse vector together with the dimensions it was computed for"""
+        buckets, weights = vector
+        return _EMBEDDING_HEADER.pack(self.dimensions, len(buckets)) + buckets.tobytes() + weights.tobytes()
+    
+    def from_bytes(self, data: Optional[bytes]) -> Optional[SparseVector]:
+        """Deserialise a stored vector, or None if it is missing or was computed for other dimensions"""
+        if not data or len(data) < _EMBEDDING_HEADER.size:
+            return None
+        dimensions, count = _EMBEDDING_HEADER.unpack_from(data)
+        if dimensions != self.dimensions or len(data) != _EMBEDDING_HEADER.size + 8 * count:
+            return None
+        
+        split = _EMBEDDING_HEADER.size + 4 * count
+        buckets, weights = array("i"), array("f")
+        buckets.frombytes(data[_EMBEDDING_HEADER.size:split])
+        weights.frombytes(data[split:])
+        return buckets, weights
+
+class LocalMemoryStore:
+    """
+    SQLite-backed memory store with in-memory vector search
+    
+    Writes are mirrored in memory immediately and persisted through the
+    background database writer. Memories written by other processes are
+    picked up on the next start.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, dimensions: int = DEFAULT_DIMENSIONS,
+                 half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+                 evict_fraction: float = DEFAULT_EVICT_FRACTION, persist: bool = True):
+        """
+        Initialize the store and load persisted memories
+        
+        Args:
+            max_entries: Memories kept before eviction
+            dimensions: Hashed feature space size (changing it re-embeds stored memories on load)
+            half_life_days: Age at which the recency bonus halves
+            evict_fraction: Share of capacity freed per eviction pass
+            persist: Whether to read and write the memories table
+        """
+        self.max_entries = max(1, max_entries)
+        self.half_life_seconds = max(half_life_days, 0.001) * 86400.0
+        self.evict_fraction = min(max(evict_fraction, 0.0), 1.0)
+        self.vectorizer = HashingVectorizer(dimensions)
+        self.persist = persist
+        
+        self._lock = threading.Lock()
+        self._user_codes: Dict[str, int] = {}
+        self._reset()
+        self.generation = 0
+        self._stats = {"stored": 0, "searches": 0, "evicted": 0, "compacted": 0, "summaries": 0,
+                       "persist_errors": 0}
+        
+        if self.persist:
+            self._load()
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def add(self, content: str, metadata: Optional[Dict[str, Any]] = None, user_id: str = "default",
+            importance: Optional[float] = None) -> str:
+        """
+        Store a memory
+        
+        Args:
+            content: Memory text
+            metadata: Additional context stored with the memory
+            user_id: Owner of the memory
+            importance: Retention weight from 0 to 1 (defaults by metadata type)
+        
+        Returns:
+            Identifier of the new memory
+        """
+        metadata = dict(metadata or {})
+        if importance is None:
+            importance = metadata.get("importance", TYPE_IMPORTANCE.get(metadata.get("type"), DEFAULT_IMPORTANCE))
+        importance = min(max(float(importance), 0.0), 1.0)
+        
+        memory_id = uuid.uuid4().hex
+        vector = self.vectorizer.transform(content)
+        embedding = self.vectorizer.to_bytes(vector)
+        now = time.time()
+        timestamp = datetime.now().isoformat()
+        
+        with self._lock:
+            self._append(memory_id, vector, content, metadata, user_id, timestamp, now, now, importance)
+            self._stats["stored"] += 1
+            
+            # Queued under the lock so an eviction of this memory is written after its insert
+            if self.persist:
+                self._write(
+                    "INSERT INTO memories (memory_id, user_id, content, metadata, importance, "
+                    "created_at, last_accessed, access_count, embedding) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                    (memory_id, user_id, content, json.dumps(metadata, default=str), importance,
+                     now, now, embedding)
+                )
+            if len(self._ids) > self.max_entries:
+                self._evict()
+        return memory_id
+    
+    def search(self, query: str, limit: int = 5, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find the memories most relevant to a query
+        
+        Args:
+            query: Search text
+            limit: Maximum number of memories
+            user_id: Restrict to one user's memories
+        
+        Returns:
+            List of memory dictionaries with text, metadata, timestamp and score
+        """
+        buckets, weights = self.vectorizer.transform(query)
+        
+        with self._lock:
+            self._stats["searches"] += 1
+            if not len(buckets) or not self._ids or limit <= 0:
+                return []
+            
+            user_code = self._user_codes.get(user_id) if user_id is not None else None
+            if user_id is not None and user_code is None:
+                return []
+            
+            query_features = self._weight_query(buckets, weights)
+            if not query_features:
+                return []
+            
+            now = time.time()
+            if NUMPY_AVAILABLE:
+                ranked = self._rank_numpy(query_features, user_code, now, limit)
+            else:
+                ranked = self._rank_python(query_features, user_code, now, limit)
+            
+            results = []
+            accessed = []
+            for score, similarity, position in ranked:
+                content, metadata, timestamp = self._payloads[position]
+                memory_id = self._ids[position]
+                results.append({
+                    "id": memory_id,
+                    "text": content,
+                    "metadata": metadata,
+                    "timestamp": timestamp,
+                    "score": round(score, 4),
+                    "similarity": round(similarity, 4)
+                })
+                self._accessed[position] = now
+                accessed.append(memory_id)
+        
+        if self.persist and accessed:
+            placeholders = ", ".join("?" for _ in accessed)
+            self._write(
+                f"UPDATE memories SET last_accessed = ?, access_count = access_count + 1 "
+                f"WHERE memory_id IN ({placeholders})",
+                (now, *accessed)
+            )
+        return results
+    
+    def _weight_query(self, buckets: array, weights: array) -> List[Tuple[int, float]]:
+        """
+        IDF-weight and normalise query features, keeping the informative ones present in the store
+        
+        Features no memory contains still count towards the norm (with the
+        highest IDF), so a query sharing one common word with a memory does
+        not score as a near-exact match.
+        """
+        count = len(self._ids)
+        max_idf = math.log((count + 1) / 0.5)
+        norm_squared = 0.0
+        weighted = []
+        for bucket, weight in zip(buckets, weights):
+            posting = self._postings.get(bucket)
+            if posting is None:
+                norm_squared += (weight * max_idf) ** 2
+                continue
+            idf = math.log((count + 1) / (len(posting[0]) + 0.5))
+            norm_squared += (weight * idf) ** 2
+            if len(posting[0]) <= MAX_FEATURE_DOCUMENT_SHARE * count:
+                weighted.append((bucket, weight * idf))
+        
+        weighted.sort(key=lambda item: -abs(item[1]))
+        weighted = weighted[:MAX_QUERY_FEATURES]
+        norm = math.sqrt(norm_squared)
+        return [(bucket, weight / norm) for bucket, weight in weighted] if weighted and norm else []
+    
+    def _rank_numpy(self, query_features: List[Tuple[int, float]], user_code: Optional[int], now: float,
+                    limit: int) -> List[Tuple[float, float, int]]:
+        """Accumulate similarities over the query's posting columns and keep the top entries"""
+        positions = []
+        contributions = []
+        for bucket, weight in query_features:
+            posting_positions, posting_weights = self._postings[bucket]
+            positions.append(np.frombuffer(posting_positions, dtype=np.int32))
+            contributions.append(np.frombuffer(posting_weights, dtype=np.float32) * weight)
+        similarity = np.bincount(np.concatenate(positions), weights=np.concatenate(contributions),
+                                 minlength=len(self._ids))
+        
+        mask = similarity >= MIN_SIMILARITY
+        if user_code is not None:
+            mask &= np.frombuffer(self._users, dtype=np.int32) == user_code
+        candidates = np.flatnonzero(mask)
+        if not candidates.size:
+            return []
+        
+        accessed = np.frombuffer(self._accessed, dtype=np.float64)[candidates]
+        importance = np.frombuffer(self._importance, dtype=np.float32)[candidates]
+        scores = (SIMILARITY_WEIGHT * similarity[candidates]
+                  + RECENCY_WEIGHT * np.exp2(-(now - accessed) / self.half_life_seconds)
+                  + IMPORTANCE_WEIGHT * importance)
+        
+        if candidates.size > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(candidates.size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[i]), float(similarity[candidates[i]]), int(candidates[i])) for i in top]
+    
+    def _rank_python(self, query_features: List[Tuple[int, float]], user_code: Optional[int], now: float,
+                     limit: int) -> List[Tuple[float, float, int]]:
+        """Pure Python accumulation over the query's posting columns"""
+        similarity: Dict[int, float] = {}
+        for bucket, weight in query_features:
+            for position, value in zip(*self._postings[bucket]):
+                similarity[position] = similarity.get(position, 0.0) + weight * value
+        
+        ranked = []
+        for position, value in similarity.items():
+            if value < MIN_SIMILARITY or (user_code is not None and self._users[position] != user_code):
+                continue
+            recency = 2.0 ** (-(now - self._accessed[position]) / self.half_life_seconds)
+            score = (SIMILARITY_WEIGHT * value + RECENCY_WEIGHT * recency
+                     + IMPORTANCE_WEIGHT * self._importance[position])
+            ranked.append((score, value, position))
+        
+        ranked.sort(key=lambda item: -item[0])
+        return ranked[:limit]
+    
+    def _reset(self):
+        """Clear the in-memory columns (caller holds the lock or owns the store)"""
+        self._ids: List[str] = []
+        self._payloads: List[Tuple[str, Dict[str, Any], str]] = []
+        self._vectors: List[SparseVector] = []
+        self._postings: Dict[int, SparseVector] = {}
+        self._created = array("d")
+        self._accessed = array("d")
+        self._importance = array("f")
+        self._users = array("i")
+    
+    def _append(self, memory_id: str, vector: SparseVector, content: str, metadata: Dict[str, Any],
+                user_id: str, timestamp: str, created: float, accessed: float, importance: float):
+        """Add one memory as a new matrix column (caller holds the lock)"""
+        position = len(self._ids)
+        for bucket, weight in zip(*vector):
+            posting = self._postings.get(bucket)
+            if posting is None:
+                posting = self._postings[bucket] = (array("i"), array("f"))
+            posting[0].append(position)
+            posting[1].append(weight)
+        
+        self._ids.append(memory_id)
+        self._payloads.append((content, metadata, timestamp))
+        self._vectors.append(vector)
+        self._created.append(created)
+        self._accessed.append(accessed)
+        self._importance.append(importance)
+        self._users.append(self._user_codes.setdefault(user_id, len(self._user_codes)))
+    
+    def _retention_scores(self) -> List[float]:
+        """Importance plus recency of last access for every memory"""
+        now = time.time()
+        if NUMPY_AVAILABLE:
+            recency = np.exp2(-(now - np.frombuffer(self._accessed, dtype=np.float64)) / self.half_life_seconds)
+            return (IMPORTANCE_WEIGHT * np.frombuffer(self._importance, dtype=np.float32)
+                    + RECENCY_WEIGHT * recency).tolist()
+        return [IMPORTANCE_WEIGHT * importance + RECENCY_WEIGHT * 2.0 ** (-(now - accessed) / self.half_life_seconds)
+                for importance, accessed in zip(self._importance, self._accessed)]
+    
+    def _evict(self):
+        """Drop the lowest-retention memories down to the low-water mark (caller holds the lock)"""
+        count = len(self._ids)
+        target = max(0, min(self.max_entries, int(self.max_entries * (1.0 - self.evict_fraction))))
+        if count <= target:
+            return
+        
+        retention = self._retention_scores()
+        evicted = set(sorted(range(count), key=lambda position: (retention[position], position))[:count - target])
+        evicted_ids = [self._ids[position] for position in sorted(evicted)]
+        
+        self._remove(evicted)
+        
+        self._stats["evicted"] += len(evicted_ids)
+        logger.info(f"Evicted {len(evicted_ids)} local memories ({len(self._ids)} kept)")
+        
+        if self.persist:
+            for start in range(0, len(evicted_ids), 500):
+                chunk = evicted_ids[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                self._write(f"DELETE FROM memories WHERE memory_id IN ({placeholders})", tuple(chunk))
+    
+    def _remove(self, positions: Set[int]):
+        """Drop memories by position and rebuild the postings so positions stay dense (caller holds the lock)"""
+        kept = [
+            (self._ids[position], self._vectors[position], self._payloads[position], self._users[position],
+             self._created[position], self._accessed[position], self._importance[position])
+            for position in range(len(self._ids)) if position not in positions
+        ]
+        user_names = {code: name for name, code in self._user_codes.items()}
+        
+        self._reset()
+        for memory_id, vector, (content, metadata, timestamp), user_code, created, accessed, importance in kept:
+            self._append(memory_id, vector, content, metadata, user_names[user_code],
+                         timestamp, created, accessed, importance)
+    
+    def compaction_candidates(self, older_than: float, limit: int) -> List[Dict[str, Any]]:
+        """
+        Snapshot the oldest memories eligible for compaction
+        
+        Args:
+            older_than: Only memories created before this Unix time
+            limit: Maximum number of memories
+        
+        Returns:
+            Memory dictionaries (id, user_id, content, metadata, vector,
+            created, accessed, importance), oldest first; summaries are excluded
+        """
+        with self._lock:
+            user_names = {code: name for name, code in self._user_codes.items()}
+            order = sorted(range(len(self._ids)), key=lambda position: self._created[position])
+            candidates = []
+            for position in order:
+                if self._created[position] >= older_than or len(candidates) >= limit:
+                    break
+                content, metadata, _ = self._payloads[position]
+                if metadata.get("type") == SUMMARY_TYPE:
+                    continue
+                candidates.append({
+                    "id": self._ids[position],
+                    "user_id": user_names[self._users[position]],
+                    "content": content,
+                    "metadata": metadata,
+                    "vector": self._vectors[position],
+                    "created": self._created[position],
+                    "accessed": self._accessed[position],
+                    "importance": self._importance[position]
+                })
+        return candidates
+    
+    def apply_compaction(self, merges: List[Tuple[List[str], Dict[str, Any]]]) -> Tuple[int, int]:
+        """
+        Replace groups of memories with summary memories
+        
+        Merged memories leave the search index and are tombstoned in the
+        database (``compacted_into`` points at their summary). The store's
+        generation advances once per call that merges anything.
+        
+        Args:
+            merges: (memory ids, summary) pairs; a summary dictionary holds
+                user_id, content, metadata, importance, created and accessed
+        
+        Returns:
+            Tuple of (summaries stored, memories merged)
+        """
+        now = time.time()
+        with self._lock:
+            positions = {memory_id: position for position, memory_id in enumerate(self._ids)}
+            # Groups with a member evicted since the snapshot are left alone
+            merges = [(memory_ids, summary) for memory_ids, summary in merges
+                      if all(memory_id in positions for memory_id in memory_ids)]
+            if not merges:
+                return 0, 0
+            
+            self.generation += 1
+            self._remove({positions[memory_id] for memory_ids, _ in merges for memory_id in memory_ids})
+            
+            for memory_ids, summary in merges:
+                summary_id = uuid.uuid4().hex
+                metadata = {**summary["metadata"], "type": SUMMARY_TYPE, "generation": self.generation}
+                vector = self.vectorizer.transform(summary["content"])
+                self._append(summary_id, vector, summary["content"], metadata, summary["user_id"],
+                             datetime.fromtimestamp(summary["created"]).isoformat(), summary["created"],
+                             summary["accessed"], summary["importance"])
+                
+                if self.persist:
+                    self._write(
+                        "INSERT INTO memories (memory_id, user_id, content, metadata, importance, created_at, "
+                        "last_accessed, access_count, embedding, generation) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
+                        (summary_id, summary["user_id"], summary["content"], json.dumps(metadata, default=str),
+                         summary["importance"], summary["created"], summary["accessed"],
+                         self.vectorizer.to_bytes(vector), self.generation)
+                    )
+                    placeholders = ", ".join("?" for _ in memory_ids)
+                    self._write(
+                        f"UPDATE memories SET compacted_into = ?, compacted_at = ?, generation = ? "
+                        f"WHERE memory_id IN ({placeholders})",
+                        (summary_id, now, self.generation, *memory_ids)
+                    )
+            
+            merged = sum(len(memory_ids) for memory_ids, _ in merges)
+            self._stats["compacted"] += merged
+            self._stats["summaries"] += len(merges)
+        
+        logger.info(f"Compacted {merged} local memories into {len(merges)} summaries (generation {self.generation})")
+        return len(merges), merged
+    
+    def purge_tombstones(self, older_than: float):
+        """
+        Delete tombstoned memories compacted before a time
+        
+        Args:
+            older_than: Unix time before which tombstones are deleted
+        """
+        if self.persist:
+            self._write("DELETE FROM memories WHERE compacted_into IS NOT NULL AND compacted_at < ?", (older_than,))
+    
+    def _load(self):
+        """Load persisted memories, oldest first"""
+        try:
+            with get_db_connection() as conn:
+                rows = conn.execute(
+                    "SELECT memory_id, user_id, content, metadata, importance, created_at, "
+                    "last_accessed, embedding FROM memories WHERE compacted_into IS NULL ORDER BY created_at"
+                ).fetchall()
+                generation = conn.execute("SELECT MAX(generation) FROM memories").fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Local memory store running without persistence: {e}")
+            self.persist = False
+            return
+        
+        reembedded = 0
+        with self._lock:
+            self.generation = generation or 0
+            for memory_id, user_id, content, metadata, importance, created, accessed, embedding in rows:
+                vector = self.vectorizer.from_bytes(embedding)
+                if vector is None:
+                    vector = self.vectorizer.transform(content)
+                    reembedded += 1
+                
+                timestamp = datetime.fromtimestamp(created).isoformat()
+                self._append(memory_id, vector, content, json.loads(metadata or "{}"), user_id,
+                             timestamp, created, accessed, importance)
+            
+            if len(self._ids) > self.max_entries:
+                self._evict()
+        
+        if reembedded:
+            logger.info(f"Re-embedded {reembedded} local memories for {self.vectorizer.dimensions} dimensions")
+        logger.info(f"Loaded {len(self._ids)} local memories")
+    
+    def _write(self, query: str, params: tuple):
+        """Queue a write for the background writer, logging failures"""
+        def _report(future):
+            if future.exception() is not None:
+                self._stats["persist_errors"] += 1
+                logger.error(f"Local memory write failed: {future.exception()}")
+        
+        try:
+            execute_write(query, params).add_done_callback(_report)
+        except Exception as e:
+            self._stats["persist_errors"] += 1
+            logger.error(f"Local memory write failed: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store size and activity counters for monitoring
+        
+        Returns:
+            Dictionary containing entry counts, limits and counters
+        """
+        return {
+            "entries": len(self._ids),
+            "max_entries": self.max_entries,
+            "dimensions": self.vectorizer.dimensions,
+            "features": len(self._postings),
+            "generation": self.generation,
+            "persistent": self.persist,
+            "vectorised": NUMPY_AVAILABLE,
+            **self._stats
+        }
+
+_store: Optional[LocalMemoryStore] = None
+_store_lock = threading.Lock()
+
+def get_local_memory_store(**settings: Any) -> LocalMemoryStore:
+    """
+    Get the process-wide local memory store, creating it on first use
+    
+    Args:
+        **settings: LocalMemoryStore arguments used when the store is created
+    
+    Returns:
+        Shared LocalMemoryStore instance
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LocalMemoryStore(**settings)
+        return _store
@@ -5,17 +5,40 @@ Core AI agent service providing intelligent assistance and proactive
 development environment management for the Podplay Sanctuary.
 """
 
+import asyncio
 import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from models.database import get_db_connection
+from typing import Callable, Dict, Any, Optional, List
+from models.database import execute_write
 from services.enhanced_mama_service import EnhancedMamaBear
 from services.discovery_agent_service import ProactiveDiscoveryAgent
 from services.mama_bear_capability_system import mama_bear_capabilities
+from utils.async_bridge import run_sync
+from utils.latency_tracker import LatencyTracker
 from utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Per-stage timeouts for the chat pipeline in seconds; a stage that times out
+# falls back to a default (no memory context, general intent) instead of failing the chat
+CHAT_CONTEXT_TIMEOUT = float(os.getenv('CHAT_CONTEXT_TIMEOUT', '2.0'))
+CHAT_CLASSIFY_TIMEOUT = float(os.getenv('CHAT_CLASSIFY_TIMEOUT', '0.5'))
+CHAT_CAPABILITY_TIMEOUT = float(os.getenv('CHAT_CAPABILITY_TIMEOUT', '0.5'))
+CHAT_GENERATE_TIMEOUT = float(os.getenv('CHAT_GENERATE_TIMEOUT', '30.0'))
+
+# Capabilities consulted while generating chat responses
+CHAT_CAPABILITIES = ("mcp_server_management", "sandbox_execution", "code_analysis")
+
+CHAT_FALLBACK_RESPONSE = "I encountered a technical difficulty while processing your message. Please try again."
+
+# Pieces a generated response is streamed in: each word with its trailing whitespace
+RESPONSE_PIECE_PATTERN = re.compile(r"\s*\S+\s*")
+
 class MamaBearAgent:
     """
     Professional AI agent service with comprehensive development assistance capabilities
@@ -38,6 +61,8 @@ class MamaBearAgent:
         self.enhanced_mama = EnhancedMamaBear()
         self.discovery_agent = ProactiveDiscoveryAgent(marketplace_manager, self.enhanced_mama)
         self.capability_system = mama_bear_capabilities  # Full feature awareness
+        self.latency = LatencyTracker()
+        self._memory_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mama-bear-memory")
         
         logger.info("🐻 Mama Bear Agent initialized with comprehensive capability awareness")
     
@@ -45,6 +70,9 @@ class MamaBearAgent:
         """
         Process chat interactions with intelligent context and memory integration
         
+        Synchronous entry point for Flask routes; runs chat_async on the shared
+        background event loop.
+        
         Args:
             message: User message to process
             user_id: User identifier for personalization
@@ -53,39 +81,107 @@ class MamaBearAgent:
         Returns:
             Dictionary containing response and metadata
         """
+        return run_sync(self.chat_async(message, user_id, session_id))
+    
+    async def chat_async(self, message: str, user_id: str = "nathan",
+                         session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process a chat interaction as a concurrent pipeline
+        
+        Args:
+            message: User message to process
+            user_id: User identifier for personalization
+            session_id: Session identifier for context continuity
+            
+        Returns:
+            Dictionary containing response and metadata, including per-stage timings
+        """
+        return await self.chat_stream_async(message, user_id, session_id)
+    
+    async def chat_stream_async(self, message: str, user_id: str = "nathan", session_id: Optional[str] = None,
+                                on_chunk: Optional[Callable[[str], None]] = None,
+                                cancelled: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Process a chat interaction as a concurrent pipeline, optionally streaming the response
+        
+        Memory retrieval, intent classification and capability checks run
+        concurrently, each bounded by its own timeout, before the response is
+        generated. Both memory stores run on a background worker after the
+        fact instead of on the critical path.
+        
+        With ``on_chunk``, the response is delivered piece by piece (a word
+        and its trailing whitespace) from the event loop thread, and
+        ``cancelled`` is checked before generation and between pieces. A
+        cancelled chat records and returns only the text already delivered.
+        
+        Args:
+            message: User message to process
+            user_id: User identifier for personalization
+            session_id: Session identifier for context continuity
+            on_chunk: Callable receiving each response piece as it is produced
+            cancelled: Event set by the caller to stop the response
+            
+        Returns:
+            Dictionary containing response and metadata, including per-stage
+            timings, usage counts and whether the chat was cancelled
+        """
+        started = time.perf_counter()
+        stage_ms: Dict[str, float] = {}
+        
         try:
-            # Store user message in persistent memory
-            self.enhanced_mama.store_memory(
-                f"User ({user_id}): {message}",
-                {
-                    "type": "chat_message",
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "timestamp": datetime.now().isoformat()
-                }
-            )
+            self._store_memory_in_background(f"User ({user_id}): {message}", {
+                "type": "chat_message",
+                "user_id": user_id,
+                "session_id": session_id,
+                "timestamp": datetime.now().isoformat()
+            })
             
-            # Retrieve contextual insights for personalized response
-            context_insights = self.enhanced_mama.get_contextual_insights(f"chat context for {user_id}")
+            context_insights, intent, capabilities = await asyncio.gather(
+                self._run_stage("context", CHAT_CONTEXT_TIMEOUT, {}, stage_ms,
+                                self.enhanced_mama.get_contextual_insights, f"chat context for {user_id}"),
+                self._run_stage("classify", CHAT_CLASSIFY_TIMEOUT, "general", stage_ms,
+                                self._classify_intent, message),
+                self._run_stage("capabilities", CHAT_CAPABILITY_TIMEOUT, {}, stage_ms,
+                                self._check_chat_capabilities)
+            )
             
-            # Generate intelligent response based on message content
-            if self._is_mcp_related_query(message):
-                response = self._handle_mcp_query(message, user_id)
-            elif self._is_code_related_query(message):
-                response = self._handle_code_query(message, user_id)
+            if cancelled is not None and cancelled.is_set():
+                response = ""
             else:
-                response = self._generate_general_response(message, user_id, context_insights)
+                response = await self._run_stage("generate", CHAT_GENERATE_TIMEOUT, None, stage_ms,
+                                                 self._generate_response, intent, message, user_id,
+                                                 context_insights, capabilities)
+                if response is None:
+                    response = CHAT_FALLBACK_RESPONSE
             
-            # Store response in memory for future context
-            self.enhanced_mama.store_memory(
-                f"Mama Bear response: {response[:100]}...",
-                {
+            pieces = RESPONSE_PIECE_PATTERN.findall(response)
+            delivered = len(pieces)
+            if on_chunk is not None:
+                delivered = 0
+                for piece in pieces:
+                    if cancelled is not None and cancelled.is_set():
+                        break
+                    if delivered == 0:
+                        first_chunk = time.perf_counter() - started
+                        self.latency.record("first_chunk", first_chunk)
+                        stage_ms["first_chunk"] = round(first_chunk * 1000, 2)
+                    on_chunk(piece)
+                    delivered += 1
+                    await asyncio.sleep(0)
+                response = "".join(pieces[:delivered])
+            was_cancelled = cancelled is not None and cancelled.is_set()
+            
+            if response:
+                self._store_memory_in_background(f"Mama Bear response: {response[:100]}...", {
                     "type": "chat_response",
                     "user_id": user_id,
                     "session_id": session_id,
                     "timestamp": datetime.now().isoformat()
-                }
-            )
+                })
+            
+            total = time.perf_counter() - started
+            self.latency.record("total", total)
+            stage_ms["total"] = round(total * 1000, 2)
             
             return {
                 "success": True,
@@ -96,7 +192,15 @@ class MamaBearAgent:
                     "timestamp": datetime.now().isoformat(),
                     "memory_active": bool(self.enhanced_mama.memory),
                     "sandbox_active": bool(self.enhanced_mama.together_client),
-                    "context_insights": len(context_insights.get("relevant_memories", []))
+                    "context_insights": len(context_insights.get("relevant_memories", [])),
+                    "intent": intent,
+                    "stage_ms": stage_ms,
+                    "cancelled": was_cancelled,
+                    "usage": {
+                        "prompt_tokens": len(RESPONSE_PIECE_PATTERN.findall(message)),
+                        "completion_tokens": delivered,
+                        "completion_chars": len(response)
+                    }
                 }
             }
             
@@ -105,9 +209,63 @@ class MamaBearAgent:
             return {
                 "success": False,
                 "error": str(e),
-                "response": "I encountered a technical difficulty while processing your message. Please try again."
+                "response": CHAT_FALLBACK_RESPONSE
             }
     
+    async def _run_stage(self, name: str, timeout: float, default: Any, stage_ms: Dict[str, float],
+                         func, *args) -> Any:
+        """Run a blocking pipeline stage in the executor with a timeout, recording its latency"""
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(func, *args), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Chat stage '{name}' timed out after {timeout}s, continuing without it")
+            result = default
+            timed_out = True
+        
+        elapsed = time.perf_counter() - started
+        self.latency.record(name, elapsed, timed_out)
+        stage_ms[name] = round(elapsed * 1000, 2)
+        return result
+    
+    def _store_memory_in_background(self, content: str, metadata: Dict[str, Any]):
+        """Queue a memory store on the agent's single memory worker, preserving order"""
+        try:
+            self._memory_worker.submit(self.enhanced_mama.store_memory, content, metadata)
+        except RuntimeError as e:
+            logger.error(f"Failed to queue memory store: {e}")
+    
+    def _classify_intent(self, message: str) -> str:
+        """Classify a chat message as an MCP, code or general request"""
+        if self._is_mcp_related_query(message):
+            return "mcp"
+        if self._is_code_related_query(message):
+            return "code"
+        return "general"
+    
+    def _check_chat_capabilities(self) -> Dict[str, Dict[str, Any]]:
+        """Check the capabilities chat responses depend on"""
+        return {name: self.check_capability(name) for name in CHAT_CAPABILITIES}
+    
+    def _generate_response(self, intent: str, message: str, user_id: str, context_insights: Dict,
+                           capabilities: Dict[str, Dict[str, Any]]) -> str:
+        """Generate the response for a classified message"""
+        if intent == "mcp":
+            return self._handle_mcp_query(message, user_id, capabilities)
+        if intent == "code":
+            return self._handle_code_query(message, user_id, capabilities)
+        return self._generate_general_response(message, user_id, context_insights)
+    
+    def get_chat_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get chat pipeline latency percentiles per stage
+        
+        Returns:
+            Dictionary mapping stage names to count, timeouts and p50/p90/p99/max in milliseconds
+        """
+        return self.latency.get_stats()
+    
     def _is_mcp_related_query(self, message: str) -> bool:
         """Check if message relates to MCP server operations"""
         mcp_keywords = ['mcp', 'server', 'marketplace', 'install', 'discover', 'search']
@@ -120,10 +278,13 @@ class MamaBearAgent:
         code_keywords = ['code', 'execute', 'run', 'debug', 'analyze']
         return any(keyword in message.lower() for keyword in code_keywords)
     
-    def _handle_mcp_query(self, message: str, user_id: str) -> str:
+    def _handle_mcp_query(self, message: str, user_id: str,
+                          capabilities: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
         """Handle MCP-related queries with marketplace integration"""
+        capabilities = capabilities or {}
+        
         # Check MCP server management capability
-        mcp_capability = self.check_capability("mcp_server_management")
+        mcp_capability = capabilities.get("mcp_server_management") or self.check_capability("mcp_server_management")
         if not mcp_capability["available"]:
             return "🐻 MCP server management capabilities are currently being prepared. I'll be able to help you discover, install, and manage MCP servers soon!"
         
@@ -168,11 +329,14 @@ We have servers for databases, cloud services, AI tools, development utilities,
     
 
     
-    def _handle_code_query(self, message: str, user_id: str) -> str:
+    def _handle_code_query(self, message: str, user_id: str,
+                           capabilities: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
         """Handle code-related queries with sandbox integration"""
+        capabilities = capabilities or {}
+        
         # Check code execution and analysis capabilities
-        code_exec_capability = self.check_capability("sandbox_execution")
-        code_analysis_capability = self.check_capability("code_analysis")
+        code_exec_capability = capabilities.get("sandbox_execution") or self.check_capability("sandbox_execution")
+        code_analysis_capability = capabilities.get("code_analysis") or self.check_capability("code_analysis")
         
         response = "🧠 **I can help with comprehensive code assistance!**\n\n"
         
@@ -303,14 +467,12 @@ Would you like me to elaborate on any of these capabilities, or shall we dive in
             "timestamp": datetime.now().isoformat()
         }
         
-        # Store in local database
+        # Queue for the background writer's next group commit
         try:
-            with get_db_connection() as conn:
-                conn.execute(
-                    "INSERT INTO agent_learning (interaction_type, context, insight) VALUES (?, ?, ?)",
-                    (interaction_type, json.dumps({"raw_context": context}), insight)
-                )
-                conn.commit()
+            execute_write(
+                "INSERT INTO agent_learning (interaction_type, context, insight) VALUES (?, ?, ?)",
+                (interaction_type, json.dumps({"raw_context": context}), insight)
+            )
         except Exception as e:
             logger.error(f"Failed to store learning data: {e}")
         
@@ -5,19 +5,196 @@ Handles Model Context Protocol server discovery, installation, and management.
 Extracted from monolithic structure for improved maintainability and testing.
 """
 
+import base64
+import binascii
 import json
+import sys
+import threading
+import uuid
 import requests
-from typing import List, Dict, Any, Optional
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence, Set, Tuple
 from contextlib import contextmanager
 from datetime import datetime
 
-from models.mcp_server import MCPServer, MCPCategory
-from models.database import get_db_connection
-from data.mcp_data_loader import load_mcp_servers
+from models.mcp_server import MCPServer, intern_strings
+from models.database import get_db_connection, execute_write, is_fts_enabled
+from data.mcp_data_loader import load_mcp_servers, load_catalog_snapshot, iter_mcp_servers, get_data_file_path
+from data.catalog_snapshot import CatalogSnapshot
+from data.catalog_watcher import CatalogFileWatcher
+from services.catalog_index import CatalogIndex, SortKey, SEARCH_FIELD_WEIGHTS, POPULARITY_BLEND, tokenize
+from services.recommendation_engine import RecommendationEngine
 from utils.logging_setup import get_logger
+from utils.result_cache import VersionedResultCache
 
 logger = get_logger(__name__)
 
+# BM25 weights for the FTS columns: name, description, tags, capabilities
+FTS_COLUMN_WEIGHTS = ", ".join(str(weight) for weight in SEARCH_FIELD_WEIGHTS.values())
+
+def _build_fts_query(query: str) -> Optional[str]:
+    """
+    Convert free-text user input into a safe FTS5 prefix query
+    
+    Args:
+        query: Raw search text
+        
+    Returns:
+        FTS5 MATCH expression, or None if the input has no searchable terms
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+# Database-backed searches stop counting matches here and report an estimate
+SEARCH_TOTAL_COUNT_CAP = 1000
+
+def _encode_cursor(key: SortKey) -> str:
+    """Encode a result sort key as an opaque URL-safe cursor"""
+    payload = json.dumps(list(key), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor: str) -> SortKey:
+    """
+    Decode a cursor produced by _encode_cursor
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        rank, negative_popularity, name = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return (float(rank), int(negative_popularity), str(name))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError("Malformed search cursor") from e
+
+# Servers written per transaction when streaming a catalog import
+CATALOG_IMPORT_BATCH_SIZE = 500
+
+# Rejected-record reports kept in an import summary
+CATALOG_IMPORT_ERROR_LIMIT = 100
+
+# Catalog-owned columns; is_installed and installation_status belong to the user
+# and are only written when a server is first inserted
+CATALOG_COLUMNS = (
+    "name", "description", "repository_url", "category", "author", "version",
+    "installation_method", "capabilities", "dependencies", "configuration_schema",
+    "popularity_score", "last_updated", "is_official", "tags"
+)
+
+CATALOG_UPSERT_SQL = f"""
+    INSERT INTO mcp_servers ({", ".join(CATALOG_COLUMNS)}, is_installed, installation_status, content_hash)
+    VALUES ({", ".join("?" for _ in CATALOG_COLUMNS)}, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        {", ".join(f"{column} = excluded.{column}" for column in CATALOG_COLUMNS[1:])},
+        content_hash = excluded.content_hash,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+def _catalog_row(server: MCPServer) -> Tuple[Any, ...]:
+    """
+    Build upsert parameters for a server, ending with its content hash
+    
+    Args:
+        server: Catalog server definition
+    
+    Returns:
+        Tuple matching CATALOG_UPSERT_SQL placeholders
+    """
+    return server.catalog_values() + (
+        int(bool(server.is_installed)), server.installation_status, server.content_hash()
+    )
+
+# Servers accepted in one bulk install or uninstall request
+SERVER_BATCH_LIMIT = 50
+
+# Seconds to wait for a queued installation-state write to commit
+SERVER_WRITE_TIMEOUT = 10.0
+
+# Seconds after which a server still installing or uninstalling is treated as
+# abandoned at startup; younger transitions may belong to another live worker
+SERVER_TRANSITION_TIMEOUT = 900
+
+# Batch actions: (transitional status, final status, final is_installed)
+SERVER_BATCH_ACTIONS = {
+    "install": ("installing", "installed", 1),
+    "uninstall": ("uninstalling", "not_installed", 0)
+}
+
+# Low-cardinality text columns shared across many catalog records
+INTERNED_COLUMNS = ("category", "author", "version", "installation_method", "installation_status")
+
+# Keys of a server dictionary, in mcp_servers column order
+SERVER_KEYS = (
+    "id", "name", "description", "repository_url", "category", "author", "version",
+    "installation_method", "capabilities", "dependencies", "configuration_schema",
+    "popularity_score", "last_updated", "is_official", "is_installed", "installation_status",
+    "tags", "created_at", "updated_at"
+)
+
+# User-owned columns a snapshot-backed server keeps in memory
+STATE_COLUMNS = ("id", "is_installed", "installation_status", "created_at", "updated_at")
+_STATE_POSITIONS = {column: position for position, column in enumerate(STATE_COLUMNS)}
+
+def _row_to_server_dict(row) -> Dict[str, Any]:
+    """Convert a mcp_servers row into an API dictionary with decoded JSON columns"""
+    server_dict = dict(row)
+    server_dict.pop('content_hash', None)
+    server_dict.update({
+        'capabilities': intern_strings(json.loads(server_dict['capabilities'])),
+        'dependencies': intern_strings(json.loads(server_dict['dependencies'])),
+        'configuration_schema': json.loads(server_dict['configuration_schema']),
+        'tags': intern_strings(json.loads(server_dict['tags']))
+    })
+    for key in INTERNED_COLUMNS:
+        if isinstance(server_dict.get(key), str):
+            server_dict[key] = sys.intern(server_dict[key])
+    return server_dict
+
+class _SnapshotServer(Mapping):
+    """
+    Server dictionary whose catalog fields are read from a snapshot row
+    
+    Only the user-owned STATE_COLUMNS of the mcp_servers row are held in
+    memory; every other field is decoded from the shared mapping when it is
+    read, in the form _row_to_server_dict() returns. Only used for rows
+    whose stored content hash matches the snapshot row.
+    """
+    
+    __slots__ = ("_snapshot", "_position", "_state")
+    
+    def __init__(self, snapshot: CatalogSnapshot, position: int, state: Tuple[Any, ...]):
+        self._snapshot = snapshot
+        self._position = position
+        self._state = state
+    
+    def __getitem__(self, key: str) -> Any:
+        state_position = _STATE_POSITIONS.get(key)
+        if state_position is not None:
+            return self._state[state_position]
+        if key not in SERVER_KEYS:
+            raise KeyError(key)
+        
+        value = self._snapshot.field(self._position, key)
+        if isinstance(value, tuple):
+            return list(value)
+        return int(value) if isinstance(value, bool) else value
+    
+    def __iter__(self):
+        return iter(SERVER_KEYS)
+    
+    def __len__(self) -> int:
+        return len(SERVER_KEYS)
+
+class ServerWriteError(RuntimeError):
+    """Raised when some installation-state writes failed; carries the ones that committed"""
+    
+    def __init__(self, message: str, updated: Dict[str, Dict[str, Any]]):
+        super().__init__(message)
+        self.updated = updated
+
 class MCPMarketplaceManager:
     """
     Professional MCP marketplace operations with clean separation of concerns
@@ -27,54 +204,348 @@ class MCPMarketplaceManager:
     - Installation management
     - Popularity tracking
     - Database synchronization
+    
+    Reads are served from an immutable in-memory CatalogIndex. Writers build
+    a replacement index and swap the reference, so readers never lock.
+    Repeated reads are answered from a result cache that is invalidated
+    whenever the catalog version changes.
     """
     
-    def __init__(self):
-        """Initialize marketplace manager with database connection"""
-        self.marketplace_data = []
+    def __init__(self, cache_size: int = 256, cache_ttl: float = 300.0, install_workers: int = 4):
+        """
+        Initialize marketplace manager with database connection
+        
+        Args:
+            cache_size: Maximum number of cached read results
+            cache_ttl: Maximum age of a cached read result in seconds
+            install_workers: Maximum number of install steps run concurrently
+        """
+        self._catalog_index: Optional[CatalogIndex] = None
+        self._index_lock = threading.Lock()
+        self._result_cache = VersionedResultCache(cache_size, cache_ttl, name="marketplace")
+        self._reload_lock = threading.Lock()
+        self._catalog_watcher: Optional[CatalogFileWatcher] = None
+        self._recommendations: Optional[RecommendationEngine] = None
+        self._recommendations_version = -1
+        self._recommendations_lock = threading.Lock()
+        self._install_pool = ThreadPoolExecutor(max_workers=max(1, install_workers),
+                                                thread_name_prefix="mcp-install")
         self._initialize_marketplace()
         logger.info("MCP Marketplace Manager initialized successfully")
     
     def _initialize_marketplace(self):
-        """Load and synchronize MCP server data"""
+        """
+        Load and synchronize MCP server data
+        
+        Servers left installing or uninstalling for longer than
+        SERVER_TRANSITION_TIMEOUT are moved to ``error``. The index is then
+        built from the database, so the previous catalog is searchable
+        straight away; rows matching a current snapshot are served from the
+        mapping. The snapshot is then reconciled by content hash; without
+        one the JSON catalog is streamed in with import_catalog(). Either
+        way only the changed servers are swapped into the index.
+        """
         try:
-            self.marketplace_data = load_mcp_servers()
-            self._sync_marketplace_to_database()
-            logger.info(f"Loaded {len(self.marketplace_data)} MCP servers from marketplace")
+            self._reset_interrupted_transitions()
+            data_file_path = get_data_file_path()
+            snapshot = load_catalog_snapshot(data_file_path)
+            self._rebuild_catalog_index(snapshot)
+            if snapshot is not None:
+                self._sync_marketplace_to_database(snapshot)
+                return
+            
+            if data_file_path.exists():
+                summary = self.import_catalog(str(data_file_path))
+                if summary["imported"]:
+                    logger.info(f"Loaded {summary['imported']} MCP servers from marketplace")
+                    return
+            
+            # Missing or unusable catalog file: fall back to the built-in servers
+            self._sync_marketplace_to_database(load_mcp_servers())
         except Exception as e:
             logger.error(f"Failed to initialize marketplace: {e}")
-            self.marketplace_data = []
     
-    def _sync_marketplace_to_database(self):
-        """Synchronize marketplace data to database"""
+    def _sync_marketplace_to_database(self, servers: Sequence[MCPServer]) -> int:
+        """
+        Synchronize a loaded catalog to the database
+        
+        Each server's content hash (read from the snapshot when one is
+        loaded) is compared with the hash stored on its row; only new or
+        changed servers are decoded and written. Rows are updated in place,
+        so ids and user-owned installation state survive.
+        
+        Args:
+            servers: Catalog servers, usually a CatalogSnapshot
+        
+        Returns:
+            Number of servers inserted or updated
+        """
+        changed = self._sync_servers(servers)
+        
+        logger.info(f"Catalog sync: {len(changed)} of {len(servers)} servers changed")
+        if changed:
+            self._apply_catalog_changes(changed, [])
+        return len(changed)
+    
+    def _sync_servers(self, servers: Iterable[MCPServer]) -> List[str]:
+        """
+        Upsert the new or changed servers from a batch in one transaction
+        
+        Names and content hashes are compared with the stored rows first;
+        only changed servers are turned into rows. A CatalogSnapshot supplies
+        the hashes recorded at compile time, so unchanged records are never
+        decoded.
+        
+        Args:
+            servers: Catalog servers to reconcile with the database
+            
+        Returns:
+            Names of the servers inserted or updated
+        """
+        if isinstance(servers, CatalogSnapshot):
+            keys = list(servers.iter_hashes())
+        else:
+            servers = list(servers)
+            keys = [(server.name, server.content_hash()) for server in servers]
+        if not keys:
+            return []
+        
         with get_db_connection() as conn:
-            for server in self.marketplace_data:
-                self._upsert_server(conn, server)
+            stored_hashes = {}
+            for start in range(0, len(keys), CATALOG_IMPORT_BATCH_SIZE):
+                names = [name for name, _ in keys[start:start + CATALOG_IMPORT_BATCH_SIZE]]
+                placeholders = ", ".join("?" for _ in names)
+                stored_hashes.update(conn.execute(
+                    f"SELECT name, content_hash FROM mcp_servers WHERE name IN ({placeholders})", names
+                ).fetchall())
+            
+            changed = [position for position, (name, content_hash) in enumerate(keys)
+                       if stored_hashes.get(name) != content_hash]
+            if changed:
+                conn.executemany(CATALOG_UPSERT_SQL, (_catalog_row(servers[position]) for position in changed))
             conn.commit()
+        
+        return [keys[position][0] for position in changed]
     
-    def _upsert_server(self, conn, server: MCPServer):
-        """Insert or update server record in database"""
-        conn.execute('''
-            INSERT OR REPLACE INTO mcp_servers 
-            (name, description, repository_url, category, author, version, 
-             installation_method, capabilities, dependencies, configuration_schema,
-             popularity_score, last_updated, is_official, is_installed, 
-             installation_status, tags)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            server.name, server.description, server.repository_url,
-            server.category.value, server.author, server.version,
-            server.installation_method, json.dumps(server.capabilities),
-            json.dumps(server.dependencies), json.dumps(server.configuration_schema),
-            server.popularity_score, server.last_updated, server.is_official,
-            server.is_installed, server.installation_status, json.dumps(server.tags)
-        ))
+    def reload_catalog(self) -> Dict[str, Any]:
+        """
+        Re-read the catalog file and apply only what changed
+        
+        The file is streamed in with import_catalog(): changed servers are
+        upserted batch by batch, servers missing from the file are deleted
+        unless installed, and the index is updated once at the end. A malformed or
+        empty file never deletes anything; batches read before a parse
+        error stay applied.
+        
+        Returns:
+            Import summary with imported, changed, removed and rejected counts
+        """
+        summary = self.import_catalog(prune=True)
+        if summary["success"] and not summary["imported"]:
+            logger.error("Catalog reload aborted: no valid servers in catalog file")
+            summary.update(success=False, error="No valid servers in catalog file")
+        
+        summary["total"] = summary["imported"]
+        return summary
+    
+    def _delete_uninstalled_servers(self, names: List[str]) -> List[str]:
+        """Delete catalog servers that are not installed; returns the deleted names"""
+        deleted: List[str] = []
+        if not names:
+            return deleted
+        
+        with get_db_connection() as conn:
+            for start in range(0, len(names), CATALOG_IMPORT_BATCH_SIZE):
+                chunk = names[start:start + CATALOG_IMPORT_BATCH_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                deleted.extend(row[0] for row in conn.execute(
+                    f"DELETE FROM mcp_servers WHERE is_installed = 0 AND name IN ({placeholders}) RETURNING name",
+                    chunk
+                ).fetchall())
+            conn.commit()
+        return deleted
+    
+    def _apply_catalog_changes(self, changed: List[str], removed: List[str]):
+        """Swap in a catalog index with changed servers re-read and removed ones dropped"""
+        records = self._read_servers(changed)
+        with self._index_lock:
+            if self._catalog_index is not None:
+                self._catalog_index = self._catalog_index.with_changes(records, removed)
+        
+        if self._catalog_index is None:
+            self._rebuild_catalog_index()
+        else:
+            self._bump_catalog_version()
+    
+    def _read_servers(self, names: List[str]) -> List[Dict[str, Any]]:
+        """Read and decode the named servers from the database"""
+        records = []
+        with get_db_connection() as conn:
+            for start in range(0, len(names), CATALOG_IMPORT_BATCH_SIZE):
+                chunk = names[start:start + CATALOG_IMPORT_BATCH_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor = conn.execute(f"SELECT * FROM mcp_servers WHERE name IN ({placeholders})", chunk)
+                records.extend(_row_to_server_dict(row) for row in cursor.fetchall())
+        return records
+    
+    def start_catalog_watcher(self, poll_interval: float = 2.0) -> CatalogFileWatcher:
+        """
+        Reload the catalog automatically when its JSON file changes
+        
+        Args:
+            poll_interval: Seconds between checks when inotify is unavailable
+            
+        Returns:
+            The running CatalogFileWatcher
+        """
+        if self._catalog_watcher is None:
+            self._catalog_watcher = CatalogFileWatcher(
+                get_data_file_path, lambda path: self.reload_catalog(), poll_interval=poll_interval
+            )
+        self._catalog_watcher.start()
+        return self._catalog_watcher
+    
+    def stop_catalog_watcher(self):
+        """Stop watching the catalog file"""
+        if self._catalog_watcher is not None:
+            self._catalog_watcher.stop()
+    
+    def import_catalog(self, source_path: Optional[str] = None,
+                       batch_size: int = CATALOG_IMPORT_BATCH_SIZE, prune: bool = False) -> Dict[str, Any]:
+        """
+        Stream a JSON catalog into the marketplace in bounded batches
+        
+        The file is parsed incrementally and written batch by batch, so
+        memory use stays flat for very large registries. The servers written
+        are swapped into the search index together once the import ends, even
+        a failed one, so the index is rebuilt at most once per import.
+        Imports and reloads run one at a time.
+        
+        Args:
+            source_path: JSON catalog to import (defaults to the data file)
+            batch_size: Servers written per transaction
+            prune: Delete servers missing from the file unless installed;
+                skipped when the import fails or imports nothing
+            
+        Returns:
+            Import summary with imported, changed, removed and rejected
+            counts and the first rejected-record reports
+        """
+        summary = {"imported": 0, "changed": 0, "removed": 0, "rejected": 0, "errors": []}
+        seen_names: Set[str] = set()
+        changed_names: List[str] = []
+        removed: List[str] = []
+        batch: List[MCPServer] = []
+        
+        def record_error(report: Dict[str, Any]):
+            summary["rejected"] += 1
+            if len(summary["errors"]) < CATALOG_IMPORT_ERROR_LIMIT:
+                summary["errors"].append(report)
+        
+        def flush_batch():
+            changed = self._sync_servers(batch)
+            changed_names.extend(changed)
+            summary["changed"] += len(changed)
+            summary["imported"] += len(batch)
+            if prune:
+                seen_names.update(server.name for server in batch)
+            batch.clear()
+        
+        with self._reload_lock:
+            try:
+                for server in iter_mcp_servers(source_path, on_error=record_error):
+                    batch.append(server)
+                    if len(batch) >= batch_size:
+                        flush_batch()
+                if batch:
+                    flush_batch()
+                summary["success"] = True
+                
+            except Exception as e:
+                logger.error(f"Catalog import failed after {summary['imported']} servers: {e}")
+                summary["success"] = False
+                summary["error"] = str(e)
+            
+            if prune and summary["success"] and summary["imported"]:
+                removed = self._delete_uninstalled_servers(self._stale_server_names(seen_names))
+                summary["removed"] = len(removed)
+            
+            if changed_names or removed:
+                self._apply_catalog_changes(changed_names, removed)
+        
+        logger.info(f"Catalog import: {summary['imported']} servers imported, {summary['changed']} changed, "
+                    f"{summary['removed']} removed, {summary['rejected']} rejected")
+        return summary
+    
+    def _stale_server_names(self, current_names: Set[str]) -> List[str]:
+        """Names of uninstalled servers in the database that are not in ``current_names``"""
+        with get_db_connection() as conn:
+            cursor = conn.execute("SELECT name FROM mcp_servers WHERE is_installed = 0")
+            return [row[0] for row in cursor if row[0] not in current_names]
+    
+    def _rebuild_catalog_index(self, snapshot: Optional[CatalogSnapshot] = None):
+        """
+        Rebuild the in-memory catalog index from the database and swap it in
+        
+        Rows whose content hash matches a snapshot row are indexed as views
+        over the memory-mapped snapshot, so a worker keeps only their
+        installation state in memory; other rows are decoded in full.
+        
+        Args:
+            snapshot: Current catalog snapshot, if one is loaded
+        """
+        with self._index_lock:
+            if snapshot is None:
+                with get_db_connection() as conn:
+                    cursor = conn.execute("SELECT * FROM mcp_servers")
+                    records = [_row_to_server_dict(row) for row in cursor.fetchall()]
+            else:
+                snapshot_rows = {name: (position, content_hash)
+                                 for position, (name, content_hash) in enumerate(snapshot.iter_hashes())}
+                records = []
+                decode: List[str] = []
+                with get_db_connection() as conn:
+                    cursor = conn.execute(f"SELECT name, content_hash, {', '.join(STATE_COLUMNS)} FROM mcp_servers")
+                    for row in cursor:
+                        position, content_hash = snapshot_rows.get(row['name'], (None, None))
+                        if content_hash is None or content_hash != row['content_hash']:
+                            decode.append(row['name'])
+                            continue
+                        state = tuple(sys.intern(row[column]) if column in INTERNED_COLUMNS else row[column]
+                                      for column in STATE_COLUMNS)
+                        records.append(_SnapshotServer(snapshot, position, state))
+                records.extend(self._read_servers(decode))
+            
+            self._catalog_index = CatalogIndex(records)
+        self._bump_catalog_version()
+        
+        logger.debug(f"Catalog index rebuilt with {len(records)} servers")
+    
+    def _swap_catalog_records(self, servers: List[Dict[str, Any]]):
+        """Swap in a catalog index containing the updated server records"""
+        with self._index_lock:
+            if self._catalog_index is not None:
+                self._catalog_index = self._catalog_index.with_changes(servers)
+        self._bump_catalog_version()
+    
+    def _bump_catalog_version(self):
+        """Record a catalog change so cached read results are discarded"""
+        self._result_cache.bump_version()
+    
+    @property
+    def catalog_version(self) -> int:
+        """Version counter incremented on every catalog change"""
+        return self._result_cache.version
     
     def search_servers(self, query: str = "", category: Optional[str] = None, 
                       official_only: bool = False) -> List[Dict[str, Any]]:
         """
         Search MCP servers with comprehensive filtering options
         
+        Served from the in-memory catalog index when available. Each term is
+        matched as a prefix, relevance is blended with popularity, and
+        matching servers carry a highlighted description ``snippet``.
+        
         Args:
             query: Search term for name, description, or tags
             category: Filter by server category
@@ -83,44 +554,172 @@ class MCPMarketplaceManager:
         Returns:
             List of server dictionaries matching search criteria
         """
+        query = query.strip().lower()
+        return self._result_cache.get_or_compute(
+            ("search", query, category, official_only),
+            lambda: self._search_uncached(query, category, official_only)
+        )
+    
+    def _search_uncached(self, query: str, category: Optional[str],
+                         official_only: bool) -> List[Dict[str, Any]]:
+        """Run a full search against the catalog index or database"""
+        index = self._catalog_index
+        if index is not None:
+            return index.search(query, category=category, official_only=official_only)
+        
+        return self._search_database(query, category, official_only)
+    
+    def search_servers_page(self, query: str = "", category: Optional[str] = None,
+                            official_only: bool = False, limit: int = 20,
+                            cursor: Optional[str] = None, include_total: bool = True) -> Dict[str, Any]:
+        """
+        Search MCP servers one page at a time
+        
+        Pages are addressed by keyset on the result order (relevance for text
+        queries, then popularity descending and name ascending), so each page
+        costs the same regardless of how deep the caller has scrolled.
+        
+        Args:
+            query: Search term for name, description, or tags
+            category: Filter by server category
+            official_only: Limit results to official servers only
+            limit: Maximum number of servers in the page
+            cursor: ``next_cursor`` value from the previous page
+            include_total: Whether to count all matches
+            
+        Returns:
+            Dictionary with servers, next_cursor, total and total_is_estimate
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = _decode_cursor(cursor) if cursor else None
+        query = query.strip().lower()
+        
+        return self._result_cache.get_or_compute(
+            ("page", query, category, official_only, limit, after, include_total),
+            lambda: self._search_page_uncached(query, category, official_only, limit, after, include_total)
+        )
+    
+    def _search_page_uncached(self, query: str, category: Optional[str], official_only: bool,
+                              limit: int, after: Optional[SortKey], include_total: bool) -> Dict[str, Any]:
+        """Fetch one search page from the catalog index or database"""
+        index = self._catalog_index
+        if index is not None:
+            servers, total, next_key = index.search_page(
+                query, category=category, official_only=official_only, limit=limit, after=after
+            )
+            total_is_estimate = False
+        else:
+            servers, next_key, total, total_is_estimate = self._search_database_page(
+                query, category, official_only, limit, after, include_total
+            )
+        
+        return {
+            "servers": servers,
+            "next_cursor": _encode_cursor(next_key) if next_key else None,
+            "total": total if include_total else None,
+            "total_is_estimate": total_is_estimate
+        }
+    
+    def _search_database(self, query: str, category: Optional[str],
+                         official_only: bool) -> List[Dict[str, Any]]:
+        """Search the database directly, returning every match"""
+        servers, _, _, _ = self._search_database_page(query, category, official_only, None, None, False)
+        return servers
+    
+    def _build_search_sql(self, query: str, category: Optional[str],
+                          official_only: bool) -> Tuple[str, List[Any]]:
+        """
+        Build the filtered search SELECT shared by page and count queries
+        
+        Every row carries a ``search_rank`` column (lower is better); text
+        queries use the FTS5 index when available.
+        """
+        fts_query = _build_fts_query(query) if query and is_fts_enabled() else None
+        params: List[Any] = []
+        
+        if fts_query:
+            sql = f"""
+                SELECT s.*, snippet(mcp_servers_fts, 1, '<mark>', '</mark>', '…', 16) AS snippet,
+                       bm25(mcp_servers_fts, {FTS_COLUMN_WEIGHTS}) - ? * s.popularity_score AS search_rank
+                FROM mcp_servers_fts
+                JOIN mcp_servers s ON s.id = mcp_servers_fts.rowid
+                WHERE mcp_servers_fts MATCH ?
+            """
+            params.extend([POPULARITY_BLEND, fts_query])
+        else:
+            sql = "SELECT s.*, 0.0 AS search_rank FROM mcp_servers s WHERE 1=1"
+            if query:
+                sql += " AND (s.name LIKE ? OR s.description LIKE ? OR s.tags LIKE ?)"
+                search_term = f"%{query}%"
+                params.extend([search_term, search_term, search_term])
+        
+        if category:
+            sql += " AND s.category = ?"
+            params.append(category)
+        
+        if official_only:
+            sql += " AND s.is_official = 1"
+        
+        return sql, params
+    
+    def _search_database_page(self, query: str, category: Optional[str], official_only: bool,
+                              limit: Optional[int], after: Optional[SortKey],
+                              include_total: bool) -> Tuple[List[Dict[str, Any]], Optional[SortKey], Optional[int], bool]:
+        """
+        Search the database directly with LIMIT and keyset pushed into SQL
+        
+        Returns:
+            Tuple of (servers, sort key to resume after, total, whether the
+            total is a capped estimate)
+        """
         try:
             with get_db_connection() as conn:
-                sql = "SELECT * FROM mcp_servers WHERE 1=1"
-                params = []
-                
-                if query:
-                    sql += " AND (name LIKE ? OR description LIKE ? OR tags LIKE ?)"
-                    search_term = f"%{query}%"
-                    params.extend([search_term, search_term, search_term])
-                
-                if category:
-                    sql += " AND category = ?"
-                    params.append(category)
+                search_sql, params = self._build_search_sql(query, category, official_only)
                 
-                if official_only:
-                    sql += " AND is_official = 1"
+                sql = f"SELECT * FROM ({search_sql}) AS results"
+                page_params = list(params)
+                if after is not None:
+                    sql += " WHERE (search_rank, -popularity_score, name) > (?, ?, ?)"
+                    page_params.extend(after)
+                sql += " ORDER BY search_rank, popularity_score DESC, name"
+                if limit is not None:
+                    sql += " LIMIT ?"
+                    page_params.append(limit + 1)
                 
-                sql += " ORDER BY popularity_score DESC, name ASC"
+                rows = conn.execute(sql, page_params).fetchall()
                 
-                cursor = conn.execute(sql, params)
-                servers = []
-                
-                for row in cursor.fetchall():
-                    server_dict = dict(row)
-                    server_dict.update({
-                        'capabilities': json.loads(server_dict['capabilities']),
-                        'dependencies': json.loads(server_dict['dependencies']),
-                        'configuration_schema': json.loads(server_dict['configuration_schema']),
-                        'tags': json.loads(server_dict['tags'])
-                    })
-                    servers.append(server_dict)
-                
-                logger.info(f"Found {len(servers)} servers for query: '{query}'")
-                return servers
+                total = None
+                total_is_estimate = False
+                if include_total:
+                    total = conn.execute(
+                        f"SELECT COUNT(*) FROM ({search_sql} LIMIT ?)",
+                        params + [SEARCH_TOTAL_COUNT_CAP + 1]
+                    ).fetchone()[0]
+                    if total > SEARCH_TOTAL_COUNT_CAP:
+                        total, total_is_estimate = SEARCH_TOTAL_COUNT_CAP, True
+            
+            has_more = limit is not None and len(rows) > limit
+            rows = rows[:limit] if limit is not None else rows
+            
+            servers = []
+            for row in rows:
+                server = _row_to_server_dict(row)
+                server.pop('search_rank', None)
+                servers.append(server)
+            
+            next_key = None
+            if has_more:
+                last = rows[-1]
+                next_key = (last['search_rank'], -last['popularity_score'], last['name'])
+            
+            logger.info(f"Found {len(servers)} servers for query: '{query}'")
+            return servers, next_key, total, total_is_estimate
                 
         except Exception as e:
             logger.error(f"Search failed: {e}")
-            return []
+            return [], None, 0, False
     
     def get_trending_servers(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -132,50 +731,121 @@ class MCPMarketplaceManager:
         Returns:
             List of trending server dictionaries
         """
-        return self.search_servers()[:limit]
+        return self._result_cache.get_or_compute(("trending", limit), lambda: self._trending_uncached(limit))
+    
+    def _trending_uncached(self, limit: int) -> List[Dict[str, Any]]:
+        """Compute trending servers from the catalog index or database"""
+        index = self._catalog_index
+        if index is not None:
+            return index.top(limit)
+        
+        return self._search_database_page("", None, False, limit, None, False)[0]
     
     def get_server_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve specific server by name
         
+        Matching is exact apart from letter case; served from the catalog
+        index when available, otherwise from the name indexes in SQLite.
+        
         Args:
-            name: Server name to search for
+            name: Server name to look up
             
         Returns:
             Server dictionary if found, None otherwise
         """
-        servers = self.search_servers(query=name)
-        return servers[0] if servers else None
+        index = self._catalog_index
+        if index is not None:
+            return index.get(name)
+        
+        try:
+            with get_db_connection() as conn:
+                row = conn.execute("SELECT * FROM mcp_servers WHERE name = ?", (name,)).fetchone()
+                if row is None:
+                    row = conn.execute(
+                        "SELECT * FROM mcp_servers WHERE name = ? COLLATE NOCASE LIMIT 1", (name,)
+                    ).fetchone()
+            return _row_to_server_dict(row) if row is not None else None
+        
+        except Exception as e:
+            logger.error(f"Server lookup failed for '{name}': {e}")
+            return None
     
     def get_recommendations_for_project(self, project_type: str) -> List[Dict[str, Any]]:
         """
         Generate server recommendations based on project requirements
         
+        Lists are precomputed per catalog version, ranked by similarity to the
+        project profile, popularity and affinity with installed servers.
+        
         Args:
             project_type: Type of project (web_development, data_science, etc.)
             
         Returns:
             List of recommended server dictionaries
         """
-        category_mapping = {
-            "web_development": [MCPCategory.WEB_APIS, MCPCategory.DATABASE],
-            "data_science": [MCPCategory.AI_ML, MCPCategory.DATABASE],
-            "devops": [MCPCategory.CLOUD_SERVICES, MCPCategory.DEVELOPMENT_TOOLS],
-            "content_management": [MCPCategory.CONTENT_MANAGEMENT, MCPCategory.PRODUCTIVITY]
-        }
+        return self._recommendation_engine().for_project(project_type)
+    
+    def get_recommendations_for_capability(self, capability: str) -> List[Dict[str, Any]]:
+        """
+        Recommend servers that provide a capability or tag
         
-        categories = category_mapping.get(project_type, [MCPCategory.DEVELOPMENT_TOOLS])
-        recommendations = []
+        Args:
+            capability: Capability or tag name (case-insensitive)
+            
+        Returns:
+            List of recommended server dictionaries
+        """
+        return self._recommendation_engine().for_capability(capability)
+    
+    def get_similar_servers(self, server_name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find servers similar to a given server by category, tags and capabilities
         
-        for category in categories:
-            servers = self.search_servers(category=category.value)
-            recommendations.extend(servers[:3])
+        Args:
+            server_name: Server to compare against
+            limit: Maximum number of servers to return
+            
+        Returns:
+            List of similar server dictionaries
+        """
+        server = self.get_server_by_name(server_name)
+        if server is None:
+            return []
         
-        return recommendations[:10]
+        return self._result_cache.get_or_compute(
+            ("similar", server["name"], limit),
+            lambda: self._recommendation_engine().similar_to(server["name"], limit)
+        )
+    
+    def _recommendation_engine(self) -> RecommendationEngine:
+        """Return the recommendation engine for the current catalog version, building it if stale"""
+        engine = self._recommendations
+        if engine is not None and self._recommendations_version == self.catalog_version:
+            return engine
+        
+        with self._recommendations_lock:
+            version = self.catalog_version
+            if self._recommendations is None or self._recommendations_version != version:
+                index = self._catalog_index
+                if index is not None:
+                    records = index.records()
+                else:
+                    with get_db_connection() as conn:
+                        records = [_row_to_server_dict(row) for row in conn.execute("SELECT * FROM mcp_servers")]
+                
+                self._recommendations = RecommendationEngine(records)
+                self._recommendations_version = version
+                logger.debug(f"Recommendation engine rebuilt at catalog version {version}")
+            return self._recommendations
     
     def install_server(self, server_name: str) -> Dict[str, Any]:
         """
-        Install MCP server (placeholder for actual installation logic)
+        Install one MCP server
+        
+        Runs as a single-server batch, so it claims the server as
+        ``installing`` and is refused while another install or uninstall of
+        the same server is in progress.
         
         Args:
             server_name: Name of server to install
@@ -183,29 +853,309 @@ class MCPMarketplaceManager:
         Returns:
             Installation result dictionary
         """
-        server = self.get_server_by_name(server_name)
-        if not server:
-            return {"success": False, "error": f"Server '{server_name}' not found"}
-        
         try:
-            # Update installation status in database
-            with get_db_connection() as conn:
-                conn.execute(
-                    "UPDATE mcp_servers SET is_installed = 1, installation_status = 'installed' WHERE name = ?",
-                    (server_name,)
-                )
-                conn.commit()
-            
-            logger.info(f"Server '{server_name}' marked as installed")
-            return {
-                "success": True,
-                "message": f"Server '{server_name}' installed successfully",
-                "server": server
-            }
-            
+            result = self._run_server_batch("install", [server_name], None)["results"][0]
         except Exception as e:
             logger.error(f"Installation failed for '{server_name}': {e}")
             return {"success": False, "error": str(e)}
+        
+        if result["status"] == "error":
+            return {"success": False, "error": result["error"]}
+        
+        server_name = result["name"]
+        logger.info(f"Server '{server_name}' marked as installed")
+        return {
+            "success": True,
+            "message": result.get("message", f"Server '{server_name}' installed successfully"),
+            "server": result.get("server") or self.get_server_by_name(server_name)
+        }
+    
+    def install_servers(self, server_names: List[str],
+                        progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Install several MCP servers as one batch
+        
+        Names are resolved in a single query and claimed as ``installing``
+        through the database writer; install steps then run concurrently on
+        the bounded install pool, and every outcome is written as
+        ``installed`` or ``error``. Servers whose batch is interrupted are
+        moved to ``error`` rather than left ``installing``.
+        
+        Args:
+            server_names: Names of servers to install (matched ignoring case)
+            progress: Optional callback receiving a progress event dictionary
+                for each status transition
+            
+        Returns:
+            Batch summary with per-server results
+        """
+        return self._run_server_batch("install", server_names, progress)
+    
+    def uninstall_servers(self, server_names: List[str],
+                          progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Uninstall several MCP servers as one batch
+        
+        Follows the same batched transitions as install_servers, through
+        ``uninstalling`` to ``not_installed`` or ``error``.
+        
+        Args:
+            server_names: Names of servers to uninstall (matched ignoring case)
+            progress: Optional callback receiving progress event dictionaries
+            
+        Returns:
+            Batch summary with per-server results
+        """
+        return self._run_server_batch("uninstall", server_names, progress)
+    
+    def _run_server_batch(self, action: str, server_names: List[str],
+                          progress: Optional[Callable[[Dict[str, Any]], None]]) -> Dict[str, Any]:
+        """Resolve, claim, process and finalise one install or uninstall batch"""
+        transitional_status, final_status, final_installed = SERVER_BATCH_ACTIONS[action]
+        batch_id = uuid.uuid4().hex
+        requested = list(dict.fromkeys(server_names))
+        results: Dict[str, Dict[str, Any]] = {}
+        resolved = self._resolve_server_names(requested)
+        total = len({resolved[name.casefold()]['name'] if name.casefold() in resolved else name
+                     for name in requested})
+        
+        def report(name: str, status: str, **details: Any):
+            results[name] = {"name": name, "status": status, **details}
+            if progress is None:
+                return
+            event = {
+                "batch_id": batch_id,
+                "action": action,
+                "completed": sum(1 for result in results.values() if result["status"] != transitional_status),
+                "total": total,
+                **results[name]
+            }
+            try:
+                progress(event)
+            except Exception as e:
+                logger.warning(f"Batch {action} progress callback failed: {e}")
+        
+        result_names: List[str] = []
+        targets: List[str] = []
+        for name in requested:
+            server = resolved.get(name.casefold())
+            if server is None:
+                report(name, "error", error=f"Server '{name}' not found")
+                result_names.append(name)
+                continue
+            
+            name = server['name']
+            if name in result_names:
+                continue
+            result_names.append(name)
+            if bool(server.get('is_installed')) == bool(final_installed) and server.get('installation_status') == final_status:
+                state = "already installed" if final_installed else "not installed"
+                report(name, final_status, message=f"Server '{name}' is {state}")
+            else:
+                targets.append(name)
+        
+        claimed: Dict[str, Dict[str, Any]] = {}
+        outcomes: Dict[str, Optional[str]] = {}
+        finished: Dict[str, Dict[str, Any]] = {}
+        try:
+            try:
+                claimed = self._claim_servers(targets, transitional_status)
+            except ServerWriteError as e:
+                claimed = e.updated
+                raise
+            for name in targets:
+                if name in claimed:
+                    report(name, transitional_status)
+                else:
+                    report(name, "error", error=f"Server '{name}' is already being processed")
+            
+            if claimed:
+                step = self._run_install_step if action == "install" else self._run_uninstall_step
+                futures = {self._install_pool.submit(step, server): name for name, server in claimed.items()}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        future.result()
+                        outcomes[name] = None
+                        report(name, final_status)
+                    except Exception as e:
+                        logger.error(f"{action.capitalize()} step failed for '{name}': {e}")
+                        outcomes[name] = str(e)
+                        report(name, "error", error=str(e))
+                
+                try:
+                    finished = self._finish_servers(outcomes, final_status, final_installed)
+                except ServerWriteError as e:
+                    finished = e.updated
+                    raise
+                for name, server in finished.items():
+                    results[name]["server"] = server
+        finally:
+            # Never leave a claimed server in its transitional status
+            unfinished = [name for name in claimed if name not in finished]
+            if unfinished:
+                self._release_claims(unfinished, transitional_status)
+        
+        ordered = [results[name] for name in result_names]
+        failed = sum(1 for result in ordered if result["status"] == "error")
+        logger.info(f"Batch {action} {batch_id}: {len(ordered) - failed} succeeded, {failed} failed")
+        return {
+            "success": failed == 0,
+            "batch_id": batch_id,
+            "action": action,
+            "results": ordered,
+            "succeeded": len(ordered) - failed,
+            "failed": failed
+        }
+    
+    def _resolve_server_names(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up servers by case-folded name in one query, preferring exact spellings"""
+        if not names:
+            return {}
+        
+        placeholders = ", ".join("?" for _ in names)
+        with get_db_connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM mcp_servers WHERE name COLLATE NOCASE IN ({placeholders})", names
+            ).fetchall()
+        
+        exact = set(names)
+        resolved: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            server = _row_to_server_dict(row)
+            key = server['name'].casefold()
+            if key not in resolved or server['name'] in exact:
+                resolved[key] = server
+        return resolved
+    
+    def _claim_servers(self, names: List[str], status: str) -> Dict[str, Dict[str, Any]]:
+        """Move servers not already in a transition to ``status``; returns the claimed servers"""
+        busy = tuple(transition for transition, _, _ in SERVER_BATCH_ACTIONS.values())
+        return self._write_server_updates([
+            ("UPDATE mcp_servers SET installation_status = ?, updated_at = CURRENT_TIMESTAMP "
+             "WHERE name = ? AND installation_status NOT IN (?, ?) RETURNING *",
+             (status, name, *busy))
+            for name in names
+        ])
+    
+    def _finish_servers(self, outcomes: Dict[str, Optional[str]], final_status: str,
+                        final_installed: int) -> Dict[str, Dict[str, Any]]:
+        """Record every batch outcome; failed servers move to ``error``"""
+        return self._write_server_updates([
+            ("UPDATE mcp_servers SET is_installed = ?, installation_status = ?, "
+             "updated_at = CURRENT_TIMESTAMP WHERE name = ? RETURNING *",
+             (final_installed, final_status, name))
+            if error is None else
+            ("UPDATE mcp_servers SET installation_status = 'error', "
+             "updated_at = CURRENT_TIMESTAMP WHERE name = ? RETURNING *",
+             (name,))
+            for name, error in outcomes.items()
+        ])
+    
+    def _release_claims(self, names: List[str], status: str):
+        """Move servers still in the transitional ``status`` to ``error`` after an interrupted batch"""
+        try:
+            released = self._write_server_updates([
+                ("UPDATE mcp_servers SET installation_status = 'error', updated_at = CURRENT_TIMESTAMP "
+                 "WHERE name = ? AND installation_status = ? RETURNING *",
+                 (name, status))
+                for name in names
+            ])
+            if released:
+                logger.warning(f"Released {len(released)} servers left {status}: {', '.join(released)}")
+        except Exception as e:
+            logger.error(f"Failed to release {status} servers {', '.join(names)}: {e}")
+    
+    def _reset_interrupted_transitions(self) -> int:
+        """
+        Move servers left installing or uninstalling by a previous process to ``error``
+        
+        Every worker runs this at startup, so only transitions older than
+        SERVER_TRANSITION_TIMEOUT are reset; newer ones may be in progress
+        in another worker.
+        
+        Returns:
+            Number of servers reset
+        """
+        busy = tuple(transition for transition, _, _ in SERVER_BATCH_ACTIONS.values())
+        cutoff = f"-{SERVER_TRANSITION_TIMEOUT} seconds"
+        with get_db_connection() as conn:
+            names = [row[0] for row in conn.execute(
+                "SELECT name FROM mcp_servers WHERE installation_status IN (?, ?) "
+                "AND updated_at < datetime('now', ?)", (*busy, cutoff)
+            ).fetchall()]
+        
+        reset = self._write_server_updates([
+            ("UPDATE mcp_servers SET installation_status = 'error', updated_at = CURRENT_TIMESTAMP "
+             "WHERE name = ? AND installation_status IN (?, ?) AND updated_at < datetime('now', ?) RETURNING *",
+             (name, *busy, cutoff))
+            for name in names
+        ])
+        if reset:
+            logger.warning(f"Reset {len(reset)} servers left in an install or uninstall transition: "
+                           f"{', '.join(reset)}")
+        return len(reset)
+    
+    def _write_server_updates(self, statements: List[Tuple[str, Tuple[Any, ...]]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Queue ``UPDATE ... RETURNING *`` statements on the database writer
+        
+        The writer applies statements queued together in one group commit,
+        each isolated in its own savepoint. Every outcome is collected before
+        any failure is raised, so committed updates always reach the index.
+        
+        Args:
+            statements: (query, params) pairs, each updating at most one server
+            
+        Returns:
+            Updated servers keyed by name, also swapped into the catalog index
+            
+        Raises:
+            ServerWriteError: If any write failed or did not commit within
+                SERVER_WRITE_TIMEOUT; its ``updated`` holds the committed ones
+        """
+        futures = [execute_write(query, params, fetch_one=True) for query, params in statements]
+        done, pending = wait(futures, timeout=SERVER_WRITE_TIMEOUT)
+        updated: Dict[str, Dict[str, Any]] = {}
+        errors: List[str] = []
+        for future in futures:
+            if future not in done:
+                continue
+            try:
+                row = future.result()
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            if row is not None:
+                server = _row_to_server_dict(row)
+                updated[server['name']] = server
+        
+        if updated:
+            self._swap_catalog_records(list(updated.values()))
+        if pending:
+            errors.append(f"{len(pending)} did not commit within {SERVER_WRITE_TIMEOUT}s")
+        if errors:
+            raise ServerWriteError(f"Server updates failed: {'; '.join(errors[:3])}", updated)
+        return updated
+    
+    def _run_install_step(self, server: Dict[str, Any]) -> str:
+        """
+        Perform the installation work for one server
+        
+        Placeholder for the package manager invocation, as in install_server:
+        resolves the installation command and raises if it cannot be built.
+        
+        Args:
+            server: Server dictionary claimed for installation
+            
+        Returns:
+            Installation command for the server
+        """
+        return MCPServer.from_dict(server).get_installation_command()
+    
+    def _run_uninstall_step(self, server: Dict[str, Any]) -> None:
+        """Perform the removal work for one server (placeholder, nothing to remove yet)"""
+        return None
     
     def get_installed_servers(self) -> List[Dict[str, Any]]:
         """
@@ -214,30 +1164,39 @@ class MCPMarketplaceManager:
         Returns:
             List of installed server dictionaries
         """
+        index = self._catalog_index
+        if index is not None:
+            return index.installed()
+        
         with get_db_connection() as conn:
             cursor = conn.execute("SELECT * FROM mcp_servers WHERE is_installed = 1")
-            servers = []
-            
-            for row in cursor.fetchall():
-                server_dict = dict(row)
-                server_dict.update({
-                    'capabilities': json.loads(server_dict['capabilities']),
-                    'dependencies': json.loads(server_dict['dependencies']),
-                    'configuration_schema': json.loads(server_dict['configuration_schema']),
-                    'tags': json.loads(server_dict['tags'])
-                })
-                servers.append(server_dict)
-            
-            return servers
+            return [_row_to_server_dict(row) for row in cursor.fetchall()]
     
-    def get_categories(self) -> List[Dict[str, str]]:
+    def get_catalog_facets(self) -> Dict[str, Any]:
+        """
+        Get precomputed catalog facet counts
+        
+        Returns:
+            Dictionary with total, per-category, official and installed counts
+        """
+        index = self._catalog_index
+        if index is None:
+            return {"total": 0, "categories": {}, "official": 0, "community": 0, "installed": 0}
+        return index.facets
+    
+    def get_categories(self) -> List[Dict[str, Any]]:
         """
         Get available MCP server categories
         
         Returns:
-            List of category dictionaries with id, name, and description
+            List of category dictionaries with id, name, description and server count
         """
-        return [
+        return self._result_cache.get_or_compute(("categories",), self._categories_uncached)
+    
+    def _categories_uncached(self) -> List[Dict[str, Any]]:
+        """Build the category list with current server counts"""
+        category_counts = self.get_catalog_facets()["categories"]
+        categories = [
             {"id": "database", "name": "Database", "description": "Database operations and management"},
             {"id": "cloud_services", "name": "Cloud Services", "description": "AWS, GCP, Azure integrations"},
             {"id": "development_tools", "name": "Development Tools", "description": "GitHub, GitLab, CI/CD tools"},
@@ -246,4 +1205,28 @@ class MCPMarketplaceManager:
             {"id": "productivity", "name": "Productivity", "description": "Notion, calendar, task management"},
             {"id": "search_data", "name": "Search & Data", "description": "Web search, data processing"},
             {"id": "security", "name": "Security", "description": "Security scanning and monitoring"},
-        ]
\ No newline at end of file
+        ]
+        
+        for category in categories:
+            category["server_count"] = category_counts.get(category["id"], 0)
+        
+        return categories
+    
+    def get_service_status(self) -> Dict[str, Any]:
+        """
+        Get marketplace status for service monitoring
+        
+        Returns:
+            Dictionary containing catalog and index statistics
+        """
+        index = self._catalog_index
+        return {
+            "status": "available",
+            "catalog_size": len(index) if index is not None else 0,
+            "catalog_index": index.get_stats() if index is not None else None,
+            "facets": self.get_catalog_facets(),
+            "catalog_version": self.catalog_version,
+            "result_cache": self._result_cache.get_stats(),
+            "recommendations": self._recommendations.get_stats() if self._recommendations else None,
+            "catalog_watcher": self._catalog_watcher.get_stats() if self._catalog_watcher else None
+        }
\ No newline at end of file
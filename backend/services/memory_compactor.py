@@ -0,0 +1,315 @@
+"""
+Local Memory Compaction
+
+Background job that bounds the growth of the local memory store. Chat
+handling stores every user message and response, so long-lived users
+accumulate many small, overlapping memories. Each compaction pass:
+
+- takes the oldest memories past a minimum age and groups them by user and
+  chat session
+- clusters each group by cosine similarity of the memories' sparse vectors
+  (leader clustering: the oldest unassigned memory gathers every
+  unassigned memory similar enough to it)
+- replaces each cluster of at least ``min_cluster_size`` memories with one
+  extractive summary memory (key terms plus the most representative
+  memories), tombstoning the originals under a new store generation
+- deletes tombstones older than the retention period
+
+Passes run on a fixed interval, or sooner when the store fills past a
+share of its capacity, ahead of retention-based eviction.
+"""
+
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from services.local_memory_store import LocalMemoryStore, SparseVector
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Optional vectorised clustering
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+DEFAULT_MIN_AGE_DAYS = 1.0
+DEFAULT_SIMILARITY = 0.3
+DEFAULT_MIN_CLUSTER_SIZE = 3
+DEFAULT_MAX_CLUSTER_SIZE = 20
+DEFAULT_INTERVAL_SECONDS = 3600.0
+DEFAULT_TOMBSTONE_RETENTION_DAYS = 7.0
+
+# Memories examined per pass, bounding the cost of one pass on large stores
+DEFAULT_MAX_CANDIDATES = 5000
+
+# Store fill level (share of max_entries) that triggers a pass before the interval elapses
+DEFAULT_CAPACITY_TRIGGER = 0.8
+
+# Seconds between checks of the capacity trigger
+CHECK_INTERVAL = 60.0
+
+# Summary composition
+SUMMARY_EXAMPLES = 3
+SUMMARY_EXAMPLE_LENGTH = 160
+SUMMARY_KEY_TERMS = 8
+
+_TERM_PATTERN = re.compile(r"[^\W\d_]{4,}", re.UNICODE)
+_COMMON_TERMS = frozenset({
+    "user", "mama", "bear", "response", "that", "this", "with", "from", "have", "what", "your",
+    "about", "would", "could", "should", "there", "their", "which", "when", "will", "just", "like"
+})
+
+class MemoryCompactor:
+    """
+    Periodic clustering and summarisation of old memories in a LocalMemoryStore
+    """
+    
+    def __init__(self, store: LocalMemoryStore, min_age_days: float = DEFAULT_MIN_AGE_DAYS,
+                 similarity: float = DEFAULT_SIMILARITY, min_cluster_size: int = DEFAULT_MIN_CLUSTER_SIZE,
+                 max_cluster_size: int = DEFAULT_MAX_CLUSTER_SIZE,
+                 interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+                 tombstone_retention_days: float = DEFAULT_TOMBSTONE_RETENTION_DAYS,
+                 max_candidates: int = DEFAULT_MAX_CANDIDATES,
+                 capacity_trigger: float = DEFAULT_CAPACITY_TRIGGER):
+        """
+        Initialize compaction policy
+        
+        Args:
+            store: Memory store to compact
+            min_age_days: Age before a memory may be compacted
+            similarity: Cosine similarity required to join a cluster
+            min_cluster_size: Smallest cluster replaced by a summary
+            max_cluster_size: Largest number of memories merged into one summary
+            interval_seconds: Seconds between scheduled passes
+            tombstone_retention_days: Age at which tombstoned memories are deleted
+            max_candidates: Memories examined per pass
+            capacity_trigger: Store fill level that triggers an early pass
+        """
+        self.store = store
+        self.min_age_seconds = max(0.0, min_age_days) * 86400.0
+        self.similarity = similarity
+        self.min_cluster_size = max(2, min_cluster_size)
+        self.max_cluster_size = max(self.min_cluster_size, max_cluster_size)
+        self.interval_seconds = interval_seconds
+        self.tombstone_retention_seconds = max(0.0, tombstone_retention_days) * 86400.0
+        self.max_candidates = max(1, max_candidates)
+        self.capacity_trigger = capacity_trigger
+        
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._pass_lock = threading.Lock()
+        self._last_pass = 0.0
+        self._stats = {"passes": 0, "examined": 0, "clusters": 0, "merged": 0, "errors": 0,
+                       "last_pass": None, "last_duration_ms": None}
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the compaction thread is active"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start scheduled compaction in a daemon thread"""
+        if self.is_running:
+            return
+        
+        self._stop.clear()
+        self._last_pass = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="memory-compactor", daemon=True)
+        self._thread.start()
+        logger.info(f"Memory compaction scheduled every {self.interval_seconds:.0f}s")
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop the compaction thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+    
+    def _run(self):
+        """Compaction thread main loop"""
+        while not self._stop.wait(CHECK_INTERVAL):
+            overdue = time.monotonic() - self._last_pass >= self.interval_seconds
+            filling = len(self.store) >= self.capacity_trigger * self.store.max_entries
+            if not (overdue or filling):
+                continue
+            
+            try:
+                self.compact()
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Memory compaction failed: {e}")
+    
+    def compact(self) -> Dict[str, int]:
+        """
+        Run one compaction pass
+        
+        Returns:
+            Dictionary with the number of memories examined, clusters
+            summarised and memories merged
+        """
+        with self._pass_lock:
+            started = time.perf_counter()
+            now = time.time()
+            candidates = self.store.compaction_candidates(now - self.min_age_seconds, self.max_candidates)
+            
+            groups: Dict[Tuple[str, Any], List[Dict[str, Any]]] = {}
+            for memory in candidates:
+                groups.setdefault((memory["user_id"], memory["metadata"].get("session_id")), []).append(memory)
+            
+            merges = []
+            for members in groups.values():
+                for cluster in self._clusters(members):
+                    merges.append(([member["id"] for member in cluster], self._summarise(cluster)))
+            
+            stored, merged = self.store.apply_compaction(merges) if merges else (0, 0)
+            self.store.purge_tombstones(now - self.tombstone_retention_seconds)
+            
+            result = {"examined": len(candidates), "clusters": stored, "merged": merged}
+            self._last_pass = time.monotonic()
+            self._stats["passes"] += 1
+            for key, value in result.items():
+                self._stats[key] += value
+            self._stats["last_pass"] = datetime.now().isoformat()
+            self._stats["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        
+        if stored:
+            logger.info(f"Memory compaction merged {result['merged']} memories into {stored} summaries")
+        return result
+    
+    def _clusters(self, members: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Leader clustering of one user/session group, keeping clusters large enough to summarise"""
+        if len(members) < self.min_cluster_size:
+            return []
+        
+        postings = self._postings([member["vector"] for member in members])
+        assigned = [False] * len(members)
+        clusters = []
+        
+        for leader, member in enumerate(members):
+            if assigned[leader]:
+                continue
+            similarities = self._similarities(postings, member["vector"], len(members))
+            joined = sorted(
+                (position for position in range(len(members))
+                 if not assigned[position] and (position == leader or similarities[position] >= self.similarity)),
+                key=lambda position: (position != leader, -similarities[position])
+            )[:self.max_cluster_size]
+            
+            if len(joined) < self.min_cluster_size:
+                continue
+            for position in joined:
+                assigned[position] = True
+            clusters.append([members[position] for position in joined])
+        return clusters
+    
+    @staticmethod
+    def _postings(vectors: Sequence[SparseVector]) -> Dict[int, Tuple[array, array]]:
+        """Dimension-major postings for a group's vectors"""
+        postings: Dict[int, Tuple[array, array]] = {}
+        for position, (buckets, weights) in enumerate(vectors):
+            for bucket, weight in zip(buckets, weights):
+                posting = postings.get(bucket)
+                if posting is None:
+                    posting = postings[bucket] = (array("i"), array("f"))
+                posting[0].append(position)
+                posting[1].append(weight)
+        return postings
+    
+    @staticmethod
+    def _similarities(postings: Dict[int, Tuple[array, array]], vector: SparseVector, count: int):
+        """Cosine similarity of a vector to every vector in the group"""
+        features = [(postings[bucket], weight) for bucket, weight in zip(*vector) if bucket in postings]
+        
+        if NUMPY_AVAILABLE:
+            if not features:
+                return np.zeros(count)
+            positions = np.concatenate([np.frombuffer(posting[0], dtype=np.int32) for posting, _ in features])
+            contributions = np.concatenate([np.frombuffer(posting[1], dtype=np.float32) * weight
+                                            for posting, weight in features])
+            return np.bincount(positions, weights=contributions, minlength=count)
+        
+        similarities = [0.0] * count
+        for (positions, weights), weight in features:
+            for position, value in zip(positions, weights):
+                similarities[position] += weight * value
+        return similarities
+    
+    @staticmethod
+    def _summarise(cluster: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extractive summary of a cluster, led by its leader (the first member)"""
+        terms = Counter(
+            term for member in cluster for term in set(_TERM_PATTERN.findall(member["content"].lower()))
+            if term not in _COMMON_TERMS
+        )
+        key_terms = [term for term, _ in terms.most_common(SUMMARY_KEY_TERMS)]
+        examples = []
+        for member in cluster[:SUMMARY_EXAMPLES]:
+            text = " ".join(member["content"].split())
+            examples.append(text if len(text) <= SUMMARY_EXAMPLE_LENGTH else text[:SUMMARY_EXAMPLE_LENGTH - 3] + "...")
+        
+        types = Counter(member["metadata"].get("type", "memory") for member in cluster)
+        first = datetime.fromtimestamp(min(member["created"] for member in cluster))
+        last = datetime.fromtimestamp(max(member["created"] for member in cluster))
+        content = (f"Summary of {len(cluster)} {'/'.join(sorted(types))} memories "
+                   f"({first:%Y-%m-%d} to {last:%Y-%m-%d}). Key terms: {', '.join(key_terms)}. "
+                   f"Examples: {' | '.join(examples)}")
+        
+        leader = cluster[0]
+        return {
+            "user_id": leader["user_id"],
+            "content": content,
+            "metadata": {
+                "session_id": leader["metadata"].get("session_id"),
+                "source_count": len(cluster),
+                "source_types": dict(types),
+                "first_created": first.isoformat(),
+                "last_created": last.isoformat()
+            },
+            "importance": max(member["importance"] for member in cluster),
+            "created": max(member["created"] for member in cluster),
+            "accessed": max(member["accessed"] for member in cluster)
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get compaction counters for monitoring
+        
+        Returns:
+            Dictionary containing running state, policy and pass counters
+        """
+        return {
+            "running": self.is_running,
+            "generation": self.store.generation,
+            "min_age_days": round(self.min_age_seconds / 86400.0, 3),
+            "similarity": self.similarity,
+            **self._stats
+        }
+
+_compactor: Optional[MemoryCompactor] = None
+_compactor_lock = threading.Lock()
+
+def get_memory_compactor(store: LocalMemoryStore, **settings: Any) -> MemoryCompactor:
+    """
+    Get the process-wide compactor for the local memory store, starting it on first use
+    
+    Args:
+        store: Memory store to compact
+        **settings: MemoryCompactor arguments used when the compactor is created
+    
+    Returns:
+        Shared, running MemoryCompactor instance
+    """
+    global _compactor
+    with _compactor_lock:
+        if _compactor is None:
+            _compactor = MemoryCompactor(store, **settings)
+            _compactor.start()
+        return _compactor
@@ -0,0 +1,264 @@
+"""
+Memory Search Cache
+
+Per-user cache of Mem0.ai search results. Chat handling sends the same
+context query on every message and discovery repeats similar ones, so most
+searches can be answered without a round trip:
+
+- entries are keyed by the normalised query (case, punctuation and spacing
+  removed) and stamped with the user's memory generation
+- a query without an exact entry may reuse the results of a cached query
+  whose hashed term vector is nearly identical (cosine similarity above a
+  threshold)
+- storing a memory advances the user's generation and drops only the
+  entries whose query is similar to the new memory's body (its speaker
+  prefix left out); searches that were running across the change are not
+  cached
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from services.local_memory_store import HashingVectorizer, SparseVector
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES_PER_USER = 128
+DEFAULT_TTL_SECONDS = 300.0
+
+# Cosine similarity at which a cached query's results are reused for another query
+DEFAULT_REUSE_SIMILARITY = 0.9
+
+# Cosine similarity between a new memory and a cached query at which the entry is dropped
+DEFAULT_INVALIDATION_SIMILARITY = 0.2
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Speaker prefixes chat memories are stored with ("User (<user_id>): ...",
+# "Mama Bear response: ..."); the user id they carry matches every per-user query
+_SPEAKER_PREFIX = re.compile(r"^\s*(?:user\s*\([^)]*\)|mama bear response)\s*:\s*", re.IGNORECASE)
+
+def normalise_query(query: str) -> str:
+    """
+    Reduce a query to its lowercase words separated by single spaces
+    
+    Args:
+        query: Search text
+    
+    Returns:
+        Normalised query used as the exact cache key
+    """
+    return " ".join(_TOKEN_PATTERN.findall(query.lower()))
+
+def memory_body(content: str) -> str:
+    """
+    Strip the speaker prefix from a stored chat memory
+    
+    Args:
+        content: Memory text
+    
+    Returns:
+        Message body compared with cached queries on invalidation
+    """
+    return _SPEAKER_PREFIX.sub("", content, count=1)
+
+def _cosine(first: SparseVector, second: SparseVector) -> float:
+    """Cosine similarity of two unit-length sparse vectors"""
+    if len(first[0]) > len(second[0]):
+        first, second = second, first
+    weights = dict(zip(*second))
+    return sum(weight * weights.get(bucket, 0.0) for bucket, weight in zip(*first))
+
+class _CachedSearch:
+    """Results of one search with the query vector and generation they belong to"""
+    
+    __slots__ = ('vector', 'limit', 'results', 'generation', 'expires_at')
+    
+    def __init__(self, vector: SparseVector, limit: int, results: List[Dict], generation: int,
+                 expires_at: float):
+        self.vector = vector
+        self.limit = limit
+        self.results = results
+        self.generation = generation
+        self.expires_at = expires_at
+
+class MemorySearchCache:
+    """
+    Thread-safe per-user LRU + TTL cache with similarity-based reuse and invalidation
+    
+    Cached result lists are shared between callers; ``get_or_search``
+    returns a new list but the memory dictionaries must be treated as
+    read-only.
+    """
+    
+    def __init__(self, max_entries_per_user: int = DEFAULT_MAX_ENTRIES_PER_USER,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 reuse_similarity: float = DEFAULT_REUSE_SIMILARITY,
+                 invalidation_similarity: float = DEFAULT_INVALIDATION_SIMILARITY):
+        """
+        Initialize cache limits
+        
+        Args:
+            max_entries_per_user: Cached queries kept per user before LRU eviction
+            ttl_seconds: Maximum age of cached results
+            reuse_similarity: Query similarity required to reuse another query's results
+            invalidation_similarity: Similarity between a new memory and a cached
+                query at which the cached results are dropped
+        """
+        self.max_entries_per_user = max(1, max_entries_per_user)
+        self.ttl_seconds = ttl_seconds
+        self.reuse_similarity = reuse_similarity
+        self.invalidation_similarity = invalidation_similarity
+        self.vectorizer = HashingVectorizer()
+        
+        self._users: Dict[str, "OrderedDict[str, _CachedSearch]"] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "similar_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0
+        }
+    
+    def get_or_search(self, user_id: str, query: str, limit: int,
+                      search: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        Return cached results for a query, running the search on a miss
+        
+        Args:
+            user_id: Owner of the searched memories
+            query: Search text
+            limit: Maximum number of memories
+            search: Zero-argument callable returning up to ``limit`` memories
+        
+        Returns:
+            List of memory entries
+        """
+        key = normalise_query(query)
+        if not key:
+            return search()
+        
+        vector = self.vectorizer.transform(key)
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generations.get(user_id, 0)
+            entries = self._users.get(user_id)
+            if entries is not None:
+                entry = self._lookup(entries, key, vector, limit, generation, now)
+                if entry is not None:
+                    return entry.results[:limit]
+            self._stats["misses"] += 1
+        
+        results = search()
+        
+        with self._lock:
+            # A memory stored while the search ran may be missing from its results
+            if self._generations.get(user_id, 0) == generation:
+                entries = self._users.setdefault(user_id, OrderedDict())
+                entries[key] = _CachedSearch(vector, limit, list(results), generation,
+                                             time.monotonic() + self.ttl_seconds)
+                entries.move_to_end(key)
+                while len(entries) > self.max_entries_per_user:
+                    entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return results
+    
+    def _lookup(self, entries: "OrderedDict[str, _CachedSearch]", key: str, vector: SparseVector, limit: int,
+                generation: int, now: float) -> Optional[_CachedSearch]:
+        """Find a usable exact or near-identical entry, dropping expired ones (caller holds the lock)"""
+        entry = entries.get(key)
+        if entry is not None:
+            if entry.expires_at <= now or entry.generation != generation:
+                del entries[key]
+            elif entry.limit >= limit:
+                entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            else:
+                return None
+        
+        for other_key, other in list(entries.items()):
+            if other.expires_at <= now or other.generation != generation:
+                del entries[other_key]
+            elif other.limit >= limit and _cosine(vector, other.vector) >= self.reuse_similarity:
+                entries.move_to_end(other_key)
+                self._stats["similar_hits"] += 1
+                return other
+        return None
+    
+    def invalidate(self, user_id: str, contents: Iterable[str]):
+        """
+        Record new memories for a user, dropping the cached queries they are relevant to
+        
+        Args:
+            user_id: Owner of the new memories
+            contents: Text of the new memories
+        """
+        vectors = [self.vectorizer.transform(normalise_query(memory_body(content))) for content in contents]
+        
+        with self._lock:
+            generation = self._generations.get(user_id, 0) + 1
+            self._generations[user_id] = generation
+            entries = self._users.get(user_id)
+            if not entries:
+                return
+            
+            dropped = 0
+            for key, entry in list(entries.items()):
+                if any(_cosine(entry.vector, vector) >= self.invalidation_similarity for vector in vectors):
+                    del entries[key]
+                    dropped += 1
+                else:
+                    entry.generation = generation
+            self._stats["invalidations"] += dropped
+        
+        if dropped:
+            logger.debug(f"Dropped {dropped} cached memory searches for {user_id}")
+    
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._users.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache effectiveness counters for monitoring
+        
+        Returns:
+            Dictionary containing hit/miss counters and sizing
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["users"] = len(self._users)
+            stats["size"] = sum(len(entries) for entries in self._users.values())
+        
+        lookups = stats["hits"] + stats["similar_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["similar_hits"]) / lookups, 4) if lookups else 0.0
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["reuse_similarity"] = self.reuse_similarity
+        return stats
+
+_cache: Optional[MemorySearchCache] = None
+_cache_lock = threading.Lock()
+
+def get_memory_search_cache(**settings: Any) -> MemorySearchCache:
+    """
+    Get the process-wide memory search cache, creating it on first use
+    
+    Args:
+        **settings: MemorySearchCache arguments used when the cache is created
+    
+    Returns:
+        Shared MemorySearchCache instance
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MemorySearchCache(**settings)
+        return _cache
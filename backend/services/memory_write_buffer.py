@@ -0,0 +1,482 @@
+"""
+Mem0 Write-Behind Buffer
+
+Takes Mem0.ai memory writes off the request path. Writes are queued in
+memory and flushed by a background thread:
+
+- consecutive queued writes of one user with identical metadata are
+  coalesced, so one ``add`` call carries up to ``batch_size`` messages
+  instead of one HTTPS round trip per message; every write keeps its own
+  metadata
+- a failed flush puts its writes back and pauses flushing with exponential
+  backoff; writes that fail ``max_attempts`` times are moved to a
+  dead-letter file instead of being retried forever
+- the queue is bounded; on overflow new writes are appended to a local
+  JSON-lines journal (flushed and fsynced) instead of being dropped, and
+  the journal is replayed once the queue has room again
+- on shutdown whatever could not be delivered is journaled, so the next
+  start picks it up
+
+Journal entries keep their delivery attempt count across replays. Where
+``fcntl`` is available the journal is guarded by an exclusive ``flock`` on
+a sidecar lock file, so several worker processes can share one journal.
+"""
+
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Import POSIX file locking if available
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_JOURNAL_PATH = "mem0_journal.jsonl"
+
+# Backoff between failed flushes: base doubled per consecutive failure, capped, with jitter
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+class _PendingWrite:
+    """Single queued memory write and its delivery attempts"""
+    
+    __slots__ = ('content', 'metadata', 'attempts')
+    
+    def __init__(self, content: str, metadata: Dict[str, Any], attempts: int = 0):
+        self.content = content
+        self.metadata = metadata
+        self.attempts = attempts
+
+def split_by_metadata(writes: List[_PendingWrite], batch_size: int) -> List[List[_PendingWrite]]:
+    """
+    Split queued writes into batches that can share one ``add`` call
+    
+    Only consecutive writes with identical metadata are grouped, so no
+    write loses metadata and the queue order is kept.
+    
+    Args:
+        writes: One user's queued writes, oldest first
+        batch_size: Maximum writes per batch
+    
+    Returns:
+        Batches in queue order
+    """
+    batches: List[List[_PendingWrite]] = []
+    for write in writes:
+        if batches and len(batches[-1]) < batch_size and batches[-1][0].metadata == write.metadata:
+            batches[-1].append(write)
+        else:
+            batches.append([write])
+    return batches
+
+class MemoryWriteBuffer:
+    """
+    Bounded write-behind queue in front of a Mem0 ``add`` call
+    
+    Only the background thread talks to Mem0; ``submit`` never blocks on
+    the network.
+    """
+    
+    def __init__(self, send: Callable[[List[Dict[str, str]], str, Dict[str, Any]], Any],
+                 journal_path: str = DEFAULT_JOURNAL_PATH, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_pending: int = DEFAULT_MAX_PENDING,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, dead_letter_path: Optional[str] = None):
+        """
+        Initialize buffer configuration
+        
+        Args:
+            send: Delivers one batch as ``send(messages, user_id, metadata)``
+            journal_path: JSON-lines file for writes that could not be queued or delivered
+            batch_size: Maximum messages per Mem0 call
+            flush_interval: Seconds a write waits for others to coalesce with
+            max_pending: Queued writes kept in memory before spilling to the journal
+            max_attempts: Delivery attempts before a write is moved to the dead-letter file
+            dead_letter_path: JSON-lines file for writes that exhausted their attempts
+                (defaults to the journal path with a ``.dead.jsonl`` suffix)
+        """
+        self.send = send
+        self.journal_path = Path(journal_path)
+        self.dead_letter_path = Path(dead_letter_path) if dead_letter_path else self.journal_path.with_suffix(".dead.jsonl")
+        self._lock_path = self.journal_path.with_name(self.journal_path.name + ".lock")
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_pending = max(1, max_pending)
+        self.max_attempts = max(1, max_attempts)
+        
+        self._pending: "OrderedDict[str, List[_PendingWrite]]" = OrderedDict()
+        self._count = 0
+        self._in_flight = 0
+        self._first_queued: Optional[float] = None
+        self._flush_requested = False
+        self._resume_at = 0.0
+        self._consecutive_failures = 0
+        
+        self._condition = threading.Condition()
+        self._journal_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stats = {
+            "submitted": 0,
+            "delivered": 0,
+            "batches": 0,
+            "failures": 0,
+            "journaled": 0,
+            "replayed": 0,
+            "dead_lettered": 0
+        }
+        
+        if not FCNTL_AVAILABLE:
+            logger.warning("fcntl not available - the Mem0 journal must not be shared between processes")
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the flush thread is accepting writes"""
+        return self._running
+    
+    def start(self):
+        """Start the background flush thread"""
+        if self._running:
+            return
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="mem0-write-buffer", daemon=True)
+        self._thread.start()
+        logger.info(f"Mem0 write buffer started (batch_size={self.batch_size}, max_pending={self.max_pending})")
+    
+    def submit(self, content: str, metadata: Optional[Dict[str, Any]] = None, user_id: str = "default") -> bool:
+        """
+        Queue a memory write
+        
+        Args:
+            content: Memory text
+            metadata: Additional context stored with the memory
+            user_id: Owner of the memory
+        
+        Returns:
+            True if the write was queued or journaled
+        """
+        write = _PendingWrite(content, dict(metadata or {}))
+        
+        with self._condition:
+            self._stats["submitted"] += 1
+            if self._running and self._count + self._in_flight < self.max_pending:
+                self._pending.setdefault(user_id, []).append(write)
+                self._count += 1
+                if self._first_queued is None:
+                    self._first_queued = time.monotonic()
+                self._condition.notify()
+                return True
+        
+        # Queue full or buffer stopped: keep the write durable instead
+        return self._journal([(user_id, write)])
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued write has been delivered or journaled
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if the queue drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._count or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Deliver what can be delivered within the timeout and journal the rest
+        
+        Args:
+            timeout: Maximum seconds to wait for the final flush
+        """
+        if not self._running:
+            return
+        
+        self.flush(timeout)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        
+        with self._condition:
+            leftovers = [(user_id, write) for user_id, writes in self._pending.items() for write in writes]
+            self._pending.clear()
+            self._count = 0
+        if leftovers:
+            self._journal(leftovers)
+        
+        logger.info("Mem0 write buffer stopped")
+    
+    def _run(self):
+        """Flush thread main loop"""
+        while True:
+            with self._condition:
+                batches = self._wait_for_batches()
+                if batches is None:
+                    return
+            
+            for user_id, writes in batches:
+                self._deliver(user_id, writes)
+            
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+            
+            if time.monotonic() >= self._resume_at:
+                self._replay_journal()
+    
+    def _wait_for_batches(self) -> Optional[List[tuple]]:
+        """
+        Wait until queued writes are due and take them off the queue (caller holds the condition)
+        
+        Returns:
+            Per-user batches to deliver (empty when only the journal needs
+            replaying), or None once the buffer has stopped
+        """
+        while True:
+            if not self._running:
+                return None
+            
+            now = time.monotonic()
+            if not self._count:
+                if self._journal_has_entries() and now >= self._resume_at:
+                    return []
+                self._condition.wait(1.0)
+                continue
+            
+            if self._flush_requested or self._count >= self.batch_size:
+                due_at = self._resume_at
+            else:
+                due_at = max(self._first_queued + self.flush_interval, self._resume_at)
+            if now >= due_at:
+                break
+            self._condition.wait(due_at - now)
+        
+        batches = []
+        for user_id, writes in self._pending.items():
+            batches.extend((user_id, batch) for batch in split_by_metadata(writes, self.batch_size))
+        self._pending.clear()
+        self._in_flight = self._count
+        self._count = 0
+        self._first_queued = None
+        self._flush_requested = False
+        return batches
+    
+    def _deliver(self, user_id: str, writes: List[_PendingWrite]):
+        """Send one batch of writes sharing metadata, requeueing or journaling it on failure"""
+        if self._consecutive_failures and time.monotonic() < self._resume_at:
+            self._requeue(user_id, writes)
+            return
+        
+        messages = [{"role": "user", "content": write.content} for write in writes]
+        try:
+            self.send(messages, user_id, dict(writes[0].metadata))
+        except Exception as e:
+            self._consecutive_failures += 1
+            self._stats["failures"] += 1
+            backoff = min(BACKOFF_BASE * 2 ** (self._consecutive_failures - 1), BACKOFF_MAX)
+            self._resume_at = time.monotonic() + backoff * random.uniform(0.5, 1.0)
+            logger.warning(f"Mem0 write of {len(writes)} memories failed, retrying in {backoff:.1f}s: {e}")
+            
+            for write in writes:
+                write.attempts += 1
+            exhausted = [(user_id, write) for write in writes if write.attempts >= self.max_attempts]
+            if exhausted:
+                self._dead_letter(exhausted, str(e))
+            self._requeue(user_id, [write for write in writes if write.attempts < self.max_attempts])
+            return
+        
+        self._consecutive_failures = 0
+        self._stats["batches"] += 1
+        self._stats["delivered"] += len(writes)
+    
+    def _requeue(self, user_id: str, writes: List[_PendingWrite]):
+        """Put undelivered writes back at the front of their user's queue"""
+        if not writes:
+            return
+        with self._condition:
+            self._pending[user_id] = writes + self._pending.get(user_id, [])
+            self._pending.move_to_end(user_id, last=False)
+            self._count += len(writes)
+            self._in_flight -= len(writes)
+            if self._first_queued is None:
+                self._first_queued = time.monotonic()
+    
+    @contextmanager
+    def _locked_journal(self):
+        """Hold the journal lock against other threads and, with fcntl, other processes"""
+        with self._journal_lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            if not FCNTL_AVAILABLE:
+                yield
+                return
+            
+            # A sidecar file is locked because replay replaces the journal file itself
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _journal(self, writes: List[tuple]) -> bool:
+        """Append writes to the journal file durably"""
+        try:
+            with self._locked_journal():
+                self._append_lines(self.journal_path, writes)
+        except OSError as e:
+            logger.error(f"Mem0 write journal failed, {len(writes)} memories lost: {e}")
+            return False
+        
+        self._stats["journaled"] += len(writes)
+        return True
+    
+    def _dead_letter(self, writes: List[tuple], error: str):
+        """Append writes that exhausted their delivery attempts to the dead-letter file"""
+        try:
+            with self._locked_journal():
+                self._append_lines(self.dead_letter_path, writes, error=error)
+        except OSError as e:
+            logger.error(f"Mem0 dead-letter write failed, {len(writes)} memories lost: {e}")
+            return
+        
+        self._stats["dead_lettered"] += len(writes)
+        logger.error(f"Moved {len(writes)} Mem0 writes to {self.dead_letter_path} after "
+                     f"{self.max_attempts} failed attempts: {error}")
+    
+    @staticmethod
+    def _append_lines(path: Path, writes: List[tuple], **extra: Any):
+        """Append writes with their attempt counts as fsynced JSON lines (caller holds the journal lock)"""
+        lines = "".join(
+            json.dumps({"user_id": user_id, "content": write.content, "metadata": write.metadata,
+                        "attempts": write.attempts, **extra}, default=str) + "\n"
+            for user_id, write in writes
+        )
+        with open(path, "a", encoding="utf-8") as journal:
+            journal.write(lines)
+            journal.flush()
+            os.fsync(journal.fileno())
+    
+    def _journal_has_entries(self) -> bool:
+        """Whether the journal holds writes waiting for replay"""
+        try:
+            return self.journal_path.stat().st_size > 0
+        except OSError:
+            return False
+    
+    def _replay_journal(self):
+        """Move journaled writes back into the queue as far as it has room"""
+        with self._condition:
+            room = self.max_pending // 2 - self._count - self._in_flight
+        if room <= 0 or not self._journal_has_entries():
+            return
+        
+        try:
+            with self._locked_journal():
+                # Another process may have replayed the journal while this one waited for the lock
+                if not self._journal_has_entries():
+                    return
+                with open(self.journal_path, "r", encoding="utf-8") as journal:
+                    lines = journal.readlines()
+                
+                replay, remaining = lines[:room], lines[room:]
+                temporary = self.journal_path.with_name(self.journal_path.name + ".tmp")
+                with open(temporary, "w", encoding="utf-8") as journal:
+                    journal.writelines(remaining)
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                os.replace(temporary, self.journal_path)
+        except OSError as e:
+            logger.error(f"Mem0 write journal replay failed: {e}")
+            self._resume_at = time.monotonic() + BACKOFF_MAX
+            return
+        
+        replayed = 0
+        with self._condition:
+            for line in replay:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping unreadable Mem0 journal entry")
+                    continue
+                self._pending.setdefault(record.get("user_id", "default"), []).append(
+                    _PendingWrite(record.get("content", ""), record.get("metadata") or {},
+                                  int(record.get("attempts", 0)))
+                )
+                replayed += 1
+            self._count += replayed
+            if replayed and self._first_queued is None:
+                self._first_queued = time.monotonic()
+            self._stats["replayed"] += replayed
+        
+        if replayed:
+            logger.info(f"Replaying {replayed} journaled Mem0 writes ({len(remaining)} left in journal)")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and delivery counters for monitoring
+        
+        Returns:
+            Dictionary containing queue, journal and delivery counters
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = self._count + self._in_flight
+        stats["running"] = self._running
+        stats["max_pending"] = self.max_pending
+        stats["backing_off"] = self._consecutive_failures > 0 and time.monotonic() < self._resume_at
+        stats["journal_path"] = str(self.journal_path)
+        stats["journal_pending"] = self._journal_has_entries()
+        stats["dead_letter_path"] = str(self.dead_letter_path)
+        return stats
+
+_buffer: Optional[MemoryWriteBuffer] = None
+_buffer_lock = threading.Lock()
+
+def get_memory_write_buffer(send: Callable[[List[Dict[str, str]], str, Dict[str, Any]], Any],
+                            **settings: Any) -> MemoryWriteBuffer:
+    """
+    Get the process-wide Mem0 write buffer, starting it on first use
+    
+    Args:
+        send: Delivery callable used when the buffer is created
+        **settings: MemoryWriteBuffer arguments used when the buffer is created
+    
+    Returns:
+        Shared, running MemoryWriteBuffer instance
+    """
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = MemoryWriteBuffer(send, **settings)
+            _buffer.start()
+            atexit.register(_buffer.shutdown)
+        return _buffer
@@ -0,0 +1,273 @@
+"""
+MCP Recommendation Engine
+
+Precomputed server recommendations built from a catalog snapshot. Every
+server is described by a sparse binary feature vector over its category,
+tags and capabilities. Ranked lists are computed once per catalog version:
+
+- per project type, by cosine similarity between servers and the project
+  profile
+- per capability, for every capability present in the catalog
+
+Both blend in popularity and a co-install signal: similarity to the
+servers already installed, so rankings follow real usage. Lookups after
+the build are dictionary reads.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.mcp_server import MCPCategory
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+# Optional vectorised scoring
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+    logger.info("NumPy not available - using pure Python recommendation scoring")
+
+# Project types mapped to the categories and keywords that describe them
+PROJECT_TYPE_PROFILES: Dict[str, Dict[str, List[str]]] = {
+    "web_development": {
+        "categories": [MCPCategory.WEB_APIS.value, MCPCategory.DATABASE.value],
+        "keywords": ["api", "web", "http", "rest", "graphql", "database", "sql"]
+    },
+    "data_science": {
+        "categories": [MCPCategory.AI_ML.value, MCPCategory.DATABASE.value],
+        "keywords": ["ai", "ml", "data", "analytics", "vector", "embeddings", "sql"]
+    },
+    "devops": {
+        "categories": [MCPCategory.CLOUD_SERVICES.value, MCPCategory.DEVELOPMENT_TOOLS.value],
+        "keywords": ["docker", "kubernetes", "cloud", "ci", "deployment", "git", "monitoring"]
+    },
+    "content_management": {
+        "categories": [MCPCategory.CONTENT_MANAGEMENT.value, MCPCategory.PRODUCTIVITY.value],
+        "keywords": ["cms", "content", "documents", "notes", "publishing"]
+    }
+}
+
+# Profile used for project types without a specific entry
+DEFAULT_PROJECT_PROFILE = {"categories": [MCPCategory.DEVELOPMENT_TOOLS.value], "keywords": []}
+
+# Ranking weights: profile similarity, popularity (0-1), co-install affinity
+SIMILARITY_WEIGHT = 1.0
+POPULARITY_WEIGHT = 0.3
+CO_INSTALL_WEIGHT = 0.5
+
+def _server_features(record: Dict[str, Any]) -> List[str]:
+    """Sparse feature names for a server record"""
+    features = {f"category:{record.get('category') or 'unknown'}"}
+    features.update(f"tag:{str(tag).lower()}" for tag in record.get('tags') or ())
+    features.update(f"capability:{str(capability).lower()}" for capability in record.get('capabilities') or ())
+    return sorted(features)
+
+def _profile_features(profile: Dict[str, List[str]]) -> List[str]:
+    """Sparse feature names describing a project profile"""
+    features = {f"category:{category}" for category in profile.get("categories", [])}
+    for keyword in profile.get("keywords", []):
+        features.add(f"tag:{keyword}")
+        features.add(f"capability:{keyword}")
+    return sorted(features)
+
+class RecommendationEngine:
+    """
+    Immutable set of precomputed recommendation lists for one catalog version
+    """
+    
+    def __init__(self, records: Iterable[Dict[str, Any]], list_size: int = 10,
+                 profiles: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        """
+        Build recommendation lists from catalog records
+        
+        Args:
+            records: API-shaped server dictionaries
+            list_size: Length of each precomputed list
+            profiles: Project type profiles (defaults to PROJECT_TYPE_PROFILES)
+        """
+        self._records = list(records)
+        self._names = {record.get('name'): position for position, record in enumerate(self._records)}
+        self.list_size = list_size
+        self.profiles = profiles or PROJECT_TYPE_PROFILES
+        
+        feature_ids: Dict[str, int] = {}
+        self._rows: List[List[int]] = []
+        for record in self._records:
+            self._rows.append([feature_ids.setdefault(feature, len(feature_ids)) for feature in _server_features(record)])
+        self._feature_ids = feature_ids
+        
+        self._installed = [position for position, record in enumerate(self._records) if record.get('is_installed')]
+        self._base_scores = self._compute_base_scores()
+        
+        self._by_project_type = {
+            project_type: self._rank_for_profile(profile)
+            for project_type, profile in self.profiles.items()
+        }
+        self._default_list = self._rank_for_profile(DEFAULT_PROJECT_PROFILE)
+        self._by_capability = self._rank_by_capability()
+    
+    def for_project(self, project_type: str) -> List[Dict[str, Any]]:
+        """
+        Get the precomputed recommendations for a project type
+        
+        Args:
+            project_type: Project type such as web_development or devops
+        
+        Returns:
+            Ranked server dictionaries with a ``recommendation_score``
+        """
+        ranked = self._by_project_type.get(project_type, self._default_list)
+        return self._materialise(ranked)
+    
+    def for_capability(self, capability: str) -> List[Dict[str, Any]]:
+        """
+        Get the precomputed recommendations for servers offering a capability
+        
+        Args:
+            capability: Capability or tag name
+        
+        Returns:
+            Ranked server dictionaries with a ``recommendation_score``
+        """
+        return self._materialise(self._by_capability.get(capability.lower(), []))
+    
+    def similar_to(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find servers with the most similar category, tags and capabilities
+        
+        Args:
+            name: Server to compare against
+            limit: Maximum number of servers
+        
+        Returns:
+            Ranked server dictionaries with a ``recommendation_score``
+        """
+        position = self._names.get(name)
+        if position is None:
+            return []
+        
+        similarities = self._cosine_to(self._rows[position])
+        similarities[position] = 0.0
+        ranked = sorted(
+            ((score, other) for other, score in enumerate(similarities) if score > 0),
+            key=lambda item: (-item[0], self._records[item[1]].get('name', ''))
+        )
+        return self._materialise(ranked[:limit])
+    
+    def _compute_base_scores(self) -> List[float]:
+        """Popularity plus co-install affinity for every server"""
+        popularity = [min(max(float(record.get('popularity_score') or 0), 0.0), 100.0) / 100.0
+                      for record in self._records]
+        
+        if not self._installed:
+            return [POPULARITY_WEIGHT * value for value in popularity]
+        
+        # Co-install affinity: similarity to the combined installed profile
+        installed_profile: Dict[int, float] = {}
+        for position in self._installed:
+            for feature in self._rows[position]:
+                installed_profile[feature] = installed_profile.get(feature, 0.0) + 1.0
+        affinity = self._cosine_to_weighted(installed_profile)
+        
+        return [POPULARITY_WEIGHT * value + CO_INSTALL_WEIGHT * affinity[position]
+                for position, value in enumerate(popularity)]
+    
+    def _rank_for_profile(self, profile: Dict[str, List[str]]) -> List[Tuple[float, int]]:
+        """Top servers for a project profile, excluding installed servers"""
+        profile_features = [self._feature_ids[feature] for feature in _profile_features(profile)
+                            if feature in self._feature_ids]
+        similarities = self._cosine_to(profile_features) if profile_features else [0.0] * len(self._records)
+        
+        candidates = [
+            (SIMILARITY_WEIGHT * similarities[position] + self._base_scores[position], position)
+            for position, record in enumerate(self._records)
+            if similarities[position] > 0 and not record.get('is_installed')
+        ]
+        return self._top(candidates)
+    
+    def _rank_by_capability(self) -> Dict[str, List[Tuple[float, int]]]:
+        """Top servers for every capability and tag in the catalog"""
+        members: Dict[str, List[int]] = {}
+        for position, record in enumerate(self._records):
+            if record.get('is_installed'):
+                continue
+            names = {str(value).lower() for value in (record.get('capabilities') or ())}
+            names.update(str(value).lower() for value in (record.get('tags') or ()))
+            for name in names:
+                members.setdefault(name, []).append(position)
+        
+        return {
+            name: self._top([(self._base_scores[position], position) for position in positions])
+            for name, positions in members.items()
+        }
+    
+    def _top(self, candidates: List[Tuple[float, int]]) -> List[Tuple[float, int]]:
+        """Sort candidates by score (ties by name) and keep the list size"""
+        candidates.sort(key=lambda item: (-item[0], self._records[item[1]].get('name', '')))
+        return candidates[:self.list_size]
+    
+    def _cosine_to(self, features: List[int]) -> List[float]:
+        """Cosine similarity between every server and a binary feature set"""
+        return self._cosine_to_weighted({feature: 1.0 for feature in features})
+    
+    def _cosine_to_weighted(self, vector: Dict[int, float]) -> List[float]:
+        """Cosine similarity between every server and a weighted feature vector"""
+        vector_norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if not vector_norm or not self._records:
+            return [0.0] * len(self._records)
+        
+        if NUMPY_AVAILABLE:
+            return self._cosine_numpy(vector, vector_norm)
+        
+        similarities = []
+        for row in self._rows:
+            dot = sum(vector.get(feature, 0.0) for feature in row)
+            similarities.append(dot / (math.sqrt(len(row)) * vector_norm) if dot else 0.0)
+        return similarities
+    
+    def _cosine_numpy(self, vector: Dict[int, float], vector_norm: float) -> List[float]:
+        """Vectorised sparse matrix-vector cosine over the binary feature rows"""
+        if not hasattr(self, "_indices"):
+            lengths = np.fromiter((len(row) for row in self._rows), dtype=np.int64, count=len(self._rows))
+            self._indptr = np.concatenate(([0], np.cumsum(lengths)))
+            self._indices = np.fromiter((feature for row in self._rows for feature in row),
+                                        dtype=np.int64, count=int(self._indptr[-1]))
+            self._row_norms = np.sqrt(np.maximum(lengths, 1).astype(np.float64))
+        
+        dense = np.zeros(len(self._feature_ids), dtype=np.float64)
+        for feature, weight in vector.items():
+            dense[feature] = weight
+        
+        # Sum the vector's weights over each row's features (reduceat needs non-empty rows)
+        gathered = dense[self._indices]
+        dots = np.add.reduceat(gathered, self._indptr[:-1]) if gathered.size else np.zeros(len(self._rows))
+        return (dots / (self._row_norms * vector_norm)).tolist()
+    
+    def _materialise(self, ranked: List[Tuple[float, int]]) -> List[Dict[str, Any]]:
+        """Copy ranked records and attach their scores"""
+        results = []
+        for score, position in ranked:
+            record = dict(self._records[position])
+            record['recommendation_score'] = round(score, 4)
+            results.append(record)
+        return results
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine size statistics for monitoring
+        
+        Returns:
+            Dictionary containing counts of servers, features and lists
+        """
+        return {
+            "servers": len(self._records),
+            "features": len(self._feature_ids),
+            "installed": len(self._installed),
+            "project_types": len(self._by_project_type),
+            "capabilities": len(self._by_capability),
+            "vectorised": NUMPY_AVAILABLE
+        }
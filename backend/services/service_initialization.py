@@ -75,7 +75,16 @@ def _initialize_marketplace_manager(app: Flask) -> MCPMarketplaceManager:
         Initialized MCPMarketplaceManager instance
     """
     try:
-        marketplace_manager = MCPMarketplaceManager()
+        marketplace_manager = MCPMarketplaceManager(
+            cache_size=app.config.get('MCP_RESULT_CACHE_SIZE', 256),
+            cache_ttl=app.config.get('MCP_RESULT_CACHE_TTL', 300.0),
+            install_workers=app.config.get('MCP_INSTALL_WORKERS', 4)
+        )
+        
+        if app.config.get('MCP_CATALOG_WATCH_ENABLED', True):
+            marketplace_manager.start_catalog_watcher(
+                poll_interval=app.config.get('MCP_CATALOG_POLL_INTERVAL', 2.0)
+            )
         
         logger.info("🏪 MCP Marketplace Manager initialized successfully")
         return marketplace_manager
@@ -0,0 +1,104 @@
+"""
+Async Bridge
+
+Runs coroutines from synchronous Flask request threads on one shared
+background event loop, so async-native service code can keep a sync entry
+point without creating an event loop per request.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Optional
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+class BackgroundEventLoop:
+    """
+    Event loop running forever in a daemon thread
+    
+    Blocking work offloaded with ``asyncio.to_thread`` or
+    ``loop.run_in_executor(None, ...)`` from coroutines on this loop runs on
+    a dedicated thread pool.
+    """
+    
+    def __init__(self, max_workers: int = 16, name: str = "sanctuary-async"):
+        """
+        Initialize loop configuration
+        
+        Args:
+            max_workers: Threads available for blocking work started from the loop
+            name: Thread name prefix
+        """
+        self.max_workers = max_workers
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running background loop, started on first use"""
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                logger.info(f"Background event loop started ({self.max_workers} executor threads)")
+            return self._loop
+    
+    def _run(self, ready: threading.Event):
+        """Loop thread main function"""
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"{self.name}-worker"))
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        loop.run_forever()
+    
+    def run(self, coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the background loop and wait for its result
+        
+        Must not be called from the loop thread itself.
+        
+        Args:
+            coroutine: Coroutine to run
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            The coroutine's result
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+_background_loop = BackgroundEventLoop()
+
+def run_sync(coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine to completion from synchronous code
+    
+    Args:
+        coroutine: Coroutine to run
+        timeout: Maximum seconds to wait
+    
+    Returns:
+        The coroutine's result
+    """
+    return _background_loop.run(coroutine, timeout)
+
+def get_background_loop() -> BackgroundEventLoop:
+    """
+    Get the shared background event loop
+    
+    Returns:
+        Process-wide BackgroundEventLoop instance
+    """
+    return _background_loop
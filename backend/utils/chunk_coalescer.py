@@ -0,0 +1,78 @@
+"""
+Chunk Coalescer
+
+Groups the small text pieces produced while a response is streamed into
+larger frames for transport, so clients receive a few events per second
+instead of one per word. The first piece is released on its own to keep
+time-to-first-token low.
+"""
+
+import time
+from typing import List, Optional
+
+DEFAULT_MIN_FRAME_CHARS = 32
+DEFAULT_MAX_FRAME_DELAY = 0.05
+
+class ChunkCoalescer:
+    """
+    Buffer of pending text released as a frame once it is large or old enough
+    
+    The frame age is checked as pieces arrive; call ``flush`` when the
+    producer finishes to release the remainder. Not thread-safe: use one
+    coalescer per stream.
+    """
+    
+    def __init__(self, min_chars: int = DEFAULT_MIN_FRAME_CHARS, max_delay: float = DEFAULT_MAX_FRAME_DELAY):
+        """
+        Initialize framing thresholds
+        
+        Args:
+            min_chars: Buffered characters that release a frame
+            max_delay: Seconds since the oldest buffered piece that release a frame
+        """
+        self.min_chars = max(1, min_chars)
+        self.max_delay = max_delay
+        self.frames = 0
+        self._parts: List[str] = []
+        self._size = 0
+        self._oldest: Optional[float] = None
+    
+    def add(self, text: str) -> Optional[str]:
+        """
+        Buffer a piece of text
+        
+        Args:
+            text: Next piece of the stream
+        
+        Returns:
+            A frame to send, or None while the buffer is below both thresholds
+        """
+        if not text:
+            return None
+        
+        now = time.monotonic()
+        if self._oldest is None:
+            self._oldest = now
+        self._parts.append(text)
+        self._size += len(text)
+        
+        if self.frames == 0 or self._size >= self.min_chars or now - self._oldest >= self.max_delay:
+            return self.flush()
+        return None
+    
+    def flush(self) -> Optional[str]:
+        """
+        Release everything buffered
+        
+        Returns:
+            The remaining text as a frame, or None when the buffer is empty
+        """
+        if not self._parts:
+            return None
+        
+        frame = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        self._oldest = None
+        self.frames += 1
+        return frame
@@ -0,0 +1,74 @@
+"""
+Latency Tracker
+
+Per-stage latency percentiles over a sliding window of recent samples, for
+reporting p50/p99 of multi-stage request pipelines without an external
+metrics system.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+class LatencyTracker:
+    """
+    Thread-safe sliding-window latency recorder keyed by stage name
+    """
+    
+    def __init__(self, window: int = 1024):
+        """
+        Initialize the sample window
+        
+        Args:
+            window: Number of most recent samples kept per stage
+        """
+        self.window = max(1, window)
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._timeouts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, stage: str, seconds: float, timed_out: bool = False):
+        """
+        Record one stage duration
+        
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+            timed_out: Whether the stage hit its timeout
+        """
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            if timed_out:
+                self._timeouts[stage] = self._timeouts.get(stage, 0) + 1
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency percentiles per stage
+        
+        Returns:
+            Dictionary mapping stage names to count, timeouts and p50/p90/p99/max in milliseconds
+        """
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+            counts = dict(self._counts)
+            timeouts = dict(self._timeouts)
+        
+        stats = {}
+        for stage, samples in snapshot.items():
+            def percentile(fraction: float) -> float:
+                return round(samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 2)
+            
+            stats[stage] = {
+                "count": counts[stage],
+                "timeouts": timeouts.get(stage, 0),
+                "p50_ms": percentile(0.5),
+                "p90_ms": percentile(0.9),
+                "p99_ms": percentile(0.99),
+                "max_ms": round(samples[-1] * 1000, 2)
+            }
+        return stats
@@ -0,0 +1,133 @@
+"""
+Versioned Result Cache
+
+Bounded LRU cache with per-entry TTL for read results that only change when
+an underlying data set changes. Every entry is stamped with the data version
+it was computed from; bumping the version invalidates all entries at once
+without walking the cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+class VersionedResultCache:
+    """
+    Thread-safe LRU + TTL cache tied to a data version counter
+    
+    Cached values are shared between callers and must be treated as
+    read-only.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0, name: str = "results"):
+        """
+        Initialize cache limits
+        
+        Args:
+            max_entries: Maximum number of cached results before LRU eviction
+            ttl_seconds: Maximum age of a cached result
+            name: Cache name used in log messages
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0
+        }
+    
+    @property
+    def version(self) -> int:
+        """Current data version"""
+        return self._version
+    
+    def bump_version(self) -> int:
+        """
+        Mark the underlying data as changed, invalidating every cached result
+        
+        Returns:
+            The new data version
+        """
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+            version = self._version
+        
+        logger.debug(f"{self.name} cache invalidated at version {version}")
+        return version
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key, computing and storing it on a miss
+        
+        The computation runs outside the lock. If the version changes while it
+        runs, the result is returned but not cached.
+        
+        Args:
+            key: Hashable, normalised description of the request
+            compute: Zero-argument callable producing the result
+        
+        Returns:
+            Cached or freshly computed result
+        """
+        now = time.monotonic()
+        with self._lock:
+            version = self._version
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if entry_version == version and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._entries[key]
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+        
+        value = compute()
+        
+        with self._lock:
+            if self._version == version:
+                self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        
+        return value
+    
+    def clear(self):
+        """Drop every cached result without changing the data version"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache effectiveness counters for monitoring
+        
+        Returns:
+            Dictionary containing hit/miss/eviction counters and sizing
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["version"] = self._version
+        
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats